@@ -0,0 +1,15 @@
+import tracemalloc
+from typing import Callable, Any
+
+
+def peak_memory(function: Callable[[], Any]) -> int:
+    """
+        Returns the peak number of bytes allocated while running function, measured
+        apart from the timed runs as tracing slows allocations down
+    """
+    tracemalloc.start()
+    try:
+        function()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
@@ -0,0 +1,126 @@
+import json
+import random
+import threading
+from datetime import date, timedelta
+from functools import lru_cache
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import Callable, Dict, Tuple
+
+TYPES: Tuple[str, ...] = ("Common Stock", "ETF", "FUND", "Preferred Stock", "Mutual Fund")
+
+
+@lru_cache(maxsize=None)
+def eod_csv(rows: int, seed: int = 0) -> bytes:
+    """
+        Returns an EOD prices csv of rows trading days ending today, with the single field footer line
+    """
+    rng: random.Random = random.Random(seed)
+    day: date = date.today() - timedelta(days=rows * 7 // 5)
+    price: float = 100.0
+    lines = ["Date,Open,High,Low,Close,Adjusted_close,Volume"]
+    while len(lines) <= rows:
+        day += timedelta(days=1)
+        if day.weekday() >= 5:
+            continue
+        open_: float = price
+        price = max(1.0, price * (1 + rng.gauss(0, 0.02)))
+        high, low = max(open_, price) * 1.01, min(open_, price) * 0.99
+        lines.append(f"{day:%Y-%m-%d},{open_:.4f},{high:.4f},{low:.4f},{price:.4f},{price * 0.9:.4f},"
+                     f"{rng.randint(10 ** 5, 10 ** 8)}")
+    lines.append(str(rows))
+    return ("\n".join(lines) + "\n").encode()
+
+
+@lru_cache(maxsize=None)
+def eod_json(rows: int, seed: int = 0) -> bytes:
+    """
+        Returns the same prices as eod_csv in the json format of the API
+    """
+    lines = eod_csv(rows, seed).decode().splitlines()[1:-1]
+    keys = ("date", "open", "high", "low", "close", "adjusted_close", "volume")
+    return json.dumps([dict(zip(keys, [fields[0]] + [float(v) for v in fields[1:-1]] + [int(fields[-1])]))
+                       for fields in (line.split(",") for line in lines)]).encode()
+
+
+@lru_cache(maxsize=None)
+def dividends_csv(rows: int) -> bytes:
+    """
+        Returns a dividends csv with one quarterly dividend per row
+    """
+    start: date = date.today() - timedelta(days=rows * 91)
+    lines = ["Date,Dividends"] + [f"{start + timedelta(days=91 * i):%Y-%m-%d},{0.1 + i / 1000:.4f}"
+                                  for i in range(rows)]
+    return ("\n".join(lines) + "\n").encode()
+
+
+@lru_cache(maxsize=None)
+def exchange_symbols_csv(rows: int, seed: int = 0) -> bytes:
+    """
+        Returns an exchange symbols csv with low cardinality Country, Exchange, Currency and Type
+    """
+    rng: random.Random = random.Random(seed)
+    lines = ["Code,Name,Country,Exchange,Currency,Type,Isin"]
+    for i in range(rows):
+        lines.append(f"S{i:06d},Company {i} Inc,USA,{rng.choice(('NYSE', 'NASDAQ', 'BATS'))},USD,"
+                     f"{rng.choice(TYPES)},US{i:010d}")
+    return ("\n".join(lines) + "\n").encode()
+
+
+class StandInServer:
+    """
+        Local HTTP/1.1 server answering /api/eod, /api/div and /api/exchanges requests with
+        synthetic csv bodies of the configured sizes, keep-alive connections are supported
+        so pooled sessions behave as against the real API
+    """
+
+    def __init__(self, eod_rows: int, dividend_rows: int, symbol_rows: int):
+        self.sizes: Dict[str, int] = {"eod": eod_rows, "div": dividend_rows, "exchanges": symbol_rows}
+        routes: Dict[str, Callable[[], bytes]] = {
+            "eod": lambda: eod_csv(eod_rows),
+            "div": lambda: dividends_csv(dividend_rows),
+            "exchanges": lambda: exchange_symbols_csv(symbol_rows),
+            "eod?fmt=json": lambda: eod_json(eod_rows),
+        }
+        for body in routes.values():
+            body()
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # headers and body are written apart, Nagle would delay the body of kept alive connections
+            disable_nagle_algorithm = True
+
+            def do_GET(self):
+                parts = self.path.split("?")[0].strip("/").split("/")
+                endpoint = parts[1] + ("?fmt=json" if "fmt=json" in self.path else "") if len(parts) == 3 else None
+                route = routes.get(endpoint) if parts[0] == "api" else None
+                if route is None:
+                    self.send_response(404)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                body: bytes = route()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/csv")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self._server: ThreadingHTTPServer = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        self._thread: threading.Thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/api"
+
+    def __enter__(self) -> "StandInServer":
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self._server.shutdown()
+        self._server.server_close()
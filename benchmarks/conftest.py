@@ -0,0 +1,39 @@
+import os
+
+import pytest
+
+from ._server import StandInServer
+
+BENCHMARKS_DIR: str = os.path.dirname(os.path.abspath(__file__))
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("eod benchmarks")
+    group.addoption("--eod-rows", type=int, default=5000, help="rows of the synthetic EOD prices csv")
+    group.addoption("--dividend-rows", type=int, default=100, help="rows of the synthetic dividends csv")
+    group.addoption("--symbol-rows", type=int, default=50000, help="rows of the synthetic exchange symbols csv")
+
+
+def pytest_collection_modifyitems(config, items):
+    # benchmarks only run when asked for, "pytest" at the root of the repo keeps running the tests only
+    if any(os.path.abspath(str(arg)).startswith(BENCHMARKS_DIR) for arg in config.args):
+        return
+    skip = pytest.mark.skip(reason="run the benchmarks with: pytest benchmarks")
+    for item in items:
+        if str(item.fspath).startswith(BENCHMARKS_DIR):
+            item.add_marker(skip)
+
+
+@pytest.fixture(scope="session")
+def server(request):
+    with StandInServer(eod_rows=request.config.getoption("--eod-rows"),
+                       dividend_rows=request.config.getoption("--dividend-rows"),
+                       symbol_rows=request.config.getoption("--symbol-rows")) as stand_in:
+        yield stand_in
+
+
+@pytest.fixture
+def api_url(server, monkeypatch):
+    from eod_historical_data import data
+    monkeypatch.setattr(data, "EOD_HISTORICAL_DATA_API_URL", server.url)
+    return server.url
@@ -0,0 +1,76 @@
+import asyncio
+
+import pytest
+
+from eod_historical_data import (AsyncEODClient, get_eod_data, get_eod_data_bulk, get_eod_data_pipeline,
+                                 get_dividends, get_exchange_symbols)
+from eod_historical_data.data import get_eod_data_async
+from ._helpers import peak_memory
+
+pytest.importorskip("pytest_benchmark")
+
+START, END = "1990-01-01", "2030-12-31"
+SYMBOLS = [f"S{i:04d}" for i in range(64)]
+
+
+def test_get_eod_data(benchmark, api_url, server):
+    df = benchmark(get_eod_data, "AAPL", "US", START, END, api_key="key")
+    assert len(df) == server.sizes["eod"]
+    benchmark.extra_info["peak_memory_bytes"] = peak_memory(lambda: get_eod_data("AAPL", "US", START, END,
+                                                                                 api_key="key"))
+
+
+def test_get_eod_data_json(benchmark, api_url, server):
+    df = benchmark(get_eod_data, "AAPL", "US", START, END, api_key="key", fmt="json")
+    assert len(df) == server.sizes["eod"]
+
+
+def test_get_eod_data_async(benchmark, api_url, server):
+    def fetch():
+        return asyncio.run(get_eod_data_async("AAPL", "US", START, END, api_key="key"))
+
+    assert len(benchmark(fetch)) == server.sizes["eod"]
+    benchmark.extra_info["peak_memory_bytes"] = peak_memory(fetch)
+
+
+def test_get_dividends(benchmark, api_url, server):
+    ts = benchmark(get_dividends, "AAPL", "US", START, END, api_key="key")
+    assert len(ts) == server.sizes["div"]
+    benchmark.extra_info["peak_memory_bytes"] = peak_memory(lambda: get_dividends("AAPL", "US", START, END,
+                                                                                  api_key="key"))
+
+
+def test_get_exchange_symbols(benchmark, api_url, server):
+    df = benchmark(get_exchange_symbols, "US", api_key="key")
+    assert len(df) == server.sizes["exchanges"]
+    benchmark.extra_info["peak_memory_bytes"] = peak_memory(lambda: get_exchange_symbols("US", api_key="key"))
+
+
+@pytest.mark.parametrize("max_workers", [1, 4, 16])
+def test_bulk_throughput(benchmark, api_url, server, max_workers):
+    data, errors = benchmark.pedantic(get_eod_data_bulk, args=(SYMBOLS, "US", START, END),
+                                      kwargs={"api_key": "key", "max_workers": max_workers}, rounds=3)
+    assert errors == {} and len(data) == len(SYMBOLS)
+    benchmark.extra_info["symbols"] = len(SYMBOLS)
+    benchmark.extra_info["rows_per_round"] = len(SYMBOLS) * server.sizes["eod"]
+
+
+@pytest.mark.parametrize("parse_executor", ["process", "thread"])
+def test_pipeline_throughput(benchmark, api_url, server, parse_executor):
+    data, errors = benchmark.pedantic(get_eod_data_pipeline, args=(SYMBOLS, "US", START, END),
+                                      kwargs={"api_key": "key", "max_workers": 16,
+                                              "parse_executor": parse_executor}, rounds=3)
+    assert errors == {} and len(data) == len(SYMBOLS)
+    benchmark.extra_info["symbols"] = len(SYMBOLS)
+    benchmark.extra_info["rows_per_round"] = len(SYMBOLS) * server.sizes["eod"]
+
+
+@pytest.mark.parametrize("limit", [1, 4, 16])
+def test_async_client_throughput(benchmark, api_url, server, limit):
+    async def fetch_all():
+        async with AsyncEODClient(api_key="key", limit=limit) as client:
+            return await asyncio.gather(*[client.get_eod_data(symbol, "US", START, END) for symbol in SYMBOLS])
+
+    frames = benchmark.pedantic(lambda: asyncio.run(fetch_all()), rounds=3)
+    assert [len(df) for df in frames] == [server.sizes["eod"]] * len(SYMBOLS)
+    benchmark.extra_info["symbols"] = len(SYMBOLS)
@@ -0,0 +1,54 @@
+import pytest
+
+from eod_historical_data._parsers import ENGINES, _parse_eod, _parse_eod_json, _parse_dividends, _parse_exchange_symbols
+from ._helpers import peak_memory
+from ._server import eod_csv, eod_json, dividends_csv, exchange_symbols_csv
+
+pytest.importorskip("pytest_benchmark")
+
+
+def _engine(engine: str) -> str:
+    if engine == "pyarrow":
+        pytest.importorskip("pyarrow")
+    return engine
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_parse_eod(benchmark, request, engine):
+    data: bytes = eod_csv(request.config.getoption("--eod-rows"))
+    df = benchmark(_parse_eod, data, engine=_engine(engine))
+    assert len(df) == request.config.getoption("--eod-rows")
+    benchmark.extra_info["bytes"] = len(data)
+    benchmark.extra_info["peak_memory_bytes"] = peak_memory(lambda: _parse_eod(data, engine=engine))
+
+
+@pytest.mark.parametrize("rows", [5, None])
+def test_parse_eod_json(benchmark, request, rows):
+    rows = rows or request.config.getoption("--eod-rows")
+    data: bytes = eod_json(rows)
+    df = benchmark(_parse_eod_json, data)
+    assert len(df) == rows
+    benchmark.extra_info["bytes"] = len(data)
+
+
+@pytest.mark.parametrize("rows", [5])
+def test_parse_eod_small(benchmark, rows):
+    # daily updates fetch a few rows, the fixed cost of read_csv dominates
+    df = benchmark(_parse_eod, eod_csv(rows))
+    assert len(df) == rows
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_parse_dividends(benchmark, request, engine):
+    data: bytes = dividends_csv(request.config.getoption("--dividend-rows"))
+    ts = benchmark(_parse_dividends, data, engine=_engine(engine))
+    assert len(ts) == request.config.getoption("--dividend-rows")
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_parse_exchange_symbols(benchmark, request, engine):
+    data: bytes = exchange_symbols_csv(request.config.getoption("--symbol-rows"))
+    df = benchmark(_parse_exchange_symbols, data, engine=_engine(engine))
+    assert len(df) == request.config.getoption("--symbol-rows")
+    benchmark.extra_info["bytes"] = len(data)
+    benchmark.extra_info["peak_memory_bytes"] = peak_memory(lambda: _parse_exchange_symbols(data, engine=engine))
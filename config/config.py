@@ -1,7 +1,8 @@
 from decouple import config
 import os
 class Config:
-    EOD_HISTORICAL_DATA_API_KEY_ENV_VAR: str = os.getenv('EOD_HISTORICAL_API_KEY') or config('EOD_HISTORICAL_API_KEY')
-    EOD_HISTORICAL_DATA_API_KEY_DEFAULT: str = os.getenv('EOD_HISTORICAL_API_KEY') or config('EOD_HISTORICAL_API_KEY')
+    # empty when not set, the key is then read again from the environment on first use
+    EOD_HISTORICAL_DATA_API_KEY_ENV_VAR: str = os.getenv('EOD_HISTORICAL_API_KEY') or config('EOD_HISTORICAL_API_KEY', default="")
+    EOD_HISTORICAL_DATA_API_KEY_DEFAULT: str = os.getenv('EOD_HISTORICAL_API_KEY') or config('EOD_HISTORICAL_API_KEY', default="")
     EOD_HISTORICAL_DATA_API_URL: str = "https://eodhistoricaldata.com/api"
     DEBUG: bool = False
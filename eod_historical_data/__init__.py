@@ -1,3 +1,58 @@
-from .data import (set_envar, get_eod_data, get_dividends,  # noqa
-                   get_exchange_symbols, get_exchanges,  # noqa
-                   get_currencies, get_indexes)  # noqa
+import importlib
+from typing import Any, Dict, List
+
+# Public names and the submodule defining them. Submodules are imported on first
+# attribute access so that "import eod_historical_data" does not load pandas,
+# requests or aiohttp, see PEP 562.
+_LAZY_ATTRIBUTES: Dict[str, str] = {
+    "set_envar": ".data",
+    "get_eod_data": ".data",
+    "get_eod_data_bulk": ".data",
+    "get_eod_data_chunked": ".data",
+    "get_eod_bulk_last_day": ".data",
+    "get_dividends": ".data",
+    "get_intraday_data": ".data",
+    "get_real_time_quotes": ".data",
+    "get_exchange_symbols": ".data",
+    "iter_exchange_symbols": ".data",
+    "iter_exchange_symbols_async": ".data",
+    "get_exchanges": ".reference",
+    "get_currencies": ".reference",
+    "get_indexes": ".reference",
+    "get_exchange_name": ".reference",
+    "get_index_exchange": ".reference",
+    "is_supported_exchange": ".reference",
+    "is_supported_currency": ".reference",
+    "get_eod_panel": ".panel",
+    "adjust_prices": ".adjust",
+    "adjust_panel": ".adjust",
+    "get_eod_data_pipeline": ".pipeline",
+    "EODClient": ".client",
+    "AsyncEODClient": ".async_client",
+    "stream_eod": ".async_client",
+    "QuotePoller": ".poller",
+    "HistoryStore": ".store",
+    "MappedHistory": ".mapped",
+    "ResponseCache": ".cache",
+    "RequestScheduler": ".scheduler",
+    "RequestCoalescer": ".coalesce",
+    "Instrumentation": ".instrumentation",
+    "MetricsAggregator": ".instrumentation",
+    "RequestEvent": ".instrumentation",
+}
+
+__all__: List[str] = list(_LAZY_ATTRIBUTES)
+
+
+def __getattr__(name: str) -> Any:
+    module: str = _LAZY_ATTRIBUTES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value: Any = getattr(importlib.import_module(module, __name__), name)
+    # cache it so __getattr__ is not called again for this name
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,72 @@
+from typing import Union, Tuple, Any
+
+import numpy as np
+import pandas as pd
+
+from ._parsers import EOD_VOLUME_COLUMN
+
+Pandas_Type = Union[pd.DataFrame, pd.Series]
+
+# "pandas" returns DataFrame / Series, "numpy" a structured array, "arrow" a pyarrow Table
+OUTPUTS: Tuple[str, ...] = ("pandas", "numpy", "arrow")
+
+# string columns with at most this share of distinct values become categorical in compact mode
+CATEGORY_RATIO: float = 0.5
+
+
+def _check_output(output: str) -> str:
+    if output not in OUTPUTS:
+        raise ValueError(f"output must be one of {OUTPUTS}, got {output!r}")
+    return output
+
+
+def _compact_column(column: pd.Series) -> pd.Series:
+    kind: str = column.dtype.kind
+    # Volume only holds floats when some rows are missing, float32 would round large volumes
+    if kind == "f" and column.name != EOD_VOLUME_COLUMN:
+        return column.astype("float32")
+    if kind in "iu":
+        return pd.to_numeric(column, downcast="integer")
+    if kind == "O" and len(column) > 0 and column.nunique() <= len(column) * CATEGORY_RATIO:
+        return column.astype("category")
+    return column
+
+
+def _compact(value: Pandas_Type) -> Pandas_Type:
+    """
+        Returns value with float32 prices, the smallest integer type holding each integer
+        column and categorical columns for repeated strings
+    """
+    if isinstance(value, pd.Series):
+        return _compact_column(value)
+    return pd.DataFrame({name: _compact_column(value[name]) for name in value.columns}, index=value.index)
+
+
+def _to_records(value: Pandas_Type) -> np.ndarray:
+    frame: pd.DataFrame = value.to_frame() if isinstance(value, pd.Series) else value
+    return frame.to_records(index=True)
+
+
+def _to_arrow(value: Pandas_Type) -> Any:
+    try:
+        import pyarrow as pa
+    except ImportError as e:
+        raise ImportError('output="arrow" requires pyarrow, install it with "pip install pyarrow"') from e
+    frame: pd.DataFrame = value.to_frame() if isinstance(value, pd.Series) else value
+    return pa.Table.from_pandas(frame, preserve_index=True)
+
+
+def _convert(value: Any, compact: bool = False, output: str = "pandas") -> Any:
+    """
+        Returns a parsed response in the requested format, anything else (sentinel, None)
+        is returned unchanged
+    """
+    if not isinstance(value, (pd.DataFrame, pd.Series)):
+        return value
+    if compact:
+        value = _compact(value)
+    if output == "numpy":
+        return _to_records(value)
+    if output == "arrow":
+        return _to_arrow(value)
+    return value
@@ -0,0 +1,342 @@
+import json
+from functools import lru_cache, partial
+from io import StringIO, BytesIO
+from typing import Union, Dict, Tuple, Optional, Sequence, Collection, List, Set, Callable, Any
+
+import numpy as np
+import pandas as pd
+
+Payload_Type = Union[str, bytes]
+
+# engine used when none is given, "c" is always available, "pyarrow" needs pandas >= 1.4 and pyarrow
+DEFAULT_ENGINE: str = "c"
+ENGINES: Tuple[str, ...] = ("c", "pyarrow", "python")
+
+EOD_PRICE_COLUMNS: Tuple[str, ...] = ("Open", "High", "Low", "Close", "Adjusted_close")
+EOD_VOLUME_COLUMN: str = "Volume"
+DATE_FORMAT: str = "%Y-%m-%d"
+
+# response formats, "csv" is parsed by pandas.read_csv, "json" is decoded with orjson when installed
+DEFAULT_FMT: str = "csv"
+FORMATS: Tuple[str, ...] = ("csv", "json")
+EXCHANGE_SYMBOLS_COLUMNS: Tuple[str, ...] = ("Code", "Name", "Country", "Exchange", "Currency", "Type", "Isin")
+# intraday bars are indexed by their UTC start time, Timestamp and Gmtoffset of the response are dropped
+INTRADAY_INDEX: str = "Datetime"
+INTRADAY_PRICE_COLUMNS: Tuple[str, ...] = ("Open", "High", "Low", "Close")
+# fields of a real-time quote, named as the API does, indexed by code ("AAPL.US")
+QUOTE_COLUMNS: Tuple[str, ...] = ("timestamp", "gmtoffset", "open", "high", "low", "close", "volume",
+                                  "previousClose", "change", "change_p")
+
+
+def _check_engine(engine: str) -> str:
+    if engine not in ENGINES:
+        raise ValueError(f"engine must be one of {ENGINES}, got {engine!r}")
+    return engine
+
+
+def _check_fmt(fmt: str) -> str:
+    if fmt not in FORMATS:
+        raise ValueError(f"fmt must be one of {FORMATS}, got {fmt!r}")
+    return fmt
+
+
+def _strip_footer(data: Payload_Type) -> Payload_Type:
+    """
+        Returns data without its trailing footer lines, EOD may end a csv response with a single
+        field line (no delimiter) which only the python engine could skip with skipfooter
+    """
+    newline, delimiter = ("\n", ",") if isinstance(data, str) else (b"\n", b",")
+    end: int = len(data)
+    # only the tail of the payload is scanned, the body is sliced once at most
+    while end > 0:
+        while end > 0 and data[end - 1:end].isspace():
+            end -= 1
+        line_start: int = data.rfind(newline, 0, end) + 1
+        if line_start == 0 or delimiter in data[line_start:end]:
+            break
+        end = line_start
+    return data if end == len(data) else data[:end]
+
+
+def _buffer(data: Payload_Type) -> Union[StringIO, BytesIO]:
+    return StringIO(data) if isinstance(data, str) else BytesIO(data)
+
+
+def _to_datetime_index(df: pd.DataFrame) -> pd.DataFrame:
+    df.index = pd.to_datetime(df.index, format=DATE_FORMAT)
+    return df
+
+
+def _parse_eod(data: Payload_Type, engine: str = DEFAULT_ENGINE, float_dtype: str = "float64") -> pd.DataFrame:
+    """
+        Returns End oF Day Data DataFrame from EOD csv response,
+        prices are parsed as float_dtype, Volume as int64 and Date as datetime64 index
+    """
+    dtype: Dict[str, str] = {column: float_dtype for column in EOD_PRICE_COLUMNS}
+    # Volume may be missing for some rows, it is parsed as float and narrowed to int64 below
+    dtype[EOD_VOLUME_COLUMN] = "float64"
+    df: pd.DataFrame = pd.read_csv(_buffer(_strip_footer(data)), engine=_check_engine(engine), dtype=dtype,
+                                   index_col=0)
+    if EOD_VOLUME_COLUMN in df.columns and df[EOD_VOLUME_COLUMN].notna().all():
+        df[EOD_VOLUME_COLUMN] = df[EOD_VOLUME_COLUMN].astype("int64")
+    return _to_datetime_index(df)
+
+
+def _parse_eod_bulk(data: Payload_Type, engine: str = DEFAULT_ENGINE, float_dtype: str = "float64") -> pd.DataFrame:
+    """
+        Returns End oF Day Data DataFrame of a whole exchange from EOD bulk csv response, indexed by Code,
+        with the exchange in Ex and the day of each row in Date
+    """
+    dtype: Dict[str, str] = {column: float_dtype for column in EOD_PRICE_COLUMNS}
+    dtype.update({EOD_VOLUME_COLUMN: "float64", "Code": "str", "Ex": "str", "Date": "str"})
+    # Codes such as "NA" must stay strings, only empty fields are missing values
+    df: pd.DataFrame = pd.read_csv(_buffer(_strip_footer(data)), engine=_check_engine(engine), dtype=dtype,
+                                   keep_default_na=False, na_values=[""], index_col="Code")
+    df["Date"] = pd.to_datetime(df["Date"], format=DATE_FORMAT)
+    if EOD_VOLUME_COLUMN in df.columns and df[EOD_VOLUME_COLUMN].notna().all():
+        df[EOD_VOLUME_COLUMN] = df[EOD_VOLUME_COLUMN].astype("int64")
+    return df
+
+
+def _parse_dividends(data: Payload_Type, engine: str = DEFAULT_ENGINE) -> pd.Series:
+    """
+        Returns Dividends Series from EOD csv response
+    """
+    df: pd.DataFrame = pd.read_csv(_buffer(_strip_footer(data)), engine=_check_engine(engine),
+                                   dtype={"Dividends": "float64"}, index_col=0)
+    assert len(df.columns) == 1
+    return _to_datetime_index(df)["Dividends"]
+
+
+def _parse_exchange_symbols(data: Payload_Type, engine: str = DEFAULT_ENGINE) -> pd.DataFrame:
+    """
+        Returns exchange symbols DataFrame from EOD csv response, indexed by Code
+    """
+    # Codes such as "0001" or "NA" must stay strings, only empty fields are missing values
+    return pd.read_csv(_buffer(_strip_footer(data)), engine=_check_engine(engine), dtype=str,
+                       keep_default_na=False, na_values=[""], index_col=0)
+
+
+class _ExchangeSymbolsChunker:
+    """
+        Accumulates raw csv lines of an exchange symbols response and parses them chunksize
+        lines at a time, keeping only the requested columns and symbol types
+
+        NOTE a quoted field spanning several lines is not supported, EOD does not send any
+    """
+
+    def __init__(self, chunksize: int, columns: Optional[Sequence[str]] = None,
+                 types: Optional[Collection[str]] = None, engine: str = DEFAULT_ENGINE):
+        if chunksize < 1:
+            raise ValueError("chunksize must be at least 1")
+        self.chunksize: int = chunksize
+        self.columns: Optional[List[str]] = None if columns is None else [c for c in columns if c != "Code"]
+        self.types: Optional[Set[str]] = None if types is None else set(types)
+        self.engine: str = _check_engine(engine)
+        self._header: Optional[bytes] = None
+        self._lines: List[bytes] = []
+
+    def _usecols(self) -> Optional[List[str]]:
+        if self.columns is None:
+            return None
+        extra: List[str] = ["Type"] if self.types is not None and "Type" not in self.columns else []
+        return ["Code"] + self.columns + extra
+
+    def feed(self, line: bytes) -> Optional[pd.DataFrame]:
+        """
+            Adds one line, returns a parsed chunk once chunksize lines are held
+        """
+        line = line.rstrip(b"\r\n")
+        if self._header is None:
+            if line.strip():
+                self._header = line
+            return None
+        # skip blank lines and the single field footer line
+        if b"," not in line:
+            return None
+        self._lines.append(line)
+        return self.flush() if len(self._lines) >= self.chunksize else None
+
+    def flush(self) -> Optional[pd.DataFrame]:
+        """
+            Parses the lines held, returns None when none is left after filtering
+        """
+        if self._header is None or len(self._lines) == 0:
+            return None
+        data: bytes = b"\n".join([self._header] + self._lines)
+        self._lines = []
+        df: pd.DataFrame = pd.read_csv(BytesIO(data), engine=self.engine, dtype=str, keep_default_na=False,
+                                       na_values=[""], usecols=self._usecols(), index_col="Code")
+        if self.types is not None:
+            df = df[df["Type"].isin(self.types)]
+        if self.columns is not None:
+            df = df[self.columns]
+        return df if len(df) > 0 else None
+
+
+def _parse_intraday(data: Payload_Type, engine: str = DEFAULT_ENGINE, float_dtype: str = "float64") -> pd.DataFrame:
+    """
+        Returns intraday bars DataFrame from EOD csv response, prices are parsed as float_dtype,
+        Volume as int64 and the Unix Timestamp as a UTC datetime64 index
+    """
+    dtype: Dict[str, str] = {column: float_dtype for column in INTRADAY_PRICE_COLUMNS}
+    dtype.update({EOD_VOLUME_COLUMN: "float64", "Timestamp": "int64"})
+    df: pd.DataFrame = pd.read_csv(_buffer(_strip_footer(data)), engine=_check_engine(engine), dtype=dtype,
+                                   usecols=("Timestamp",) + INTRADAY_PRICE_COLUMNS + (EOD_VOLUME_COLUMN,))
+    df.index = pd.DatetimeIndex(pd.to_datetime(df.pop("Timestamp").to_numpy(), unit="s"), name=INTRADAY_INDEX)
+    if df[EOD_VOLUME_COLUMN].notna().all():
+        df[EOD_VOLUME_COLUMN] = df[EOD_VOLUME_COLUMN].astype("int64")
+    return df
+
+
+def _quotes_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """
+        Returns real-time quotes with float64 fields, "NA" of the fields the API does not know
+        as NaN, and timestamp as UTC datetime64
+    """
+    for column in QUOTE_COLUMNS:
+        if column not in df.columns:
+            df[column] = np.nan
+        # float64 for every field, csv and json responses compare equal whatever the values
+        df[column] = pd.to_numeric(df[column], errors="coerce").astype("float64")
+    # a missing timestamp is NaT, numpy warns when casting the NaN
+    with np.errstate(invalid="ignore"):
+        df["timestamp"] = pd.to_datetime(df["timestamp"], unit="s")
+    return df[list(QUOTE_COLUMNS)]
+
+
+def _parse_real_time(data: Payload_Type, engine: str = DEFAULT_ENGINE) -> pd.DataFrame:
+    """
+        Returns real-time quotes DataFrame from EOD csv response, one row per code
+    """
+    df: pd.DataFrame = pd.read_csv(_buffer(_strip_footer(data)), engine=_check_engine(engine),
+                                   dtype={"code": "str"}, index_col="code")
+    df.index.name = "code"
+    return _quotes_frame(df)
+
+
+@lru_cache(maxsize=None)
+def _json_decoder() -> Callable[[Payload_Type], Any]:
+    """
+        Returns orjson.loads when orjson is installed, json.loads otherwise
+    """
+    try:
+        import orjson
+    except ImportError:
+        return json.loads
+    return orjson.loads
+
+
+def _json_records(data: Payload_Type) -> List[Dict[str, Any]]:
+    records: Any = _json_decoder()(data)
+    if not isinstance(records, list):
+        raise ValueError(f"expected a json array, got {type(records).__name__}")
+    return records
+
+
+def _json_date_index(records: List[Dict[str, Any]]) -> pd.DatetimeIndex:
+    dates: np.ndarray = np.array([record["date"] for record in records], dtype="datetime64[D]")
+    return pd.DatetimeIndex(dates.astype("datetime64[ns]"), name="Date")
+
+
+def _json_eod_columns(records: List[Dict[str, Any]], float_dtype: str) -> Dict[str, np.ndarray]:
+    columns: Dict[str, np.ndarray] = {
+        # missing values are null, numpy turns None into nan for float dtypes
+        column: np.array([record.get(column.lower()) for record in records], dtype=float_dtype)
+        for column in EOD_PRICE_COLUMNS
+    }
+    volume: List[Any] = [record.get("volume") for record in records]
+    columns[EOD_VOLUME_COLUMN] = np.array(volume, dtype="float64" if None in volume else "int64")
+    return columns
+
+
+def _parse_eod_json(data: Payload_Type, float_dtype: str = "float64") -> pd.DataFrame:
+    """
+        Returns End oF Day Data DataFrame from EOD json response, shaped like _parse_eod,
+        every column is built straight from the decoded records without a csv tokenizer
+    """
+    records: List[Dict[str, Any]] = _json_records(data)
+    return pd.DataFrame(_json_eod_columns(records, float_dtype), index=_json_date_index(records))
+
+
+def _parse_eod_bulk_json(data: Payload_Type, float_dtype: str = "float64") -> pd.DataFrame:
+    """
+        Returns End oF Day Data DataFrame of a whole exchange from EOD bulk json response,
+        shaped like _parse_eod_bulk
+    """
+    records: List[Dict[str, Any]] = _json_records(data)
+    columns: Dict[str, Any] = {
+        "Ex": np.array([record.get("exchange_short_name") for record in records], dtype=object),
+        "Date": _json_date_index(records).values,
+    }
+    columns.update(_json_eod_columns(records, float_dtype))
+    index: pd.Index = pd.Index([record["code"] for record in records], dtype=object, name="Code")
+    return pd.DataFrame(columns, index=index)
+
+
+def _parse_dividends_json(data: Payload_Type) -> pd.Series:
+    """
+        Returns Dividends Series from EOD json response, shaped like _parse_dividends
+    """
+    records: List[Dict[str, Any]] = _json_records(data)
+    values: np.ndarray = np.array([record.get("value") for record in records], dtype="float64")
+    return pd.Series(values, index=_json_date_index(records), name="Dividends")
+
+
+def _parse_intraday_json(data: Payload_Type, float_dtype: str = "float64") -> pd.DataFrame:
+    """
+        Returns intraday bars DataFrame from EOD json response, shaped like _parse_intraday
+    """
+    records: List[Dict[str, Any]] = _json_records(data)
+    columns: Dict[str, np.ndarray] = {
+        column: np.array([record.get(column.lower()) for record in records], dtype=float_dtype)
+        for column in INTRADAY_PRICE_COLUMNS
+    }
+    volume: List[Any] = [record.get("volume") for record in records]
+    columns[EOD_VOLUME_COLUMN] = np.array(volume, dtype="float64" if None in volume else "int64")
+    timestamps: np.ndarray = np.array([record["timestamp"] for record in records], dtype="int64")
+    index: pd.DatetimeIndex = pd.DatetimeIndex(pd.to_datetime(timestamps, unit="s"), name=INTRADAY_INDEX)
+    return pd.DataFrame(columns, index=index)
+
+
+def _parse_real_time_json(data: Payload_Type) -> pd.DataFrame:
+    """
+        Returns real-time quotes DataFrame from EOD json response, shaped like _parse_real_time,
+        the API returns an object for one code and an array for several
+    """
+    records: Any = _json_decoder()(data)
+    records = [records] if isinstance(records, dict) else records
+    df: pd.DataFrame = pd.DataFrame.from_records(records, columns=("code",) + QUOTE_COLUMNS, index="code")
+    return _quotes_frame(df)
+
+
+def _parse_exchange_symbols_json(data: Payload_Type) -> pd.DataFrame:
+    """
+        Returns exchange symbols DataFrame from EOD json response, shaped like _parse_exchange_symbols
+    """
+    records: List[Dict[str, Any]] = _json_records(data)
+    # empty strings are missing values as in the csv response
+    columns: Dict[str, List[Optional[str]]] = {column: [record.get(column) or None for record in records]
+                                               for column in EXCHANGE_SYMBOLS_COLUMNS}
+    index: pd.Index = pd.Index(columns.pop("Code"), dtype=object, name="Code")
+    return pd.DataFrame(columns, index=index, dtype=object)
+
+
+_CSV_PARSERS: Dict[str, Callable[..., Any]] = {
+    "eod": _parse_eod, "div": _parse_dividends, "exchanges": _parse_exchange_symbols, "eod-bulk": _parse_eod_bulk,
+    "intraday": _parse_intraday, "real-time": _parse_real_time,
+}
+_JSON_PARSERS: Dict[str, Callable[..., Any]] = {
+    "eod": _parse_eod_json, "div": _parse_dividends_json, "exchanges": _parse_exchange_symbols_json,
+    "eod-bulk": _parse_eod_bulk_json, "intraday": _parse_intraday_json, "real-time": _parse_real_time_json,
+}
+
+
+def _get_parser(endpoint: str, fmt: str = DEFAULT_FMT, engine: str = DEFAULT_ENGINE) -> Callable[[Payload_Type], Any]:
+    """
+        Returns the parser of a response of endpoint ("eod", "div", "exchanges", "eod-bulk", "intraday"
+        or "real-time") in format fmt, engine only applies to csv
+    """
+    if _check_fmt(fmt) == "json":
+        return _JSON_PARSERS[endpoint]
+    return partial(_CSV_PARSERS[endpoint], engine=_check_engine(engine))
@@ -1,12 +1,14 @@
-from sqlite3 import Timestamp
-from typing import Optional, Union, Dict, Tuple, Callable
+from typing import Optional, Union, Dict, Tuple, Callable, List
 import functools
+import importlib.util
+import inspect
 import requests
 from datetime import date, datetime
 import traceback
 import pandas as pd
 import pandas.api.types as _types
 from urllib.parse import urlencode
+from requests.adapters import HTTPAdapter
 from requests.exceptions import RetryError, ConnectTimeout
 from config.config import Config
 
@@ -14,15 +16,59 @@ config_instance: Config = Config()
 # NOTE do not remove
 
 
-Sanitize_Type = Tuple[Union[Timestamp, datetime], Union[Timestamp, datetime]]
+Sanitize_Type = Tuple[Union[pd.Timestamp, datetime], Union[pd.Timestamp, datetime]]
 Handle_Request_Type = Callable[..., Optional[pd.DataFrame]]
 
+# arguments the endpoints take from the default EODClient when they are not given
+CLIENT_SETTINGS: Tuple[str, ...] = ("cache", "scheduler", "coalescer")
+
 
 def _init_session(session: Optional[requests.Session]) -> requests.Session:
     """
-        Returns a requests.Session (or CachedSession)
+        Returns a requests.Session (or CachedSession), the session of the default EODClient
+        when none is given so connections are kept alive between calls
+    """
+    if session is not None:
+        return session
+    # imported on first use, the client module imports the endpoints
+    from .client import _get_client
+    return _get_client().session
+
+
+def _init_pooled_session(session: Optional[requests.Session], pool_size: int) -> requests.Session:
+    """
+        Returns a requests.Session (or CachedSession) able to keep pool_size connections
+        alive to the same host, a session passed in by the caller is returned untouched,
+        otherwise one of the default EODClient, kept open for the next call
+    """
+    if session is not None:
+        return session
+    # imported on first use, the client module imports the endpoints
+    from .client import _get_client
+    return _get_client().pooled_session(pool_size)
+
+
+def _pooled_session(pool_size: int) -> requests.Session:
+    """
+        Returns a new requests.Session keeping up to pool_size connections alive to the same host
     """
-    return requests.Session() if session is None else session
+    session: requests.Session = requests.Session()
+    adapter: HTTPAdapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+@functools.lru_cache(maxsize=None)
+def _accept_encoding() -> str:
+    """
+        Returns the Accept-Encoding header sent with every request, brotli is only asked
+        for when a brotli decoder that requests and aiohttp can use is installed
+    """
+    encodings: str = "gzip, deflate"
+    if importlib.util.find_spec("brotli") is not None or importlib.util.find_spec("brotlicffi") is not None:
+        encodings += ", br"
+    return encodings
 
 
 def _url(url: str, params: Dict[str, str]) -> str:
@@ -84,15 +130,31 @@ def _handle_request_errors(func: Handle_Request_Type) -> Optional[Handle_Request
 
 
 def _handle_environ_error(func: Handle_Request_Type) -> Optional[Handle_Request_Type]:
+    """
+        Calls func with the api_key of the default EODClient when none is given, raises
+        EnvironNotSet when there is none either, the settings of the default EODClient in
+        CLIENT_SETTINGS are used as well when func accepts them and they are not given
+    """
+    signature: inspect.Signature = inspect.signature(func)
+    settings: List[str] = [name for name in CLIENT_SETTINGS if name in signature.parameters]
+
     @functools.wraps(func)
     def wrapper(*args, **kwargs):
-        try:
-            api_key: Optional[str] = kwargs.get('api_key')
-            assert api_key is not None
-            assert api_key != ""
-            return func(*args, **kwargs)
-        except AssertionError:
-            raise EnvironNotSet("Environment not set, see readme.md on how to setup your environment variables")
+        bound: inspect.BoundArguments = signature.bind_partial(*args, **kwargs)
+        # imported on first use, the client module imports the endpoints
+        from .client import _get_client
+        client = _get_client()
+        for name in settings:
+            # an explicit None is kept, it disables the setting
+            if name not in bound.arguments:
+                bound.arguments[name] = getattr(client, name)
+        api_key: Optional[str] = bound.arguments.get('api_key')
+        if api_key is None or api_key == "":
+            api_key = client.api_key
+            if api_key is None or api_key == "":
+                raise EnvironNotSet("Environment not set, see readme.md on how to setup your environment variables")
+            bound.arguments['api_key'] = api_key
+        return func(*bound.args, **bound.kwargs)
 
     return wrapper
 
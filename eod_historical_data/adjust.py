@@ -0,0 +1,165 @@
+from typing import Optional, Dict, Tuple, List, Mapping
+
+import numpy as np
+import pandas as pd
+
+from ._parsers import EOD_PRICE_COLUMNS, EOD_VOLUME_COLUMN
+from .panel import Panel_Type, _assemble_panel
+
+Events_Type = Optional[Mapping[str, Optional[pd.Series]]]
+
+# columns scaled by the price factor, Adjusted_close is already adjusted by EOD
+ADJUSTED_PRICE_COLUMNS: Tuple[str, ...] = tuple(column for column in EOD_PRICE_COLUMNS if column != "Adjusted_close")
+CLOSE_COLUMN: str = "Close"
+
+
+def _split_ratios(splits: pd.Series) -> pd.Series:
+    """
+        Returns splits as float ratios (new shares per old share), "4/1" and "4.000000/1.000000"
+        strings as returned by EOD are divided out, numbers are kept
+    """
+    if splits.dtype.kind in "fiu":
+        return splits.astype("float64")
+    parts: pd.DataFrame = splits.astype(str).str.split("/", n=1, expand=True)
+    if parts.shape[1] == 1:
+        return parts[0].astype("float64")
+    return parts[0].astype("float64") / parts[1].fillna("1").astype("float64")
+
+
+def _events(calendar: np.ndarray, symbols: List[str], events: Events_Type, neutral: float) -> np.ndarray:
+    """
+        Returns a (date x symbol) matrix holding the value of every event on its date, neutral
+        elsewhere, an event falling on a day without a row applies to the next row, events after
+        the last row are dropped and events of the same row are combined by product (splits) or
+        sum (dividends)
+    """
+    matrix: np.ndarray = np.full((len(calendar), len(symbols)), neutral, dtype="float64")
+    for column, symbol in enumerate(symbols):
+        series: Optional[pd.Series] = None if events is None else events.get(symbol)
+        if series is None or len(series) == 0:
+            continue
+        values: np.ndarray = series.to_numpy(dtype="float64")
+        rows: np.ndarray = calendar.searchsorted(pd.DatetimeIndex(series.index).values.astype("datetime64[ns]"))
+        keep: np.ndarray = rows < len(calendar)
+        if neutral == 1.0:
+            np.multiply.at(matrix[:, column], rows[keep], values[keep])
+        else:
+            np.add.at(matrix[:, column], rows[keep], values[keep])
+    return matrix
+
+
+def _previous_close(close: np.ndarray) -> np.ndarray:
+    """
+        Returns the close of the row before every row, the last known one when it is missing,
+        NaN for the first row
+    """
+    rows: np.ndarray = np.arange(close.shape[0])[:, None]
+    last: np.ndarray = np.where(np.isnan(close), 0, rows)
+    np.maximum.accumulate(last, axis=0, out=last)
+    known: np.ndarray = close[last, np.arange(close.shape[1])]
+    previous: np.ndarray = np.full_like(close, np.nan)
+    previous[1:] = known[:-1]
+    return previous
+
+
+def _reverse_cumprod(events: np.ndarray) -> np.ndarray:
+    """
+        Returns for every row the product of the events of the rows after it
+    """
+    factor: np.ndarray = np.ones_like(events)
+    if len(events) > 1:
+        factor[:-1] = np.cumprod(events[:0:-1], axis=0)[::-1]
+    return factor
+
+
+def _factors(close: np.ndarray, dividends: np.ndarray, splits: np.ndarray,
+             dividends_adjusted: bool) -> Tuple[np.ndarray, np.ndarray]:
+    """
+        Returns (price factor, volume factor) (date x symbol) matrices from raw closes, dividends
+        and split ratios on their ex-dates, the adjusted price of a row is the raw price times the
+        price factor, the dividend of an ex-date t scales the rows before t by 1 - dividend / close(t - 1)
+    """
+    split_factor: np.ndarray = _reverse_cumprod(splits)
+    if dividends_adjusted:
+        # EOD dividends are split-adjusted, back to the raw units of the closes they are divided by
+        dividends = dividends * split_factor
+    with np.errstate(divide="ignore", invalid="ignore"):
+        dividend_events: np.ndarray = 1.0 - dividends / _previous_close(close)
+    # no close to divide by before the first row, or a dividend larger than the close
+    dividend_events[~np.isfinite(dividend_events) | (dividend_events <= 0)] = 1.0
+    return _reverse_cumprod(dividend_events) / split_factor, split_factor
+
+
+def adjust_panel(panel: Panel_Type, dividends: Events_Type = None, splits: Events_Type = None,
+                 dividends_adjusted: bool = True) -> Panel_Type:
+    """
+        **adjust_panel**
+            back-adjusts a panel of get_eod_panel for splits and dividends, every symbol at once
+
+        PARAMETERS
+            panel: (dict) -> field -> (date x symbol) DataFrame as returned by get_eod_panel, holding
+                at least Close, without fill so missing rows stay NaN
+            dividends: (dict) -> symbol -> dividends Series as returned by get_dividends
+            splits: (dict) -> symbol -> splits Series indexed by date, ratios as numbers (2.0 for a 2
+                for 1 split) or strings such as "2/1" or "2.000000/1.000000"
+            dividends_adjusted: (bool) -> dividends are split-adjusted, as returned by EOD, set it to
+                False for dividends in the units of the raw prices of their date
+
+        EXCEPTIONS:
+            KeyError -> will be raised if panel has no Close field
+
+        returns -> panel with Open, High, Low, Close adjusted for splits and dividends, Volume
+            adjusted for splits, Total_return the adjusted Close divided by its first value, and
+            Price_factor / Volume_factor the factors applied, the other fields are unchanged
+    """
+    close: pd.DataFrame = panel[CLOSE_COLUMN]
+    symbols: List[str] = list(close.columns)
+    calendar: np.ndarray = close.index.values.astype("datetime64[ns]")
+    split_events: Optional[Dict[str, pd.Series]] = None if splits is None else {
+        symbol: None if series is None else _split_ratios(series) for symbol, series in splits.items()}
+    price_factor, volume_factor = _factors(close.to_numpy(dtype="float64"),
+                                           _events(calendar, symbols, dividends, 0.0),
+                                           _events(calendar, symbols, split_events, 1.0),
+                                           dividends_adjusted)
+
+    def frame(matrix: np.ndarray) -> pd.DataFrame:
+        return pd.DataFrame(matrix, index=close.index, columns=close.columns, copy=False)
+
+    adjusted: Panel_Type = dict(panel)
+    for field in ADJUSTED_PRICE_COLUMNS:
+        if field in panel:
+            adjusted[field] = frame(panel[field].to_numpy(dtype="float64") * price_factor)
+    if EOD_VOLUME_COLUMN in panel:
+        adjusted[EOD_VOLUME_COLUMN] = frame(panel[EOD_VOLUME_COLUMN].to_numpy(dtype="float64") * volume_factor)
+    adjusted_close: np.ndarray = adjusted[CLOSE_COLUMN].to_numpy()
+    # first close of every symbol, total return indexes start at 1
+    first: np.ndarray = np.argmax(~np.isnan(adjusted_close), axis=0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        adjusted["Total_return"] = frame(adjusted_close / adjusted_close[first, np.arange(len(symbols))])
+    adjusted["Price_factor"] = frame(price_factor)
+    adjusted["Volume_factor"] = frame(volume_factor)
+    return adjusted
+
+
+def adjust_prices(prices: pd.DataFrame, dividends: Optional[pd.Series] = None,
+                  splits: Optional[pd.Series] = None, dividends_adjusted: bool = True) -> pd.DataFrame:
+    """
+        **adjust_prices**
+            back-adjusts the End oF Day Data of one symbol, see adjust_panel
+
+        PARAMETERS
+            prices: (DataFrame) -> End oF Day Data as returned by get_eod_data
+            dividends: (Series) -> dividends as returned by get_dividends
+            splits: (Series) -> splits, see adjust_panel
+            dividends_adjusted: (bool) -> see adjust_panel
+
+        returns -> DataFrame of prices with Open, High, Low, Close and Volume adjusted and a
+            Total_return column, Adjusted_close is kept as returned by EOD to validate Close against
+    """
+    fields: List[str] = [column for column in prices.columns if column in EOD_PRICE_COLUMNS + (EOD_VOLUME_COLUMN,)]
+    panel: Panel_Type = adjust_panel(_assemble_panel({"": prices}, fields), {"": dividends}, {"": splits},
+                                     dividends_adjusted=dividends_adjusted)
+    columns: List[str] = fields + ["Total_return"]
+    df: pd.DataFrame = pd.DataFrame({column: panel[column][""] for column in columns})
+    df.index.name = prices.index.name
+    return df
@@ -0,0 +1,304 @@
+import itertools
+from typing import (Optional, Dict, Callable, Any, Sequence, Collection, AsyncIterator, Iterable, Iterator, Tuple,
+                    TYPE_CHECKING)
+
+import pandas as pd
+
+from .scheduler import RequestScheduler, AsyncResponse, _get_scheduler
+from .cache import ResponseCache, Cache_Key_Type, Validators_Type, Stale_Type, _cache_key, _conditional_headers
+from .coalesce import RequestCoalescer
+from .instrumentation import _track, _trace_config
+from ._formats import _convert, _check_output
+from ._parsers import _get_parser, _ExchangeSymbolsChunker, DEFAULT_ENGINE, DEFAULT_FMT
+from ._utils import _url, RemoteDataError, EnvironNotSet, api_key_not_authorized
+from .data import (EOD_HISTORICAL_DATA_API_KEY_DEFAULT, Start_END_Type, _create_params,
+                   _create_exchange_symbols_params, _api_key_not_authorized_message, _from_cache,
+                   _iter_exchange_symbols_async, _create_bulk_params, _bulk_cache_key, _coalesce_async, _stale,
+                   _is_current, _parse_validated, _cache_validated)
+
+if TYPE_CHECKING:
+    import aiohttp as io
+
+Stream_Type = AsyncIterator[Tuple[str, Any]]
+
+
+class AsyncEODClient:
+    """
+        **AsyncEODClient**
+            asynchronous client owning a single aiohttp connector, every request made through
+            the client reuses the same keep-alive connections and DNS cache
+
+        USAGE
+            async with AsyncEODClient(api_key=api_key, limit=50) as client:
+                frames = await asyncio.gather(*[client.get_eod_data(symbol, "US", start, end)
+                                                for symbol in symbols])
+
+        PARAMETERS
+            api_key: (str) -> EOD Historical API Key
+            limit: (int) -> maximum number of simultaneous connections, 0 means no limit
+            limit_per_host: (int) -> maximum number of simultaneous connections to the same host,
+                0 means no limit
+            ttl_dns_cache: (int) -> seconds resolved host names are cached for, None caches forever
+            use_dns_cache: (bool) -> cache DNS lookups
+            keepalive_timeout: (float) -> seconds an idle connection is kept open
+            timeout: (float) -> total timeout in seconds of a single request, None means no timeout
+            engine: (str) -> csv parser engine, "c" (default), "pyarrow" or "python"
+            cache: (ResponseCache) -> cache of parsed responses, may be shared with the
+                synchronous functions, None disables caching
+            scheduler: (RequestScheduler) -> rate limiting and retry policy, None uses the default scheduler
+            compact: (bool) -> downcast dtypes and categorical columns, see data.get_eod_data
+            output: (str) -> "pandas" (default), "numpy" for a structured array or "arrow" for a pyarrow Table
+            fmt: (str) -> response format requested, "csv" (default) or "json"
+            coalescer: (RequestCoalescer) -> concurrent identical requests share one response,
+                None disables it
+            base_url: (str) -> root url of the API, None uses the one of the default EODClient
+    """
+
+    def __init__(self, api_key: str = EOD_HISTORICAL_DATA_API_KEY_DEFAULT, limit: int = 100,
+                 limit_per_host: int = 0, ttl_dns_cache: Optional[int] = 300, use_dns_cache: bool = True,
+                 keepalive_timeout: float = 15, timeout: Optional[float] = None, engine: str = DEFAULT_ENGINE,
+                 cache: Optional[ResponseCache] = None, scheduler: Optional[RequestScheduler] = None,
+                 compact: bool = False, output: str = "pandas", fmt: str = DEFAULT_FMT,
+                 coalescer: Optional[RequestCoalescer] = None, base_url: Optional[str] = None):
+        if api_key is None or api_key == "":
+            # imported on first use, the client module imports the endpoints
+            from .client import _get_client
+            api_key = _get_client().api_key
+        if api_key is None or api_key == "":
+            raise EnvironNotSet("Environment not set, see readme.md on how to setup your environment variables")
+        self.api_key: str = api_key
+        self.limit: int = limit
+        self.limit_per_host: int = limit_per_host
+        self.ttl_dns_cache: Optional[int] = ttl_dns_cache
+        self.use_dns_cache: bool = use_dns_cache
+        self.keepalive_timeout: float = keepalive_timeout
+        self.timeout: Optional[float] = timeout
+        self.engine: str = engine
+        self.cache: Optional[ResponseCache] = cache
+        self.scheduler: Optional[RequestScheduler] = scheduler
+        self.compact: bool = compact
+        self.output: str = _check_output(output)
+        self.fmt: str = fmt
+        self.coalescer: Optional[RequestCoalescer] = coalescer
+        self.base_url: Optional[str] = base_url
+        # parsers are looked up once, this also validates engine and fmt
+        self._parsers: Dict[str, Callable[[bytes], Any]] = {endpoint: _get_parser(endpoint, fmt, engine)
+                                                            for endpoint in ("eod", "div", "exchanges", "eod-bulk")}
+        self._session: Optional["io.ClientSession"] = None
+
+    async def __aenter__(self) -> "AsyncEODClient":
+        await self.open()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        await self.close()
+
+    @property
+    def closed(self) -> bool:
+        return self._session is None or self._session.closed
+
+    async def open(self) -> None:
+        """
+            Creates the connector and the session shared by every request, called by __aenter__
+        """
+        if not self.closed:
+            return
+        # aiohttp is only imported once a client is opened
+        import aiohttp as io
+        connector: io.TCPConnector = io.TCPConnector(limit=self.limit, limit_per_host=self.limit_per_host,
+                                                     ttl_dns_cache=self.ttl_dns_cache,
+                                                     use_dns_cache=self.use_dns_cache,
+                                                     keepalive_timeout=self.keepalive_timeout)
+        self._session = io.ClientSession(connector=connector, timeout=io.ClientTimeout(total=self.timeout),
+                                         trace_configs=[_trace_config()])
+
+    async def close(self) -> None:
+        """
+            Closes the session and every pooled connection, called by __aexit__
+        """
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def _request(self, key: Cache_Key_Type, create: Callable[[Cache_Key_Type], Tuple[str, Dict[str, str]]],
+                       parse: Callable[[bytes], Any]) -> Any:
+        """
+            Returns the response to the request create(key) builds, parsed, create is given a key with
+            wider dates when the coalescer widens the request, an expired response of the cache is
+            requested again with its validators and reused when unchanged
+        """
+        validators: Optional[Validators_Type] = None
+
+        async def fetch(flight_key: Cache_Key_Type) -> Any:
+            nonlocal validators
+            validated: Optional[ResponseCache] = self.cache if flight_key == key else None
+            stale: Optional[Stale_Type] = _stale(validated, key)
+            url, params = create(flight_key)
+            response: AsyncResponse = await _get_scheduler(self.scheduler).get_async(
+                self._session, url, params, event=event, headers=_conditional_headers(stale))
+            if _is_current(response.status, stale):
+                value, response_validators = _parse_validated(validated, parse, response.status, response.headers,
+                                                              response.body, stale, event)
+                if flight_key == key:
+                    validators = response_validators
+                return value
+            elif response.status == api_key_not_authorized:
+                return _api_key_not_authorized_message()
+            else:
+                # replacing api token so it does not show in debug messages
+                params["api_token"] = "API TOKEN IS SECRET"
+                raise RemoteDataError(response.status, response.reason, _url(url, params))
+
+        with _track(key) as event:
+            cached: Optional[Any] = _from_cache(self.cache, key)
+            if cached is not None:
+                event.cache_hit = True
+                return _convert(cached, self.compact, self.output)
+            if self.closed:
+                raise RuntimeError("AsyncEODClient is closed, use it with 'async with' or call open() first")
+            value, event.coalesced = await _coalesce_async(self.coalescer, key, fetch)
+            # only the caller that sent the request stores the response, with its validators
+            if isinstance(value, (pd.DataFrame, pd.Series)) and not event.coalesced:
+                value = _cache_validated(self.cache, key, value, validators, event)
+            return _convert(value, self.compact, self.output)
+
+    async def get_eod_data(self, symbol: str, exchange: str, start: Start_END_Type = None,
+                           end: Start_END_Type = None) -> Optional[pd.DataFrame]:
+        """
+            Returns DataFrame containing End oF Day Data for the Symbol, see data.get_eod_data
+        """
+        key: Cache_Key_Type = _cache_key("eod", symbol, exchange, start, end)
+        return await self._request(key, lambda k: _create_params(symbol=symbol, exchange=exchange, start=k[3],
+                                                                 end=k[4], api_key=self.api_key, fmt=self.fmt,
+                                                                 base_url=self.base_url),
+                                   self._parsers["eod"])
+
+    async def get_dividends(self, symbol: str, exchange: str, start: Start_END_Type = None,
+                            end: Start_END_Type = None) -> Optional[pd.Series]:
+        """
+            Returns dividends, see data.get_dividends
+        """
+        key: Cache_Key_Type = _cache_key("div", symbol, exchange, start, end)
+        return await self._request(key, lambda k: _create_params(symbol=symbol, exchange=exchange, start=k[3],
+                                                                 end=k[4], api_key=self.api_key, endpoint="div",
+                                                                 fmt=self.fmt, base_url=self.base_url),
+                                   self._parsers["div"])
+
+    async def get_exchange_symbols(self, exchange_code: str) -> Optional[pd.DataFrame]:
+        """
+            Returns list of symbols for a given exchange, see data.get_exchange_symbols
+        """
+        key: Cache_Key_Type = _cache_key("exchanges", exchange_code)
+        return await self._request(key, lambda k: _create_exchange_symbols_params(exchange_code=exchange_code,
+                                                                                  api_key=self.api_key,
+                                                                                  fmt=self.fmt,
+                                                                                  base_url=self.base_url),
+                                   self._parsers["exchanges"])
+
+    async def get_eod_bulk_last_day(self, exchange: str, day: Start_END_Type = None,
+                                    symbols: Optional[Iterable[str]] = None) -> Optional[pd.DataFrame]:
+        """
+            Returns End oF Day Data of one day for every symbol of an exchange, see data.get_eod_bulk_last_day
+        """
+        symbols = None if symbols is None else list(symbols)
+        return await self._request(_bulk_cache_key(exchange, day, symbols),
+                                   lambda k: _create_bulk_params(exchange=exchange, day=day, symbols=symbols,
+                                                                 api_key=self.api_key, fmt=self.fmt,
+                                                                 base_url=self.base_url),
+                                   self._parsers["eod-bulk"])
+
+    def iter_exchange_symbols(self, exchange_code: str, chunksize: int = 5000,
+                              columns: Optional[Sequence[str]] = None,
+                              types: Optional[Collection[str]] = None) -> AsyncIterator[pd.DataFrame]:
+        """
+            Streams the list of symbols for a given exchange chunk by chunk, use it with "async for",
+            see data.iter_exchange_symbols
+        """
+        if self.closed:
+            raise RuntimeError("AsyncEODClient is closed, use it with 'async with' or call open() first")
+        chunker: _ExchangeSymbolsChunker = _ExchangeSymbolsChunker(chunksize, columns=columns, types=types,
+                                                                   engine=self.engine)
+        url, params = _create_exchange_symbols_params(exchange_code=exchange_code, api_key=self.api_key,
+                                                      base_url=self.base_url)
+        return _iter_exchange_symbols_async(chunker, _cache_key("exchanges", exchange_code), url, params,
+                                            self._session, self.scheduler)
+
+    async def stream_eod(self, symbols: Iterable[str], exchange: str, start: Start_END_Type = None,
+                         end: Start_END_Type = None, window: int = 16, endpoint: str = "eod",
+                         return_exceptions: bool = False) -> Stream_Type:
+        """
+            Yields (symbol, result) as soon as the response of every symbol is parsed, in the order they
+            complete, at most window requests are in flight and symbols is read lazily so results can be
+            persisted and released while the next ones download, see stream_eod
+        """
+        # asyncio is only imported by the asynchronous callers
+        import asyncio
+        if window < 1:
+            raise ValueError("window must be at least 1")
+        if endpoint not in ("eod", "div"):
+            raise ValueError(f'endpoint must be "eod" or "div", got {endpoint!r}')
+        fetch: Callable[..., Any] = self.get_eod_data if endpoint == "eod" else self.get_dividends
+        remaining: Iterator[str] = iter(symbols)
+        pending: Dict["asyncio.Future", str] = {}
+        try:
+            while True:
+                for symbol in itertools.islice(remaining, window - len(pending)):
+                    pending[asyncio.ensure_future(fetch(symbol, exchange, start, end))] = symbol
+                if len(pending) == 0:
+                    return
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for future in done:
+                    symbol = pending.pop(future)
+                    error: Optional[BaseException] = future.exception()
+                    if error is not None and not return_exceptions:
+                        raise error
+                    yield symbol, future.result() if error is None else error
+        finally:
+            # the consumer stopped early or a request failed, the requests in flight are dropped
+            for future in pending:
+                future.cancel()
+            if len(pending) > 0:
+                await asyncio.gather(*pending, return_exceptions=True)
+
+
+async def stream_eod(symbols: Iterable[str], exchange: str, start: Start_END_Type = None,
+                     end: Start_END_Type = None, api_key: str = EOD_HISTORICAL_DATA_API_KEY_DEFAULT,
+                     window: int = 16, endpoint: str = "eod", return_exceptions: bool = False,
+                     **kwargs) -> Stream_Type:
+    """
+        **stream_eod**
+            asynchronous generator of the End oF Day Data of many symbols, every result is yielded as
+            soon as it is parsed instead of once the slowest symbol arrives, with a bounded number of
+            requests in flight so memory stays bounded, the first result comes after one request
+
+        USAGE
+            async for symbol, df in stream_eod(symbols, "US", start="2000-01-01", window=32):
+                store.write(symbol, "US", df)
+
+        PARAMETERS
+            symbols: (iterable of str) -> Ticker Symbols, read as requests complete so it may be a
+                generator of any length
+            exchange: (str) -> Exchange Code
+            start: (str, int, date, datetime) -> start date or integer representing Year
+            end: (str,int, date, datetime) -> end date or integer representing Year
+            api_key: (str) -> EOD Historical API Key
+            window: (int) -> maximum number of requests in flight at once, also the connection limit
+            endpoint: (str) -> "eod" for prices or "div" for dividends
+            return_exceptions: (bool) -> yield the exception of a symbol that failed as its result
+                instead of raising it, which cancels the requests in flight
+            kwargs: -> options of AsyncEODClient (cache, scheduler, compact, output, fmt, coalescer, ...)
+
+        EXCEPTIONS:
+            RemoteDataError -> will be raised if data cannot be returned from EOD for a symbol, unless
+                return_exceptions is True
+            ValueError -> Will be raised if either start or end do not contain Valid Data, if window is
+                lower than 1 or if an option is unknown
+
+        returns -> asynchronous iterator of (symbol, result) tuples in completion order, result is what
+            get_eod_data (or get_dividends) returns for the symbol
+    """
+    kwargs.setdefault("limit", window)
+    async with AsyncEODClient(api_key=api_key, **kwargs) as client:
+        async for item in client.stream_eod(symbols, exchange, start, end, window=window, endpoint=endpoint,
+                                            return_exceptions=return_exceptions):
+            yield item
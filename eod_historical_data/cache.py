@@ -0,0 +1,194 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from datetime import date
+from typing import Optional, Dict, Tuple, Any, Callable, Mapping
+
+from ._utils import _sanitize_dates, _format_date
+
+Cache_Key_Type = Tuple[Optional[str], ...]
+# (ETag, Last-Modified, hash of the body) of the response a value was parsed from
+Validators_Type = Tuple[Optional[str], Optional[str], str]
+# (value, validators) of an expired entry
+Stale_Type = Tuple[Any, Validators_Type]
+
+# seconds a parsed response stays fresh, per endpoint
+DEFAULT_TTLS: Dict[str, float] = {
+    "eod": 24 * 3600.0,
+    # eod ranges reaching today may still receive today's row
+    "eod_live": 5 * 60.0,
+    "eod-bulk": 24 * 3600.0,
+    "div": 24 * 3600.0,
+    "exchanges": 7 * 24 * 3600.0,
+}
+
+
+def _cache_key(endpoint: str, symbol: Optional[str] = None, exchange: Optional[str] = None,
+               start: Any = None, end: Any = None) -> Cache_Key_Type:
+    """
+        Returns the cache key of a request, dates are normalized so "2020-01-01", date(2020, 1, 1)
+        and the year 2020 give the same key
+    """
+    if start is None and end is None:
+        return endpoint, symbol, exchange, None, None
+    start, end = _sanitize_dates(start, end)
+    return endpoint, symbol, exchange, _format_date(start), _format_date(end)
+
+
+def _response_validators(headers: Mapping[str, str], body: bytes) -> Validators_Type:
+    """
+        Returns the validators of a response, the hash of the body is used when the server sends
+        neither ETag nor Last-Modified
+    """
+    return headers.get("ETag"), headers.get("Last-Modified"), hashlib.blake2b(body, digest_size=16).hexdigest()
+
+
+def _conditional_headers(stale: Optional[Stale_Type]) -> Dict[str, str]:
+    """
+        Returns the If-None-Match / If-Modified-Since headers asking the server to answer 304 Not
+        Modified when the value of stale is still current
+    """
+    headers: Dict[str, str] = {}
+    if stale is not None:
+        etag, last_modified, _ = stale[1]
+        if etag is not None:
+            headers["If-None-Match"] = etag
+        if last_modified is not None:
+            headers["If-Modified-Since"] = last_modified
+    return headers
+
+
+class ResponseCache:
+    """
+        **ResponseCache**
+            in-process cache of parsed responses (DataFrame or Series) with a least recently
+            used eviction policy and a time to live per endpoint, safe to share between threads
+            and between the synchronous and asynchronous functions
+
+        USAGE
+            cache = ResponseCache(maxsize=1000)
+            df = get_eod_data("AAPL", "US", start, end, cache=cache)
+            async with AsyncEODClient(cache=cache) as client: ...
+
+        PARAMETERS
+            maxsize: (int) -> maximum number of responses held, the least recently used is evicted first
+            ttl: (dict) -> seconds a response stays fresh per endpoint ("eod", "eod_live", "div",
+                "exchanges", "eod-bulk"), merged over DEFAULT_TTLS
+            default_ttl: (float) -> seconds a response stays fresh for endpoints missing from ttl
+
+        NOTE a value stored with the validators of its response is kept once expired, until evicted,
+            the next request for it is conditional and a 304 Not Modified, or a body with the same
+            hash, reuses it without parsing, see stale
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: Optional[Dict[str, float]] = None, default_ttl: float = 3600.0,
+                 clock: Callable[[], float] = time.monotonic):
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        self.maxsize: int = maxsize
+        self.ttl: Dict[str, float] = dict(DEFAULT_TTLS, **(ttl or {}))
+        self.default_ttl: float = default_ttl
+        self._clock: Callable[[], float] = clock
+        self._data: "OrderedDict[Cache_Key_Type, Tuple[float, Any, Optional[Validators_Type]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+        # expired values reused after a conditional request, see revalidated
+        self.revalidations: int = 0
+
+    def __getstate__(self) -> Dict[str, Any]:
+        return {"maxsize": self.maxsize, "ttl": self.ttl, "default_ttl": self.default_ttl, "clock": self._clock}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        # expiry times are readings of the clock of another process, a copy starts empty
+        self.__init__(state["maxsize"], state["ttl"], state["default_ttl"], state["clock"])
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: Cache_Key_Type) -> bool:
+        with self._lock:
+            entry = self._data.get(key)
+            return entry is not None and entry[0] > self._clock()
+
+    def ttl_for(self, key: Cache_Key_Type) -> float:
+        """
+            Returns the time to live in seconds of key
+        """
+        endpoint, end = key[0], key[4]
+        # a bulk request without a day returns the last trading day, which changes daily
+        if (endpoint == "eod" and end is not None and end >= date.today().isoformat()) or \
+                (endpoint == "eod-bulk" and (end is None or end >= date.today().isoformat())):
+            endpoint = "eod_live"
+        return self.ttl.get(endpoint, self.default_ttl)
+
+    def get(self, key: Cache_Key_Type) -> Optional[Any]:
+        """
+            Returns a copy of the fresh value stored for key or None
+        """
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None and entry[0] <= self._clock():
+                # an expired value with validators is kept for stale
+                if entry[2] is None:
+                    del self._data[key]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+        return entry[1].copy()
+
+    def stale(self, key: Cache_Key_Type) -> Optional[Stale_Type]:
+        """
+            Returns (value, validators) of the expired value stored for key with validators or None,
+            the value is not copied, it must not be modified
+        """
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or entry[2] is None or entry[0] > self._clock():
+                return None
+            return entry[1], entry[2]
+
+    def revalidated(self, key: Cache_Key_Type, value: Any, validators: Validators_Type) -> Any:
+        """
+            Stores value, a copy of the one returned by stale, fresh again after the server confirmed
+            it did not change and returns it
+        """
+        self.set(key, value, validators)
+        with self._lock:
+            self.revalidations += 1
+        return value
+
+    def set(self, key: Cache_Key_Type, value: Any, validators: Optional[Validators_Type] = None) -> None:
+        """
+            Stores a copy of value for key, evicting the least recently used values when full,
+            validators are the ones of the response value was parsed from
+        """
+        ttl: float = self.ttl_for(key)
+        if ttl <= 0:
+            return
+        value = value.copy()
+        with self._lock:
+            self._data[key] = (self._clock() + ttl, value, validators)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """
+            Removes every value, counters are kept
+        """
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """
+            Returns hits, misses, evictions and current size
+        """
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions, "size": len(self._data)}
@@ -0,0 +1,225 @@
+import inspect
+import os
+import threading
+from typing import Optional, Dict, Any, Callable
+
+import requests
+
+from .cache import ResponseCache
+from .scheduler import RequestScheduler, Timeout_Type
+from .coalesce import RequestCoalescer
+from ._formats import _check_output
+from ._parsers import _check_fmt, DEFAULT_ENGINE, DEFAULT_FMT
+from ._utils import _pooled_session
+from . import data, panel
+
+# environment variable holding the API key, see readme.md
+API_KEY_ENV_VAR: str = "EOD_HISTORICAL_API_KEY"
+
+
+class EODClient:
+    """
+        **EODClient**
+            API key, root url, pooled session, timeouts and cache of the synchronous endpoints held
+            in one object, safe to share between threads and picklable so it can be sent to worker
+            processes, the session is created on first use in every process
+
+        USAGE
+            client = EODClient(api_key=api_key, pool_size=16, timeout=(5, 30), cache=ResponseCache())
+            df = client.get_eod_data("AAPL", "US", start="2020-01-01", end="2020-12-31")
+            # or for every function called without api_key, session, base_url, cache, scheduler or coalescer,
+            # the timeout is the one of its scheduler
+            eod_historical_data.client.default_client = client
+
+        PARAMETERS
+            api_key: (str) -> EOD Historical API Key, None reads EOD_HISTORICAL_API_KEY on every use
+            base_url: (str) -> root url of the API, None for data.EOD_HISTORICAL_DATA_API_URL
+            pool_size: (int) -> maximum number of connections kept alive to the API
+            timeout: (float or (connect, read) tuple) -> timeout in seconds of every attempt, only used
+                without scheduler, None keeps the one of the default scheduler
+            cache: (ResponseCache) -> cache of parsed responses, None disables caching
+            scheduler: (RequestScheduler) -> rate limiting and retry policy, None uses the default scheduler
+            coalescer: (RequestCoalescer) -> concurrent identical calls share one request, None disables it
+            engine, compact, output, fmt: -> defaults of every call, see data.get_eod_data
+            max_workers: (int) -> default number of requests in flight for the bulk calls
+
+        NOTE keyword arguments given to a method override the ones of the client
+    """
+
+    def __init__(self, api_key: Optional[str] = None, base_url: Optional[str] = None, pool_size: int = 10,
+                 timeout: Timeout_Type = None, cache: Optional[ResponseCache] = None,
+                 scheduler: Optional[RequestScheduler] = None, coalescer: Optional[RequestCoalescer] = None,
+                 engine: str = DEFAULT_ENGINE, compact: bool = False, output: str = "pandas",
+                 fmt: str = DEFAULT_FMT, max_workers: int = 8):
+        if pool_size < 1:
+            raise ValueError("pool_size must be at least 1")
+        if timeout is not None and scheduler is not None:
+            raise ValueError("timeout is set on the scheduler, give one or the other")
+        self._api_key: Optional[str] = api_key
+        self.base_url: Optional[str] = base_url
+        self.pool_size: int = pool_size
+        self.timeout: Timeout_Type = timeout
+        self.cache: Optional[ResponseCache] = cache
+        self.scheduler: Optional[RequestScheduler] = scheduler if timeout is None else \
+            RequestScheduler(timeout=timeout)
+        self.coalescer: Optional[RequestCoalescer] = coalescer
+        self.engine: str = engine
+        self.compact: bool = compact
+        self.output: str = _check_output(output)
+        self.fmt: str = _check_fmt(fmt)
+        self.max_workers: int = max_workers
+        self._reset()
+
+    def _reset(self) -> None:
+        self._session: Optional[requests.Session] = None
+        # sessions with a pool larger than pool_size, by pool size
+        self._pools: Dict[int, requests.Session] = {}
+        self._lock = threading.Lock()
+        # a forked child must not share the connections of its parent
+        self._pid: int = os.getpid()
+
+    def __getstate__(self) -> Dict[str, Any]:
+        state: Dict[str, Any] = self.__dict__.copy()
+        for name in ("_session", "_pools", "_lock", "_pid"):
+            del state[name]
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._reset()
+
+    def __enter__(self) -> "EODClient":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    @property
+    def api_key(self) -> str:
+        if self._api_key is not None:
+            return self._api_key
+        return os.getenv(API_KEY_ENV_VAR) or data.EOD_HISTORICAL_DATA_API_KEY_DEFAULT
+
+    @api_key.setter
+    def api_key(self, api_key: Optional[str]) -> None:
+        self._api_key = api_key
+
+    @property
+    def url(self) -> str:
+        """
+            Returns the root url requests are sent to, read on every call when base_url is None
+        """
+        return data.EOD_HISTORICAL_DATA_API_URL if self.base_url is None else self.base_url
+
+    @property
+    def session(self) -> requests.Session:
+        """
+            Returns the pooled session shared by every thread, created on first use
+        """
+        if self._pid != os.getpid():
+            self._reset()
+        with self._lock:
+            if self._session is None:
+                self._session = _pooled_session(self.pool_size)
+            return self._session
+
+    def pooled_session(self, pool_size: int) -> requests.Session:
+        """
+            Returns a session keeping at least pool_size connections alive, the shared session when
+            its pool is large enough, otherwise one created on first use for that size and reused
+        """
+        if pool_size <= self.pool_size:
+            return self.session
+        if self._pid != os.getpid():
+            self._reset()
+        with self._lock:
+            if pool_size not in self._pools:
+                self._pools[pool_size] = _pooled_session(pool_size)
+            return self._pools[pool_size]
+
+    def close(self) -> None:
+        """
+            Closes the sessions and their pooled connections, the next call opens new ones
+        """
+        with self._lock:
+            if self._pid == os.getpid():
+                for session in [self._session, *self._pools.values()]:
+                    if session is not None:
+                        session.close()
+            self._session = None
+            self._pools = {}
+
+    def _call(self, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+            Calls func with the settings of the client it accepts, kwargs override them, functions
+            running max_workers requests at once get a session pooling at least that many connections
+        """
+        signature: inspect.Signature = inspect.signature(func)
+        # arguments given positionally are not overridden either
+        given: Dict[str, Any] = signature.bind_partial(*args, **kwargs).arguments
+        session: requests.Session = self.pooled_session(given.get("max_workers", self.max_workers)) \
+            if "max_workers" in signature.parameters else self.session
+        settings: Dict[str, Any] = {"api_key": self.api_key, "session": session, "base_url": self.url,
+                                    "cache": self.cache, "scheduler": self.scheduler, "coalescer": self.coalescer,
+                                    "engine": self.engine, "compact": self.compact, "output": self.output,
+                                    "fmt": self.fmt, "max_workers": self.max_workers}
+        for name, value in settings.items():
+            if name in signature.parameters and name not in given:
+                kwargs[name] = value
+        return func(*args, **kwargs)
+
+    def get_eod_data(self, *args, **kwargs) -> Any:
+        """
+            Returns End oF Day Data, see data.get_eod_data
+        """
+        return self._call(data.get_eod_data, *args, **kwargs)
+
+    def get_eod_data_bulk(self, *args, **kwargs) -> data.Bulk_Result_Type:
+        """
+            Returns (data, errors) of many symbols, see data.get_eod_data_bulk
+        """
+        return self._call(data.get_eod_data_bulk, *args, **kwargs)
+
+    def get_eod_data_chunked(self, *args, **kwargs) -> Any:
+        """
+            Returns End oF Day Data of a long range fetched in parallel chunks, see data.get_eod_data_chunked
+        """
+        return self._call(data.get_eod_data_chunked, *args, **kwargs)
+
+    def get_eod_bulk_last_day(self, *args, **kwargs) -> Any:
+        """
+            Returns End oF Day Data of one day for every symbol of an exchange, see data.get_eod_bulk_last_day
+        """
+        return self._call(data.get_eod_bulk_last_day, *args, **kwargs)
+
+    def get_eod_panel(self, *args, **kwargs) -> Any:
+        """
+            Returns (panel, errors), see panel.get_eod_panel
+        """
+        return self._call(panel.get_eod_panel, *args, **kwargs)
+
+    def get_dividends(self, *args, **kwargs) -> Any:
+        """
+            Returns dividends, see data.get_dividends
+        """
+        return self._call(data.get_dividends, *args, **kwargs)
+
+    def get_exchange_symbols(self, *args, **kwargs) -> Any:
+        """
+            Returns list of symbols for a given exchange, see data.get_exchange_symbols
+        """
+        return self._call(data.get_exchange_symbols, *args, **kwargs)
+
+    def iter_exchange_symbols(self, *args, **kwargs) -> Any:
+        """
+            Streams the list of symbols for a given exchange chunk by chunk, see data.iter_exchange_symbols
+        """
+        return self._call(data.iter_exchange_symbols, *args, **kwargs)
+
+
+# used by every endpoint called without api_key, session, base_url, cache, scheduler or coalescer
+default_client: EODClient = EODClient()
+
+
+def _get_client(client: Optional[EODClient] = None) -> EODClient:
+    return default_client if client is None else client
@@ -0,0 +1,201 @@
+import threading
+import time
+from typing import Optional, Dict, List, Tuple, Any, Callable, Awaitable, TYPE_CHECKING
+
+import pandas as pd
+
+from .cache import Cache_Key_Type
+
+if TYPE_CHECKING:
+    import asyncio
+
+Fetch_Type = Callable[[Cache_Key_Type], Any]
+Fetch_Async_Type = Callable[[Cache_Key_Type], Awaitable[Any]]
+
+
+def _covers(outer: Cache_Key_Type, inner: Cache_Key_Type) -> bool:
+    """
+        Returns True when the date range of outer holds the one of inner, keys of the same
+        endpoint, symbol and exchange only
+    """
+    if outer == inner:
+        return True
+    if None in (outer[3], outer[4], inner[3], inner[4]):
+        return False
+    return outer[3] <= inner[3] and inner[4] <= outer[4]
+
+
+def _overlaps(a: Cache_Key_Type, b: Cache_Key_Type) -> bool:
+    if None in (a[3], a[4], b[3], b[4]):
+        return False
+    return a[3] <= b[4] and b[3] <= a[4]
+
+
+def _union(a: Cache_Key_Type, b: Cache_Key_Type) -> Cache_Key_Type:
+    return a[:3] + (min(a[3], b[3]), max(a[4], b[4]))
+
+
+def _slice(value: Any, flight_key: Cache_Key_Type, key: Cache_Key_Type) -> Any:
+    """
+        Returns the rows of value, fetched for flight_key, that belong to key, always a copy
+        so callers sharing a response never share a DataFrame
+    """
+    if not isinstance(value, (pd.DataFrame, pd.Series)):
+        return value
+    if flight_key == key:
+        return value.copy()
+    return value.loc[pd.Timestamp(key[3]):pd.Timestamp(key[4])].copy()
+
+
+class _Flight:
+    """
+        request in flight, or waiting for the window to end, and the callers sharing it
+    """
+
+    def __init__(self, key: Cache_Key_Type, loop: Optional["asyncio.AbstractEventLoop"]):
+        self.key: Cache_Key_Type = key
+        # the event loop of the asynchronous callers, None for the synchronous ones
+        self.loop: Optional["asyncio.AbstractEventLoop"] = loop
+        self.launched: bool = False
+        self.value: Any = None
+        self.error: Optional[BaseException] = None
+        self.done: threading.Event = threading.Event()
+        self.done_async: Optional["asyncio.Event"] = None
+        if loop is not None:
+            import asyncio
+            self.done_async = asyncio.Event()
+
+
+class RequestCoalescer:
+    """
+        **RequestCoalescer**
+            single flight deduplication of concurrent requests, a call made while an identical
+            request is in flight waits for it and shares its response instead of sending its own,
+            safe to share between threads, asynchronous callers share requests of their own event loop
+
+        USAGE
+            coalescer = RequestCoalescer(widen=True, window=0.01)
+            df = get_eod_data("AAPL", "US", start, end, coalescer=coalescer)
+            async with AsyncEODClient(coalescer=coalescer) as client: ...
+
+        PARAMETERS
+            widen: (bool) -> a call also joins a request in flight for the same symbol whose date
+                range holds its own, the shared response is sliced to the dates of every caller
+            window: (float) -> seconds a request waits before being sent, calls for the same symbol
+                with an overlapping date range made in the meantime widen it to the union of the
+                ranges, only used with widen, 0 sends at once
+    """
+
+    def __init__(self, widen: bool = False, window: float = 0.0):
+        if window < 0:
+            raise ValueError("window must not be negative")
+        self.widen: bool = widen
+        self.window: float = window if widen else 0.0
+        # (endpoint, symbol, exchange) -> flights of the requests for it
+        self._flights: Dict[Cache_Key_Type, List[_Flight]] = {}
+        self._lock = threading.Lock()
+        self.requests: int = 0
+        self.joined: int = 0
+
+    def __getstate__(self) -> Dict[str, Any]:
+        return {"widen": self.widen, "window": self.window}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        # requests in flight belong to the process that sent them
+        self.__init__(state["widen"], state["window"])
+
+    def __len__(self) -> int:
+        with self._lock:
+            return sum(len(flights) for flights in self._flights.values())
+
+    def stats(self) -> Dict[str, int]:
+        """
+            Returns requests sent and calls that joined one of them
+        """
+        with self._lock:
+            return {"requests": self.requests, "joined": self.joined}
+
+    def _join(self, key: Cache_Key_Type, loop: Optional["asyncio.AbstractEventLoop"]) -> Tuple[_Flight, bool]:
+        """
+            Returns (flight, leader), leader is True when the caller created the flight and must send it
+        """
+        with self._lock:
+            flights: List[_Flight] = self._flights.setdefault(key[:3], [])
+            for flight in flights:
+                if flight.loop is not loop:
+                    continue
+                if flight.key == key or (self.widen and _covers(flight.key, key)):
+                    self.joined += 1
+                    return flight, False
+                if self.widen and not flight.launched and _overlaps(flight.key, key):
+                    flight.key = _union(flight.key, key)
+                    self.joined += 1
+                    return flight, False
+            flight = _Flight(key, loop)
+            flights.append(flight)
+            self.requests += 1
+            return flight, True
+
+    def _launch(self, flight: _Flight) -> Cache_Key_Type:
+        with self._lock:
+            flight.launched = True
+            return flight.key
+
+    def _land(self, flight: _Flight) -> None:
+        with self._lock:
+            flights: List[_Flight] = self._flights[flight.key[:3]]
+            flights.remove(flight)
+            if len(flights) == 0:
+                del self._flights[flight.key[:3]]
+
+    def _result(self, flight: _Flight, key: Cache_Key_Type, leader: bool) -> Any:
+        if flight.error is not None:
+            raise flight.error
+        # the leader of a flight that was not widened owns the response
+        if leader and flight.key == key:
+            return flight.value
+        return _slice(flight.value, flight.key, key)
+
+    def do(self, key: Cache_Key_Type, fetch: Fetch_Type) -> Tuple[Any, bool]:
+        """
+            Returns (value, joined), value is fetch(flight key) of the request key joined or sent,
+            sliced to the dates of key, joined is True when no request was sent by this call,
+            an exception raised by fetch is raised in every caller sharing it
+        """
+        flight, leader = self._join(key, None)
+        if not leader:
+            flight.done.wait()
+            return self._result(flight, key, leader), True
+        try:
+            if self.window > 0:
+                time.sleep(self.window)
+            flight.value = fetch(self._launch(flight))
+        except BaseException as e:
+            flight.error = e
+        finally:
+            self._land(flight)
+            flight.done.set()
+        return self._result(flight, key, leader), False
+
+    async def do_async(self, key: Cache_Key_Type, fetch: Fetch_Async_Type) -> Tuple[Any, bool]:
+        """
+            Returns (value, joined), see do, fetch is awaited
+        """
+        # asyncio is only imported by the asynchronous callers
+        import asyncio
+        flight, leader = self._join(key, asyncio.get_running_loop())
+        if not leader:
+            await flight.done_async.wait()
+            return self._result(flight, key, leader), True
+        try:
+            if self.window > 0:
+                await asyncio.sleep(self.window)
+            flight.value = await fetch(self._launch(flight))
+        except BaseException as e:
+            # a cancelled leader cancels the callers sharing its request
+            flight.error = e
+        finally:
+            self._land(flight)
+            flight.done.set()
+            flight.done_async.set()
+        return self._result(flight, key, leader), False
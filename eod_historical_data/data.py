@@ -1,17 +1,28 @@
 from datetime import datetime, date
-from io import StringIO
-from typing import Union, Optional, Dict, Tuple
-from unittest.mock import sentinel
+from concurrent.futures import ThreadPoolExecutor
+from typing import (Union, Optional, Dict, Tuple, Iterable, List, Any, Sequence, Collection, Iterator, Callable,
+                    AsyncIterator, Mapping, TYPE_CHECKING)
 
-import aiohttp as io
 import pandas as pd
 import requests
 
 from config.config import Config
-from ._utils import (_init_session, _format_date,
+from .reference import get_exchanges, get_currencies, get_indexes  # noqa
+from .scheduler import RequestScheduler, AsyncResponse, _get_scheduler, _wire_bytes
+from .cache import (ResponseCache, Cache_Key_Type, Validators_Type, Stale_Type, _cache_key, _response_validators,
+                    _conditional_headers)
+from .coalesce import RequestCoalescer, Fetch_Type, Fetch_Async_Type
+from .instrumentation import RequestEvent, _track, _trace_config
+from ._formats import _convert, _check_output
+from ._parsers import _get_parser, _check_fmt, _ExchangeSymbolsChunker, DEFAULT_ENGINE, DEFAULT_FMT
+from ._utils import (_init_session, _init_pooled_session, _format_date,
                      _sanitize_dates, _url, RemoteDataError, _handle_request_errors, _handle_environ_error,
                      api_key_not_authorized)
 
+if TYPE_CHECKING:
+    import aiohttp as io
+    from .store import HistoryStore
+
 config_data: Config = Config()
 
 EOD_HISTORICAL_DATA_API_KEY_ENV_VAR: str = config_data.EOD_HISTORICAL_DATA_API_KEY_ENV_VAR
@@ -19,6 +30,13 @@ EOD_HISTORICAL_DATA_API_KEY_DEFAULT: str = config_data.EOD_HISTORICAL_DATA_API_K
 EOD_HISTORICAL_DATA_API_URL: str = config_data.EOD_HISTORICAL_DATA_API_URL
 
 Start_END_Type = Optional[Union[str, int, date, datetime]]
+Bulk_Result_Type = Tuple[Union[Dict[str, pd.DataFrame], pd.DataFrame], Dict[str, Any]]
+Chunk_Type = Union[str, int]
+
+# bar sizes of the intraday endpoint
+INTRADAY_INTERVALS: Tuple[str, ...] = ("1m", "5m", "1h")
+# codes per real-time request, the first in the url and the others in the s parameter
+REAL_TIME_BATCH_SIZE: int = 20
 
 
 def set_envar() -> str:
@@ -26,37 +44,200 @@ def set_envar() -> str:
 
 
 def _api_key_not_authorized_message():
+    # imported on first use, unittest.mock pulls in asyncio
+    from unittest.mock import sentinel
     print(f"API Key Restricted, Try upgrading your API Key: {__name__}")
     return sentinel
 
 
+def _from_cache(cache: Optional[ResponseCache], key: Cache_Key_Type) -> Optional[Any]:
+    return None if cache is None else cache.get(key)
+
+
+def _to_cache(cache: Optional[ResponseCache], key: Cache_Key_Type, value: Any,
+              validators: Optional[Validators_Type] = None) -> Any:
+    if cache is not None:
+        cache.set(key, value, validators)
+    return value
+
+
+def _stale(cache: Optional[ResponseCache], key: Cache_Key_Type) -> Optional[Stale_Type]:
+    return None if cache is None else cache.stale(key)
+
+
+def _is_current(status: int, stale: Optional[Stale_Type]) -> bool:
+    """
+        Returns True for a response holding a value, 200 or a 304 to a conditional request
+    """
+    return status == requests.codes.ok or (status == requests.codes.not_modified and stale is not None)
+
+
+def _parse_validated(cache: Optional[ResponseCache], parse: Callable[[bytes], Any], status: int,
+                     headers: Mapping[str, str], body: bytes, stale: Optional[Stale_Type],
+                     event: RequestEvent) -> Tuple[Any, Optional[Validators_Type]]:
+    """
+        Returns (value, validators) of a response accepted by _is_current, a copy of the stale value
+        is reused without parsing when the response is 304 Not Modified or its body has the hash of
+        the stale one, validators are only computed for a response stored in cache
+    """
+    if status == requests.codes.not_modified:
+        event.revalidated = True
+        return stale[0].copy(), stale[1]
+    if cache is None:
+        return event.parse(parse, body), None
+    validators: Validators_Type = _response_validators(headers, body)
+    if stale is not None and stale[1][2] == validators[2]:
+        event.revalidated = True
+        return stale[0].copy(), validators
+    return event.parse(parse, body), validators
+
+
+def _cache_validated(cache: Optional[ResponseCache], key: Cache_Key_Type, value: Any,
+                     validators: Optional[Validators_Type], event: RequestEvent) -> Any:
+    if cache is not None and event.revalidated:
+        return cache.revalidated(key, value, validators)
+    return _to_cache(cache, key, value, validators)
+
+
+def _coalesce(coalescer: Optional[RequestCoalescer], key: Cache_Key_Type, fetch: Fetch_Type) -> Tuple[Any, bool]:
+    """
+        Returns (value, joined), fetch(key) or the response of an identical request in flight
+    """
+    return (fetch(key), False) if coalescer is None else coalescer.do(key, fetch)
+
+
+async def _coalesce_async(coalescer: Optional[RequestCoalescer], key: Cache_Key_Type,
+                          fetch: Fetch_Async_Type) -> Tuple[Any, bool]:
+    return (await fetch(key), False) if coalescer is None else await coalescer.do_async(key, fetch)
+
+
+def _base_url(base_url: Optional[str] = None) -> str:
+    """
+        Returns base_url, or the root url of the default client, or EOD_HISTORICAL_DATA_API_URL
+    """
+    if base_url is not None:
+        return base_url
+    # the client module imports this one
+    from .client import _get_client
+    return _get_client().base_url or EOD_HISTORICAL_DATA_API_URL
+
+
 def _create_params(symbol: str, exchange: str, start: Start_END_Type,
-                   end: Start_END_Type, api_key: str) -> Tuple[str, Dict[str, str]]:
+                   end: Start_END_Type, api_key: str, endpoint: str = "eod",
+                   fmt: str = DEFAULT_FMT, base_url: Optional[str] = None) -> Tuple[str, Dict[str, str]]:
     """
         **create_params**
-            will create parameters to pass into request session
+            will create parameters to pass into request session,
+            endpoint is "eod" for prices or "div" for dividends, fmt is "csv" or "json"
     """
     symbol_exchange: str = f"{symbol}.{exchange}"
     # Takes date, datetime, str , or int and returns a valid date objects or TimeStamps
     start, end = _sanitize_dates(start, end)
-    endpoint: str = f"/eod/{symbol_exchange}"
-    url: str = EOD_HISTORICAL_DATA_API_URL + endpoint
+    endpoint: str = f"/{endpoint}/{symbol_exchange}"
+    url: str = _base_url(base_url) + endpoint
     params: dict = {
         "api_token": api_key,
         "from": _format_date(start),
         "to": _format_date(end)
     }
+    # csv is the default format of the API, fmt is only sent for json so csv urls stay the same
+    if _check_fmt(fmt) != "csv":
+        params["fmt"] = fmt
+    return url, params
+
+
+def _create_exchange_symbols_params(exchange_code: str, api_key: str, fmt: str = DEFAULT_FMT,
+                                    base_url: Optional[str] = None) -> Tuple[str, Dict[str, str]]:
+    """
+        **_create_exchange_symbols_params**
+            will create parameters to pass into request session for the exchange symbols list
+    """
+    endpoint: str = f"/exchanges/{exchange_code}"
+    url: str = _base_url(base_url) + endpoint
+    params: dict = {"api_token": api_key}
+    if _check_fmt(fmt) != "csv":
+        params["fmt"] = fmt
+    return url, params
+
+
+def _create_bulk_params(exchange: str, day: Start_END_Type, symbols: Optional[Iterable[str]], api_key: str,
+                        fmt: str = DEFAULT_FMT, base_url: Optional[str] = None) -> Tuple[str, Dict[str, str]]:
+    """
+        **_create_bulk_params**
+            will create parameters to pass into request session for the bulk last day endpoint,
+            day None asks for the last trading day
+    """
+    url: str = _base_url(base_url) + f"/eod-bulk-last-day/{exchange}"
+    params: dict = {"api_token": api_key}
+    if day is not None:
+        params["date"] = _format_date(pd.Timestamp(day))
+    if symbols is not None:
+        params["symbols"] = ",".join(symbols)
+    if _check_fmt(fmt) != "csv":
+        params["fmt"] = fmt
+    return url, params
+
+
+def _create_intraday_params(symbol: str, exchange: str, start: Start_END_Type, end: Start_END_Type, api_key: str,
+                            interval: str = "5m", fmt: str = DEFAULT_FMT,
+                            base_url: Optional[str] = None) -> Tuple[str, Dict[str, str]]:
+    """
+        **_create_intraday_params**
+            will create parameters to pass into request session for the intraday endpoint, start and
+            end are sent as Unix times, naive dates being UTC, without them the API returns its default range
+    """
+    if interval not in INTRADAY_INTERVALS:
+        raise ValueError(f"interval must be one of {INTRADAY_INTERVALS}, got {interval!r}")
+    url: str = _base_url(base_url) + f"/intraday/{symbol}.{exchange}"
+    params: dict = {"api_token": api_key, "interval": interval}
+    if start is not None or end is not None:
+        start, end = _sanitize_dates(start, end)
+        params["from"] = str(int(pd.Timestamp(start).timestamp()))
+        params["to"] = str(int(pd.Timestamp(end).timestamp()))
+    if _check_fmt(fmt) != "csv":
+        params["fmt"] = fmt
+    return url, params
+
+
+def _create_real_time_params(symbols: Sequence[str], exchange: str, api_key: str, fmt: str = DEFAULT_FMT,
+                             base_url: Optional[str] = None) -> Tuple[str, Dict[str, str]]:
+    """
+        **_create_real_time_params**
+            will create parameters to pass into request session for the real-time endpoint, one
+            request returns the quotes of every symbol, the first in the url, the others in s
+    """
+    codes: List[str] = [f"{symbol}.{exchange}" for symbol in symbols]
+    url: str = _base_url(base_url) + f"/real-time/{codes[0]}"
+    params: dict = {"api_token": api_key}
+    if len(codes) > 1:
+        params["s"] = ",".join(codes[1:])
+    if _check_fmt(fmt) != "csv":
+        params["fmt"] = fmt
     return url, params
 
 
+def _bulk_cache_key(exchange: str, day: Start_END_Type, symbols: Optional[Iterable[str]]) -> Cache_Key_Type:
+    names: Optional[str] = None if symbols is None else ",".join(sorted(symbols))
+    return _cache_key("eod-bulk", names, exchange, day, day) if day is not None else \
+        _cache_key("eod-bulk", names, exchange)
+
+
 def _create_request(api_key: str, end: Start_END_Type, start: Start_END_Type, exchange: str, symbol: str,
-                    session: requests.Session) -> Tuple[Dict[str, str], requests.Response, str]:
+                    session: requests.Session, endpoint: str = "eod",
+                    scheduler: Optional[RequestScheduler] = None,
+                    event: Optional[RequestEvent] = None, fmt: str = DEFAULT_FMT,
+                    base_url: Optional[str] = None,
+                    headers: Optional[Dict[str, str]] = None) -> Tuple[Dict[str, str], requests.Response, str]:
     """
         **_create_request**
-            will create a request using request library to eod endpoint to fetch data
+            will create a request using request library to eod endpoint to fetch data,
+            through scheduler (or the default scheduler) for rate limiting and retries,
+            headers such as the conditional ones are sent with it
     """
-    url, params = _create_params(symbol=symbol, exchange=exchange, start=start, end=end, api_key=api_key)
-    r: requests.Response = session.get(url, params=params)
+    url, params = _create_params(symbol=symbol, exchange=exchange, start=start, end=end, api_key=api_key,
+                                 endpoint=endpoint, fmt=fmt, base_url=base_url)
+    session = _init_session(session)
+    r: requests.Response = _get_scheduler(scheduler).get(session, url, params, event=event, headers=headers)
     if config_data.DEBUG:
         print(f"url = {url} params = {params}")
         print(f'status code : {r.status_code}')
@@ -67,10 +248,18 @@ def _create_request(api_key: str, end: Start_END_Type, start: Start_END_Type, ex
 @_handle_request_errors
 def get_eod_data(symbol: str, exchange: str, start: Start_END_Type = None, end: Start_END_Type = None,
                  api_key: str = EOD_HISTORICAL_DATA_API_KEY_DEFAULT,
-                 session: Optional[requests.Session] = None) -> Optional[pd.DataFrame]:
+                 session: Optional[requests.Session] = None, engine: str = DEFAULT_ENGINE,
+                 cache: Optional[ResponseCache] = None,
+                 scheduler: Optional[RequestScheduler] = None,
+                 compact: bool = False, output: str = "pandas", fmt: str = DEFAULT_FMT,
+                 coalescer: Optional[RequestCoalescer] = None,
+                 base_url: Optional[str] = None) -> Optional[pd.DataFrame]:
     """
         **get_eod_data**
 
+        NOTE cache, scheduler and coalescer not given are the ones of client.default_client, this
+        applies to every endpoint, an explicit None disables the cache or the coalescer
+
         PARAMETERS
             symbol: (str) -> Ticker Symbol
             exchange: (str) -> Exchange Code
@@ -78,173 +267,626 @@ def get_eod_data(symbol: str, exchange: str, start: Start_END_Type = None, end:
             end: (str,int, date, datetime) -> end date or integer representing Year
             api_key: (str) -> EOD Historical API Key
             session: (str) -> Request Session Object
+            engine: (str) -> csv parser engine, "c" (default), "pyarrow" or "python"
+            cache: (ResponseCache) -> cache of parsed responses, None disables caching, an expired response
+                is requested again with its ETag / Last-Modified and reused without parsing when unchanged
+            scheduler: (RequestScheduler) -> rate limiting and retry policy, None uses the default scheduler
+            compact: (bool) -> float32 prices and the smallest integer type holding Volume
+            output: (str) -> "pandas" (default), "numpy" for a structured array or "arrow" for a pyarrow Table
+            fmt: (str) -> response format requested, "csv" (default) or "json" which is decoded with orjson
+                when installed, cheaper than read_csv for short ranges
+            coalescer: (RequestCoalescer) -> concurrent identical calls share one request, None disables it
+            base_url: (str) -> root url of the API, None uses the one of the default EODClient
 
         EXCEPTIONS:
             RemoteDataError -> will be raised if data cannot be returned from EOD for any reason
             ValueError -> Will be raised if either start or end do not contain Valid Data
+                or if output or fmt is unknown
+            ImportError -> Will be raised if output is "arrow" and pyarrow is not installed
 
         returns -> DataFrame containing End oF Day Data for the Symbol
     """
+    _check_output(output)
+    parse: Callable[[bytes], Any] = _get_parser("eod", fmt, engine)
+    key: Cache_Key_Type = _cache_key("eod", symbol, exchange, start, end)
+    validators: Optional[Validators_Type] = None
+
+    def fetch(flight_key: Cache_Key_Type) -> Any:
+        nonlocal validators
+        # flight_key holds the dates of key, or wider ones when the coalescer widened the request,
+        # only a response for the dates of key is validated against the one cached
+        validated: Optional[ResponseCache] = cache if flight_key == key else None
+        stale: Optional[Stale_Type] = _stale(validated, key)
+        params, r, url = _create_request(api_key=api_key, end=flight_key[4], start=flight_key[3], exchange=exchange,
+                                         session=session, symbol=symbol, scheduler=scheduler, event=event, fmt=fmt,
+                                         base_url=base_url, headers=_conditional_headers(stale))
+
+        if _is_current(r.status_code, stale):
+            value, response_validators = _parse_validated(validated, parse, r.status_code, r.headers, r.content,
+                                                          stale, event)
+            if flight_key == key:
+                validators = response_validators
+            return value
+        elif r.status_code == api_key_not_authorized:
+            return _api_key_not_authorized_message()
+        else:
+            # replacing api token so it does not show in debug messages
+            params["api_token"] = "API TOKEN IS SECRET"
+            raise RemoteDataError(r.status_code, r.reason, _url(url, params))
+
+    with _track(key) as event:
+        cached: Optional[pd.DataFrame] = _from_cache(cache, key)
+        if cached is not None:
+            event.cache_hit = True
+            return _convert(cached, compact, output)
+
+        df, event.coalesced = _coalesce(coalescer, key, fetch)
+        # only the caller that sent the request stores the response, with its validators
+        if isinstance(df, pd.DataFrame) and not event.coalesced:
+            df = _cache_validated(cache, key, df, validators, event)
+        return _convert(df, compact, output)
+
+
+@_handle_environ_error
+def get_eod_data_bulk(symbols: Iterable[str], exchange: str, start: Start_END_Type = None,
+                      end: Start_END_Type = None, api_key: str = EOD_HISTORICAL_DATA_API_KEY_DEFAULT,
+                      session: Optional[requests.Session] = None, max_workers: int = 8,
+                      as_frame: bool = False, engine: str = DEFAULT_ENGINE,
+                      cache: Optional[ResponseCache] = None,
+                      scheduler: Optional[RequestScheduler] = None,
+                      compact: bool = False, output: str = "pandas", fmt: str = DEFAULT_FMT,
+                      coalescer: Optional[RequestCoalescer] = None,
+                      base_url: Optional[str] = None) -> Bulk_Result_Type:
+    """
+        **get_eod_data_bulk**
+
+        PARAMETERS
+            symbols: (iterable of str) -> Ticker Symbols
+            exchange: (str) -> Exchange Code
+            start: (str, int, date, datetime) -> start date or integer representing Year
+            end: (str,int, date, datetime) -> end date or integer representing Year
+            api_key: (str) -> EOD Historical API Key
+            session: (str) -> Request Session Object, when None a session of the default EODClient
+                pooling at least max_workers connections is shared by all workers
+            max_workers: (int) -> maximum number of requests in flight at once
+            as_frame: (bool) -> return a single long format DataFrame indexed by (Symbol, Date)
+                instead of a dict of DataFrames keyed by symbol
+            engine: (str) -> csv parser engine, "c" (default), "pyarrow" or "python"
+            cache: (ResponseCache) -> cache of parsed responses, None disables caching
+            scheduler: (RequestScheduler) -> rate limiting and retry policy shared by all workers,
+                None uses the default scheduler
+            compact: (bool) -> float32 prices and the smallest integer type holding Volume
+            output: (str) -> "pandas" (default), "numpy" for a structured array or "arrow" for a pyarrow Table,
+                applied to every value of data or to the single frame when as_frame is set
+            fmt: (str) -> response format requested, "csv" (default) or "json"
+            coalescer: (RequestCoalescer) -> symbols also requested by concurrent calls share their requests
+            base_url: (str) -> root url of the API, None uses the one of the default EODClient
+
+        EXCEPTIONS:
+            ValueError -> Will be raised if either start or end do not contain Valid Data,
+                if max_workers is lower than 1 or if output is unknown
+
+        returns -> (data, errors) tuple, data holds End oF Day Data for every symbol that
+            succeeded, errors maps each failed symbol to the RemoteDataError raised for it, to
+            sentinel when the API Key is not authorized, or to None when no data was returned
+    """
+    if max_workers < 1:
+        raise ValueError("max_workers must be at least 1")
+    _check_output(output)
+    _check_fmt(fmt)
+    # Fail fast on bad dates instead of once per symbol
+    _sanitize_dates(start, end)
+    symbols: List[str] = list(dict.fromkeys(symbols))
+    session: requests.Session = _init_pooled_session(session, pool_size=max_workers)
+
+    def fetch(symbol: str) -> Any:
+        try:
+            return get_eod_data(symbol, exchange, start=start, end=end, api_key=api_key, session=session,
+                                engine=engine, cache=cache, scheduler=scheduler, compact=compact,
+                                fmt=fmt, coalescer=coalescer, base_url=base_url)
+        except RemoteDataError as e:
+            return e
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        results: List[Any] = list(executor.map(fetch, symbols))
 
-    params, r, url = _create_request(api_key=api_key, end=end, start=start,
-                                     exchange=exchange, session=session, symbol=symbol)
+    data: Dict[str, pd.DataFrame] = {}
+    errors: Dict[str, Any] = {}
+    for symbol, result in zip(symbols, results):
+        if isinstance(result, pd.DataFrame):
+            data[symbol] = result
+        else:
+            errors[symbol] = result
 
-    if r.status_code == requests.codes.ok:
-        # NOTE engine='c' which is default does not support skip footer
-        df: Optional[pd.DataFrame] = pd.read_csv(StringIO(r.text), engine='python',
-                                                 skipfooter=0, parse_dates=[0], index_col=0)
-        return df
-    elif r.status_code == api_key_not_authorized:
-        _api_key_not_authorized_message()
+    if as_frame:
+        frame: pd.DataFrame = pd.concat(data, names=["Symbol"]) if len(data) > 0 else pd.DataFrame()
+        return _convert(frame, output=output), errors
+    if output != "pandas":
+        data = {symbol: _convert(df, output=output) for symbol, df in data.items()}
+    return data, errors
+
+
+def _chunk_ranges(start: pd.Timestamp, end: pd.Timestamp,
+                  chunk: Chunk_Type) -> List[Tuple[pd.Timestamp, pd.Timestamp]]:
+    """
+        Returns consecutive (start, end) ranges covering start to end, one per calendar year for
+        chunk "year", or of chunk weekdays each (about chunk rows of End oF Day Data) for an integer
+    """
+    start, end = pd.Timestamp(start), pd.Timestamp(end)
+    if chunk == "year":
+        cuts: pd.DatetimeIndex = pd.date_range(start, end, freq="AS")
+    elif isinstance(chunk, int) and not isinstance(chunk, bool) and chunk >= 1:
+        # the first chunk holds the first chunk weekdays, the next ones start on every chunk-th weekday
+        cuts = pd.bdate_range(start, end)[chunk::chunk]
     else:
-        # replacing api token so it does not show in debug messages
-        params["api_token"] = "API TOKEN IS SECRET"
-        raise RemoteDataError(r.status_code, r.reason, _url(url, params))
+        raise ValueError(f'chunk must be "year" or a positive number of rows, got {chunk!r}')
+    starts: List[pd.Timestamp] = [start] + [cut for cut in cuts if cut > start]
+    ends: List[pd.Timestamp] = [cut - pd.Timedelta(days=1) for cut in starts[1:]] + [end]
+    return list(zip(starts, ends))
+
+
+@_handle_environ_error
+def get_eod_data_chunked(symbol: str, exchange: str, start: Start_END_Type = None, end: Start_END_Type = None,
+                         chunk: Chunk_Type = "year", api_key: str = EOD_HISTORICAL_DATA_API_KEY_DEFAULT,
+                         session: Optional[requests.Session] = None, max_workers: int = 8,
+                         engine: str = DEFAULT_ENGINE, cache: Optional[ResponseCache] = None,
+                         scheduler: Optional[RequestScheduler] = None,
+                         compact: bool = False, output: str = "pandas",
+                         fmt: str = DEFAULT_FMT,
+                         base_url: Optional[str] = None) -> Optional[pd.DataFrame]:
+    """
+        **get_eod_data_chunked**
+            get_eod_data for long histories, the date range is split into chunks fetched and
+            parsed in parallel over one pooled session then stitched back together, with a
+            cache the chunks that succeeded are not fetched again when a call is retried
+
+        USAGE
+            df = get_eod_data_chunked("GSPC", "INDX", start="1950-01-01", end=date.today(), cache=cache)
+
+        PARAMETERS
+            symbol: (str) -> Ticker Symbol
+            exchange: (str) -> Exchange Code
+            start: (str, int, date, datetime) -> start date or integer representing Year
+            end: (str,int, date, datetime) -> end date or integer representing Year
+            chunk: (str, int) -> "year" (default) for one request per calendar year, or the number of
+                rows per request, counted as weekdays
+            api_key: (str) -> EOD Historical API Key
+            session: (str) -> Request Session Object, when None a session of the default EODClient
+                pooling at least max_workers connections is shared by all chunks
+            max_workers: (int) -> maximum number of requests in flight at once
+            engine, cache, scheduler, compact, output, fmt, base_url: -> see get_eod_data, cache and
+                scheduler apply to every chunk
+
+        EXCEPTIONS:
+            RemoteDataError -> will be raised if a chunk cannot be returned from EOD for any reason,
+                once every chunk has been requested
+            ValueError -> Will be raised if either start or end do not contain Valid Data,
+                if chunk is unknown, if max_workers is lower than 1 or if output or fmt is unknown
+
+        returns -> DataFrame containing End oF Day Data for the Symbol, sorted by Date without
+            duplicated dates
+    """
+    if max_workers < 1:
+        raise ValueError("max_workers must be at least 1")
+    _check_output(output)
+    _check_fmt(fmt)
+    ranges: List[Tuple[pd.Timestamp, pd.Timestamp]] = _chunk_ranges(*_sanitize_dates(start, end), chunk)
+    session = _init_pooled_session(session, pool_size=max_workers)
+
+    def fetch(chunk_range: Tuple[pd.Timestamp, pd.Timestamp]) -> Any:
+        try:
+            return get_eod_data(symbol, exchange, start=chunk_range[0], end=chunk_range[1], api_key=api_key,
+                                session=session, engine=engine, cache=cache, scheduler=scheduler, fmt=fmt,
+                                base_url=base_url)
+        except RemoteDataError as e:
+            return e
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(ranges))) as executor:
+        frames: List[Any] = list(executor.map(fetch, ranges))
+
+    for frame in frames:
+        if isinstance(frame, RemoteDataError):
+            raise frame
+    for frame in frames:
+        # sentinel when the API Key is not authorized, None when no data was returned
+        if not isinstance(frame, pd.DataFrame):
+            return frame
+    df: pd.DataFrame = pd.concat(frames) if len(frames) > 1 else frames[0]
+    if not df.index.is_monotonic_increasing:
+        df = df.sort_index(kind="mergesort")
+    if df.index.has_duplicates:
+        df = df[~df.index.duplicated(keep="last")]
+    return _convert(df, compact, output)
+
+
+@_handle_environ_error
+@_handle_request_errors
+def get_eod_bulk_last_day(exchange: str, day: Start_END_Type = None, symbols: Optional[Iterable[str]] = None,
+                          api_key: str = EOD_HISTORICAL_DATA_API_KEY_DEFAULT,
+                          session: Optional[requests.Session] = None, engine: str = DEFAULT_ENGINE,
+                          cache: Optional[ResponseCache] = None,
+                          scheduler: Optional[RequestScheduler] = None,
+                          compact: bool = False, output: str = "pandas", fmt: str = DEFAULT_FMT,
+                          store: Optional["HistoryStore"] = None,
+                          base_url: Optional[str] = None) -> Optional[pd.DataFrame]:
+    """
+        **get_eod_bulk_last_day**
+            End oF Day Data of one day for every symbol of an exchange in a single request,
+            replaces one get_eod_data call per symbol for daily updates
+
+        PARAMETERS
+            exchange: (str) -> Exchange Code
+            day: (str, date, datetime) -> trading day, None for the last trading day
+            symbols: (iterable of str) -> Ticker Symbols to return, None returns the whole exchange
+            api_key: (str) -> EOD Historical API Key
+            session: (str) -> Request Session Object
+            engine: (str) -> csv parser engine, "c" (default), "pyarrow" or "python"
+            cache: (ResponseCache) -> cache of parsed responses, None disables caching
+            scheduler: (RequestScheduler) -> rate limiting and retry policy, None uses the default scheduler
+            compact, output, fmt: -> see get_eod_data
+            store: (HistoryStore) -> the rows are also written to store, one transaction for all symbols
+            base_url: (str) -> root url of the API, None uses the one of the default EODClient
+
+        EXCEPTIONS:
+            RemoteDataError -> will be raised if data cannot be returned from EOD for any reason
+            ValueError -> Will be raised if output or fmt is unknown
+
+        returns -> DataFrame indexed by Code with Ex, Date, Open, High, Low, Close, Adjusted_close
+            and Volume columns, a symbol that did not trade on day holds its last trading day
+    """
+    _check_output(output)
+    parse: Callable[[bytes], Any] = _get_parser("eod-bulk", fmt, engine)
+    symbols = None if symbols is None else list(symbols)
+    key: Cache_Key_Type = _bulk_cache_key(exchange, day, symbols)
+    with _track(key) as event:
+        df: Optional[pd.DataFrame] = _from_cache(cache, key)
+        if df is not None:
+            event.cache_hit = True
+        else:
+            session: requests.Session = _init_session(session)
+            url, params = _create_bulk_params(exchange=exchange, day=day, symbols=symbols, api_key=api_key, fmt=fmt,
+                                              base_url=base_url)
+            r: requests.Response = _get_scheduler(scheduler).get(session, url, params, event=event)
+            if config_data.DEBUG:
+                print(f'status code : {r.status_code}')
+            if r.status_code == api_key_not_authorized:
+                return _api_key_not_authorized_message()
+            elif r.status_code != requests.codes.ok:
+                # replacing api token so it does not show in debug messages
+                params["api_token"] = "API TOKEN IS SECRET"
+                raise RemoteDataError(r.status_code, r.reason, _url(url, params))
+            df = _to_cache(cache, key, event.parse(parse, r.content))
+        if store is not None:
+            store.write_bulk(exchange, df)
+        return _convert(df, compact, output)
 
 
 @_handle_environ_error
 @_handle_request_errors
 async def get_eod_data_async(symbol: str, exchange: str, start: Start_END_Type = None,
                              end: Start_END_Type = None,
-                             api_key: str = EOD_HISTORICAL_DATA_API_KEY_DEFAULT) -> \
-        Optional[Union[pd.TextFileReader, pd.DataFrame]]:
+                             api_key: str = EOD_HISTORICAL_DATA_API_KEY_DEFAULT,
+                             engine: str = DEFAULT_ENGINE,
+                             cache: Optional[ResponseCache] = None,
+                             scheduler: Optional[RequestScheduler] = None,
+                             compact: bool = False, output: str = "pandas",
+                             fmt: str = DEFAULT_FMT,
+                             coalescer: Optional[RequestCoalescer] = None,
+                             base_url: Optional[str] = None) -> Optional[pd.DataFrame]:
     """
         **get_eod_data_async**
 
+        NOTE opens a new connection for every call, use AsyncEODClient to share
+        one connection pool between many concurrent requests
+
         PARAMETERS
             symbol: (str) -> Ticker Symbol
             exchange: (str) -> Exchange Code
             start: (str, int, date, datetime) -> start date or integer representing Year
             end: (str,int, date, datetime) -> end date or integer representing Year
             api_key: (str) -> EOD Historical API Key
-            session: (str) -> Request Session Object
+            engine: (str) -> csv parser engine, "c" (default), "pyarrow" or "python"
+            cache: (ResponseCache) -> cache of parsed responses, None disables caching
+            scheduler: (RequestScheduler) -> rate limiting and retry policy, None uses the default scheduler
+            compact: (bool) -> float32 prices and the smallest integer type holding Volume
+            output: (str) -> "pandas" (default), "numpy" for a structured array or "arrow" for a pyarrow Table
+            fmt: (str) -> response format requested, "csv" (default) or "json" which is decoded with orjson
+                when installed, cheaper than read_csv for short ranges
+            coalescer: (RequestCoalescer) -> concurrent identical calls of the same event loop share one
+                request, None disables it
+            base_url: (str) -> root url of the API, None uses the one of the default EODClient
 
         EXCEPTIONS:
             RemoteDataError -> will be raised if data cannot be returned from EOD for any reason
             ValueError -> Will be raised if either start or end do not contain Valid Data
+                or if output or fmt is unknown
+            ImportError -> Will be raised if output is "arrow" and pyarrow is not installed
 
         returns -> DataFrame containing End oF Day Data for the Symbol
     """
+    _check_output(output)
+    parse: Callable[[bytes], Any] = _get_parser("eod", fmt, engine)
+    key: Cache_Key_Type = _cache_key("eod", symbol, exchange, start, end)
 
-    url, params = _create_params(symbol=symbol, exchange=exchange, start=start, end=end, api_key=api_key)
+    async def fetch(flight_key: Cache_Key_Type) -> Any:
+        url, params = _create_params(symbol=symbol, exchange=exchange, start=flight_key[3], end=flight_key[4],
+                                     api_key=api_key, fmt=fmt, base_url=base_url)
 
-    async with io.ClientSession() as session:
-        async with session.get(url, params=params) as response:
-            if response.status == 200:
-                response_data = await response.text()
-                df: Union[pd.TextFileReader, pd.DataFrame] = pd.read_csv(StringIO(response_data), engine='python',
-                                                                         skipfooter=0,
-                                                                         parse_dates=[0], index_col=0)
-                return df
-            elif response.status == api_key_not_authorized:
-                _api_key_not_authorized_message()
-            else:
-                # replacing api token so it does not show in debug messages
-                params["api_token"] = "API TOKEN IS SECRET"
-                raise RemoteDataError(response.status, response.reason, _url(url, params))
+        # aiohttp is only imported when an asynchronous function is called
+        import aiohttp as io
+        async with io.ClientSession(trace_configs=[_trace_config()]) as session:
+            response: AsyncResponse = await _get_scheduler(scheduler).get_async(session, url, params, event=event)
+        if response.status == 200:
+            return event.parse(parse, response.body)
+        elif response.status == api_key_not_authorized:
+            return _api_key_not_authorized_message()
+        else:
+            # replacing api token so it does not show in debug messages
+            params["api_token"] = "API TOKEN IS SECRET"
+            raise RemoteDataError(response.status, response.reason, _url(url, params))
+
+    with _track(key) as event:
+        cached: Optional[pd.DataFrame] = _from_cache(cache, key)
+        if cached is not None:
+            event.cache_hit = True
+            return _convert(cached, compact, output)
+
+        df, event.coalesced = await _coalesce_async(coalescer, key, fetch)
+        if isinstance(df, pd.DataFrame):
+            _to_cache(cache, key, df)
+        return _convert(df, compact, output)
 
 
 @_handle_environ_error
 @_handle_request_errors
 def get_dividends(symbol: str, exchange: str, start: Start_END_Type = None, end: Start_END_Type = None,
                   api_key: str = EOD_HISTORICAL_DATA_API_KEY_DEFAULT,
-                  session: Optional[requests.Session] = None) -> Optional[Union[pd.TextFileReader, pd.DataFrame]]:
+                  session: Optional[requests.Session] = None, engine: str = DEFAULT_ENGINE,
+                  cache: Optional[ResponseCache] = None,
+                  scheduler: Optional[RequestScheduler] = None,
+                  compact: bool = False, output: str = "pandas", fmt: str = DEFAULT_FMT,
+                  base_url: Optional[str] = None) -> Optional[pd.Series]:
     """
         **get_dividends**
 
+        compact, output, fmt and base_url are described in get_eod_data
     """
-    params, r, url = _create_request(api_key=api_key, end=end, start=start,
-                                     exchange=exchange, session=session, symbol=symbol)
+    _check_output(output)
+    parse: Callable[[bytes], Any] = _get_parser("div", fmt, engine)
+    key: Cache_Key_Type = _cache_key("div", symbol, exchange, start, end)
+    with _track(key) as event:
+        cached: Optional[pd.Series] = _from_cache(cache, key)
+        if cached is not None:
+            event.cache_hit = True
+            return _convert(cached, compact, output)
 
-    if r.status_code == requests.codes.ok:
-        # NOTE engine='c' which is default does not support skip footer
-        df: Union[pd.TextFileReader, pd.DataFrame] = pd.read_csv(StringIO(r.text), engine='python',
-                                                                 skipfooter=0,
-                                                                 parse_dates=[0], index_col=0)
-        assert len(df.columns) == 1
-        ts = df["Dividends"]
-        return ts
-    elif r.status_code == api_key_not_authorized:
-        _api_key_not_authorized_message()
-    else:
-        params["api_token"] = "API TOKEN IS SECRET"
-        raise RemoteDataError(r.status_code, r.reason, _url(url, params))
+        stale: Optional[Stale_Type] = _stale(cache, key)
+        params, r, url = _create_request(api_key=api_key, end=end, start=start,
+                                         exchange=exchange, session=session, symbol=symbol, endpoint="div",
+                                         scheduler=scheduler, event=event, fmt=fmt, base_url=base_url,
+                                         headers=_conditional_headers(stale))
+
+        if _is_current(r.status_code, stale):
+            ts, validators = _parse_validated(cache, parse, r.status_code, r.headers, r.content, stale, event)
+            return _convert(_cache_validated(cache, key, ts, validators, event), compact, output)
+        elif r.status_code == api_key_not_authorized:
+            return _api_key_not_authorized_message()
+        else:
+            params["api_token"] = "API TOKEN IS SECRET"
+            raise RemoteDataError(r.status_code, r.reason, _url(url, params))
 
 
 @_handle_environ_error
 @_handle_request_errors
 async def get_dividends_async(symbol: str, exchange: str, start: Union[str, int] = None,
                               end: Union[str, int] = None,
-                              api_key: str = EOD_HISTORICAL_DATA_API_KEY_DEFAULT) -> Optional[pd.DataFrame]:
+                              api_key: str = EOD_HISTORICAL_DATA_API_KEY_DEFAULT,
+                              engine: str = DEFAULT_ENGINE,
+                              cache: Optional[ResponseCache] = None,
+                              scheduler: Optional[RequestScheduler] = None,
+                              compact: bool = False, output: str = "pandas",
+                              fmt: str = DEFAULT_FMT, base_url: Optional[str] = None) -> Optional[pd.Series]:
     """
-        Returns dividends
+        Returns dividends, compact, output, fmt and base_url are described in get_eod_data
     """
-    url, params = _create_params(symbol=symbol, exchange=exchange, start=start, end=end, api_key=api_key)
+    _check_output(output)
+    parse: Callable[[bytes], Any] = _get_parser("div", fmt, engine)
+    key: Cache_Key_Type = _cache_key("div", symbol, exchange, start, end)
+    with _track(key) as event:
+        cached: Optional[pd.Series] = _from_cache(cache, key)
+        if cached is not None:
+            event.cache_hit = True
+            return _convert(cached, compact, output)
 
-    async with io.ClientSession() as session:
-        async with session.get(url, params=params) as response:
-            if response.status == 200:
-                response_data = await response.text()
-                df: Union[pd.TextFileReader, pd.DataFrame] = pd.read_csv(StringIO(response_data), engine='python',
-                                                                         skipfooter=0,
-                                                                         parse_dates=[0], index_col=0)
-                assert len(df.columns) == 1
-                ts = df["Dividends"]
-                return ts
-            elif response.status == api_key_not_authorized:
-                _api_key_not_authorized_message()
-            else:
-                params["api_token"] = "API TOKEN IS SECRET"
-                raise RemoteDataError(response.status, response.reason, _url(url, params))
+        url, params = _create_params(symbol=symbol, exchange=exchange, start=start, end=end, api_key=api_key,
+                                     endpoint="div", fmt=fmt, base_url=base_url)
+
+        # aiohttp is only imported when an asynchronous function is called
+        import aiohttp as io
+        async with io.ClientSession(trace_configs=[_trace_config()]) as session:
+            response: AsyncResponse = await _get_scheduler(scheduler).get_async(session, url, params, event=event)
+        if response.status == 200:
+            ts: pd.Series = event.parse(parse, response.body)
+            return _convert(_to_cache(cache, key, ts), compact, output)
+        elif response.status == api_key_not_authorized:
+            return _api_key_not_authorized_message()
+        else:
+            params["api_token"] = "API TOKEN IS SECRET"
+            raise RemoteDataError(response.status, response.reason, _url(url, params))
 
 
 @_handle_environ_error
 @_handle_request_errors
 def get_exchange_symbols(exchange_code: str,
                          api_key: str = EOD_HISTORICAL_DATA_API_KEY_DEFAULT,
-                         session: Union[requests.Session, None] = None) -> Optional[pd.DataFrame]:
+                         session: Union[requests.Session, None] = None,
+                         engine: str = DEFAULT_ENGINE,
+                         cache: Optional[ResponseCache] = None,
+                         scheduler: Optional[RequestScheduler] = None,
+                         compact: bool = False, output: str = "pandas",
+                         fmt: str = DEFAULT_FMT,
+                         base_url: Optional[str] = None) -> Optional[pd.DataFrame]:
     """
-        Returns list of symbols for a given exchange
+        Returns list of symbols for a given exchange, with compact Country, Exchange,
+        Currency and Type are categorical, output, fmt and base_url are described in get_eod_data
     """
-    session: requests.Session = _init_session(session)
-    endpoint: str = f"/exchanges/{exchange_code}"
-    url: str = EOD_HISTORICAL_DATA_API_URL + endpoint
-    params: dict = {"api_token": api_key}
+    _check_output(output)
+    parse: Callable[[bytes], Any] = _get_parser("exchanges", fmt, engine)
+    key: Cache_Key_Type = _cache_key("exchanges", exchange_code)
+    with _track(key) as event:
+        cached: Optional[pd.DataFrame] = _from_cache(cache, key)
+        if cached is not None:
+            event.cache_hit = True
+            return _convert(cached, compact, output)
 
-    r: requests.Response = session.get(url, params=params)
-    if config_data.DEBUG:
-        print(f'status code : {r.status_code}')
-    if r.status_code == requests.codes.ok:
-        df: Union[pd.TextFileReader, pd.DataFrame] = pd.read_csv(StringIO(r.text), engine='python', skipfooter=0,
-                                                                 index_col=0)
-        return df
-    elif r.status_code == api_key_not_authorized:
-        _api_key_not_authorized_message()
-    else:
-        # replacing api token so it does not show in debug messages
-        params["api_token"] = "API TOKEN IS SECRET"
-        raise RemoteDataError(r.status_code, r.reason, _url(url, params))
+        session: requests.Session = _init_session(session)
+        url, params = _create_exchange_symbols_params(exchange_code=exchange_code, api_key=api_key, fmt=fmt,
+                                                      base_url=base_url)
+
+        stale: Optional[Stale_Type] = _stale(cache, key)
+        r: requests.Response = _get_scheduler(scheduler).get(session, url, params, event=event,
+                                                             headers=_conditional_headers(stale))
+        if config_data.DEBUG:
+            print(f'status code : {r.status_code}')
+        if _is_current(r.status_code, stale):
+            df, validators = _parse_validated(cache, parse, r.status_code, r.headers, r.content, stale, event)
+            return _convert(_cache_validated(cache, key, df, validators, event), compact, output)
+        elif r.status_code == api_key_not_authorized:
+            return _api_key_not_authorized_message()
+        else:
+            # replacing api token so it does not show in debug messages
+            params["api_token"] = "API TOKEN IS SECRET"
+            raise RemoteDataError(r.status_code, r.reason, _url(url, params))
 
 
 @_handle_environ_error
 @_handle_request_errors
 async def get_exchange_symbols_async(exchange_code: str,
-                                     api_key: str = EOD_HISTORICAL_DATA_API_KEY_DEFAULT) -> Optional[pd.DataFrame]:
+                                     api_key: str = EOD_HISTORICAL_DATA_API_KEY_DEFAULT,
+                                     engine: str = DEFAULT_ENGINE,
+                                     cache: Optional[ResponseCache] = None,
+                                     scheduler: Optional[RequestScheduler] = None,
+                                     compact: bool = False, output: str = "pandas",
+                                     fmt: str = DEFAULT_FMT,
+                                     base_url: Optional[str] = None) -> Optional[pd.DataFrame]:
     """
-        Returns list of symbols for a given exchange
+        Returns list of symbols for a given exchange, with compact Country, Exchange,
+        Currency and Type are categorical, output, fmt and base_url are described in get_eod_data
     """
-    endpoint: str = f"/exchanges/{exchange_code}"
-    url: str = EOD_HISTORICAL_DATA_API_URL + endpoint
-    params: dict = {
-        "api_token": api_key
-    }
-    async with io.ClientSession() as session:
-        async with session.get(url, params=params) as response:
+    _check_output(output)
+    parse: Callable[[bytes], Any] = _get_parser("exchanges", fmt, engine)
+    key: Cache_Key_Type = _cache_key("exchanges", exchange_code)
+    with _track(key) as event:
+        cached: Optional[pd.DataFrame] = _from_cache(cache, key)
+        if cached is not None:
+            event.cache_hit = True
+            return _convert(cached, compact, output)
+
+        url, params = _create_exchange_symbols_params(exchange_code=exchange_code, api_key=api_key, fmt=fmt,
+                                                      base_url=base_url)
+        # aiohttp is only imported when an asynchronous function is called
+        import aiohttp as io
+        async with io.ClientSession(trace_configs=[_trace_config()]) as session:
+            response: AsyncResponse = await _get_scheduler(scheduler).get_async(session, url, params, event=event)
+        if response.status == 200:
+            df: pd.DataFrame = event.parse(parse, response.body)
+            return _convert(_to_cache(cache, key, df), compact, output)
+        elif response.status == api_key_not_authorized:
+            return _api_key_not_authorized_message()
+        else:
+            # replacing api token so it does not show in debug messages
+            params["api_token"] = "API TOKEN IS SECRET"
+            raise RemoteDataError(response.status, response.reason, _url(url, params))
+
+
+def _iter_exchange_symbols(chunker: _ExchangeSymbolsChunker, key: Cache_Key_Type, url: str, params: Dict[str, str],
+                           session: requests.Session, scheduler: Optional[RequestScheduler]) -> Iterator[pd.DataFrame]:
+    # the event counts bytes and rows, parsing is interleaved with reading so it is not timed apart
+    with _track(key) as event:
+        r: requests.Response = _get_scheduler(scheduler).get(session, url, params, event=event, stream=True)
+        with r:
+            if r.status_code == requests.codes.ok:
+                event.rows = 0
+                for line in r.iter_lines(chunk_size=64 * 1024):
+                    event.bytes += len(line) + 1
+                    chunk: Optional[pd.DataFrame] = chunker.feed(line)
+                    if chunk is not None:
+                        event.rows += len(chunk)
+                        yield chunk
+                event.wire_bytes += r.raw.tell() if hasattr(r.raw, "tell") else event.bytes
+                chunk = chunker.flush()
+                if chunk is not None:
+                    event.rows += len(chunk)
+                    yield chunk
+            elif r.status_code == api_key_not_authorized:
+                _api_key_not_authorized_message()
+            else:
+                # replacing api token so it does not show in debug messages
+                params["api_token"] = "API TOKEN IS SECRET"
+                raise RemoteDataError(r.status_code, r.reason, _url(url, params))
+
+
+@_handle_environ_error
+def iter_exchange_symbols(exchange_code: str, api_key: str = EOD_HISTORICAL_DATA_API_KEY_DEFAULT,
+                          session: Optional[requests.Session] = None, chunksize: int = 5000,
+                          columns: Optional[Sequence[str]] = None, types: Optional[Collection[str]] = None,
+                          engine: str = DEFAULT_ENGINE,
+                          scheduler: Optional[RequestScheduler] = None,
+                          base_url: Optional[str] = None) -> Iterator[pd.DataFrame]:
+    """
+        **iter_exchange_symbols**
+            streams the list of symbols for a given exchange, the response is read line by line
+            and parsed chunksize lines at a time so the full table is never held in memory
+
+        PARAMETERS
+            exchange_code: (str) -> Exchange Code
+            api_key: (str) -> EOD Historical API Key
+            session: (str) -> Request Session Object
+            chunksize: (int) -> number of lines parsed at once, chunks may be smaller once filtered
+            columns: (sequence of str) -> columns kept besides the Code index, None keeps them all
+            types: (collection of str) -> symbol types kept, such as "Common Stock" or "ETF", None keeps them all
+            engine: (str) -> csv parser engine, "c" (default), "pyarrow" or "python"
+            scheduler: (RequestScheduler) -> rate limiting and retry policy, None uses the default scheduler
+            base_url: (str) -> root url of the API, None uses the one of the default EODClient
+
+        EXCEPTIONS:
+            RemoteDataError -> will be raised while iterating if data cannot be returned from EOD
+
+        returns -> iterator of DataFrames indexed by Code, nothing is yielded when the
+            API Key is not authorized
+    """
+    chunker: _ExchangeSymbolsChunker = _ExchangeSymbolsChunker(chunksize, columns=columns, types=types,
+                                                               engine=engine)
+    url, params = _create_exchange_symbols_params(exchange_code=exchange_code, api_key=api_key, base_url=base_url)
+    return _iter_exchange_symbols(chunker, _cache_key("exchanges", exchange_code), url, params,
+                                  _init_session(session), scheduler)
+
+
+async def _iter_exchange_symbols_async(chunker: _ExchangeSymbolsChunker, key: Cache_Key_Type, url: str,
+                                       params: Dict[str, str], session: Optional["io.ClientSession"],
+                                       scheduler: Optional[RequestScheduler]) -> AsyncIterator[pd.DataFrame]:
+    if session is None:
+        import aiohttp as io
+        async with io.ClientSession(trace_configs=[_trace_config()]) as session:
+            async for chunk in _iter_exchange_symbols_async(chunker, key, url, params, session, scheduler):
+                yield chunk
+        return
+
+    with _track(key) as event:
+        async with _get_scheduler(scheduler).stream_async(session, url, params, event=event) as response:
             if response.status == 200:
-                response_data = await response.text()
-                df: Union[pd.TextFileReader, pd.DataFrame] = pd.read_csv(StringIO(response_data), engine='python',
-                                                                         skipfooter=0, index_col=0)
-                return df
+                event.rows = 0
+                async for line in response.content:
+                    event.bytes += len(line)
+                    chunk: Optional[pd.DataFrame] = chunker.feed(line)
+                    if chunk is not None:
+                        event.rows += len(chunk)
+                        yield chunk
+                event.wire_bytes += _wire_bytes(response, b"")
+                chunk = chunker.flush()
+                if chunk is not None:
+                    event.rows += len(chunk)
+                    yield chunk
             elif response.status == api_key_not_authorized:
                 _api_key_not_authorized_message()
             else:
@@ -253,249 +895,136 @@ async def get_exchange_symbols_async(exchange_code: str,
                 raise RemoteDataError(response.status, response.reason, _url(url, params))
 
 
-def get_exchanges() -> pd.DataFrame:
-    """
-    Returns list of exchanges
-    https://eodhistoricaldata.com/knowledgebase/list-supported-exchanges/
-    """
-    data: str = """
-ID	Exchange Name	Exchange Code
-1	Munich Exchange	MU
-2	Berlin Exchange	BE
-3	Frankfurt Exchange	F
-4	Stuttgart Exchange	STU
-5	Mexican Exchange	MX
-6	Hanover Exchange	HA
-8	Australian Exchange	AU
-9	Singapore Exchange	SG
-10	Indexes	INDX
-11	USA Stocks	US
-12	Kuala Lumpur Exchange	KLSE
-13	Funds	FUND
-14	Bombay Exchange	BSE
-15	Dusseldorf Exchange	DU
-16	London Exchange	LSE
-17	Euronext Paris	PA
-18	XETRA Exchange	XETRA
-19	NSE (India)	NSE
-20	Hong Kong Exchange	HK
-21	Borsa Italiana	MI
-22	SIX Swiss Exchange	SW
-23	Hamburg Exchange	HM
-24	Toronto Exchange	TO
-25	Stockholm Exchange	ST
-26	Oslo Stock Exchange	OL
-27	Euronext Amsterdam	AS
-28	Coppenhagen Exchange	CO
-29	Euronext Lisbon	LS
-30	Korea Stock Exchange	KO
-31	Shanghai Exchange	SS
-32	Taiwan Exchange	TW
-33	Sao Paolo Exchange	SA
-34	Euronext Brussels	BR
-35	Madrid Exchange	MC
-36	Vienna Exchange	VI
-37	New Zealand Exchange	NZ
-38	FOREX	FX
-39	London IL	IL
-40	Irish Exchange	IR
-41	MICEX Russia	MCX
-42	OTC Market	OTC
-43	ETF-Euronext	NX
-44	Johannesburg Exchange	JSE"""
-    df: Union[pd.TextFileReader, pd.DataFrame] = pd.read_csv(StringIO(data), sep="\t")
-    df: pd.DataFrame = df.set_index("ID")
-    return df
-
-
-def get_currencies() -> pd.DataFrame:
-    """
-    Returns list of supported currencies
-    https://eodhistoricaldata.com/knowledgebase/list-supported-currencies/
-    """
-    data: str = """ID	Exchange Code	Currency Code
-1	FX	USD
-2	FX	EUR
-3	FX	RUB
-4	FX	GBP
-5	FX	CNY
-6	FX	JPY
-7	FX	SGD
-8	FX	INR
-9	FX	CHF
-10	FX	AUD
-11	FX	CAD
-12	FX	HKD
-13	FX	MYR
-14	FX	NOK
-15	FX	NZD
-16	FX	ZAR
-17	FX	SEK
-18	FX	DKK
-19	FX	BRL
-20	FX	ZAC
-21	FX	MXN
-22	FX	TWD
-23	FX	KRW
-24	FX	CLP
-25	FX	CZK
-26	FX	HUF
-27	FX	IDR
-28	FX	ISK
-29	FX	MXV
-30	FX	PLN
-31	FX	TRY
-32	FX	UYU
-33	FX	BTC"""
-    df: Union[pd.TextFileReader, pd.DataFrame] = pd.read_csv(StringIO(data), sep="\t")
-    df: pd.DataFrame = df.set_index("ID")
-    return df
-
-
-def get_indexes() -> pd.DataFrame:
-    """
-    Returns list of supported indexes
-    https://eodhistoricaldata.com/knowledgebase/list-supported-indexes/
-    """
-    data: str = """ID	Exchange Code	Code	Index Name
-1	INDX	GSPC	S&P 500
-2	INDX	GDAXI	DAX Index
-3	INDX	SSEC	Shanghai Composite Index (China)
-4	INDX	MERV	MERVAL Index (Argentina)
-5	INDX	FTSE	FTSE 100 Index (UK)
-6	INDX	AORD	All Ordinaries Index (Australia)
-7	INDX	BSESN	BSE 30 Sensitivity Index (SENSEX)
-8	INDX	VIX	VIX S&P 500 Volatility Index
-9	INDX	HSI	Hang Seng Index (Hong Kong)
-10	INDX	GSPTSE	S&P TSX Composite Index (Canada)
-11	INDX	FCHI	CAC 40 Index
-12	INDX	TA100	Tel Aviv 100 Index (Israel
-13	INDX	CYC	Morgan Stanley Cyclical Index
-14	INDX	IIX	Interactive Week Internet Index
-15	INDX	CMR	Morgan Stanley Consumer Index
-16	INDX	GOX	CBOE Gold Inde
-17	INDX	RTS_RS	RTSI Index
-18	INDX	GD_AT	Athens Composite Inde
-19	INDX	FTSEMIB_MI	Untitled Dataset 2015-07-13 20:00:12
-20	INDX	WILREIT	Wilshire US REIT Inde
-21	INDX	W5KMCG	Wilshire US Mid Cap Growt
-22	INDX	IBEX	IBEX 35 Index
-23	INDX	W5KLCV	Wilshire US Large Cap Valu
-24	INDX	SSMI	Swiss Market Index
-25	INDX	OEX	S&P 100 Inde
-26	INDX	RUI	Russell 1000 Inde
-27	INDX	XAX	NYSE AMEX Composite Inde
-28	INDX	WILRESI	Wilshire US Real Estate Securities Inde
-29	INDX	NZ50	NZSE 50 (New Zealand)
-30	INDX	UTY	PHLX Utility Sector Inde
-31	INDX	CSE	Colombo All Shares Index (Sri Lanka
-32	INDX	XOI	NYSE AMEX Oil Inde
-33	INDX	OSX	PHLX Oil Service Sector Inde
-34	INDX	XAL	NYSE AMEX Airline Inde
-35	INDX	W5KSCG	Wilshire US Small Cap Growt
-36	INDX	TWII	Taiwan Weighted Inde
-37	INDX	ATX	ATX Index (Austria
-38	INDX	NWX	NYSE ARCA Networking Inde
-39	INDX	W5KSCV	Wilshire US Small Cap Valu
-40	INDX	XAU	PHLX Gold/Silver Sector Inde
-41	INDX	W5KMCV	Wilshire US Mid Cap Valu
-42	INDX	WGREIT	Wilshire Global REIT Inde
-43	INDX	SML	S&P Small-Cap 600 Inde
-44	INDX	RUT	Russell 2000 Inde
-45	INDX	JKSE	Jakarta Composite Index (Indonesia
-46	INDX	BFX	Euronext BEL-20 Index (Belgium)
-47	INDX	XBD	NYSE AMEX Securities Broker/Dealer Inde
-48	INDX	RUA	Russell 3000 Inde
-49	INDX	XII	NYSE ARCA Institutional Inde
-50	INDX	IETP	ISEQ 20 Price Index (Ireland
-51	INDX	DRG	NYSE AMEX Pharmaceutical Inde
-52	INDX	W5000	Wilshire 5000 Total Market Inde
-53	INDX	HGX	PHLX Housing Sector Inde
-54	INDX	MXX	IPC Index (Mexico)
-55	INDX	W5KLCG	Wilshire US Large Cap Growt
-56	INDX	STI	Straits Times Index
-57	INDX	KS11	KOSPI Composite Index
-58	INDX	AEX	AEX Amsterdam Index
-59	INDX	NYA	NYSE Composite Index
-60	INDX	XMI	NYSE ARCA Major Market Inde
-61	INDX	BTK	NYSE AMEX Biotechnology Inde
-62	INDX	EPX	NASDAQ SIG Oil Exploration and Production Inde
-63	INDX	MID	S&P Mid-Cap 400 Inde
-64	INDX	HUI	NYSE Arca Gold Bugs Inde
-65	INDX	SOX	PHLX Semiconductor Inde
-66	INDX	HCX	CBOE S&P Healthcare Index
-67	INDX	XCI	NYSE AMEX Computer Technology Inde
-68	INDX	XNG	NYSE AMEX Natural Gas Inde
-69	INDX	RMZ	MSCI US REIT Inde
-70	INDX	WGRESI	Wilshire Global Real Estate Securities Inde
-71	INDX	N225	Nikkei 225 Index (Japan
-72	INDX	VDAX	Deutsche Boerse VDAX Volatility Inde
-73	INDX	MXY	NYSE ARCA Mexico Inde
-74	INDX	OSEAX	Oslo Exchange All Share Index (Norway)
-75	INDX	TYX	Treasury Yield 30 Years Inde
-76	INDX	DJI	Dow Jones Industrial Average
-77	INDX	AXPJ	S&P/ASX 200 Australia REIT Inde
-78	INDX	PSI20	PSI 20 Stock Index (Portugal
-79	INDX	IRX	13-week Treasury Bill Inde
-80	INDX	FVX	Treasury Yield 5 Years Inde
-81	INDX	NYI	NYSE International 100 Index
-82	INDX	AXJO	S&P/ASX 200 Index (Australia
-83	INDX	512NTR	S&P 500 GBP Hdg (Net TR) (^512NTR)
-84	INDX	CTES_VI	Czech Trading Inde
-85	INDX	NSEI	S&P/CNX Nifty Index (India
-86	INDX	NYY	NYSE TMT Inde
-87	INDX	CCSI	EGX 70 Price Index (Egypt
-88	INDX	SPSUPX	S&P Composite 1500 Inde
-89	INDX	BVSP	Bovespa Index (Brazil)
-90	INDX	ISEQ	ISEQ Overall Price Index (Ireland
-91	INDX	JPN	NYSE AMEX Japan Inde
-92	INDX	NYL	NYSE World Leaders Inde
-93	INDX	TNX	CBOE Interest Rate 10-Year T-Note Inde
-94	INDX	NY	NYSE US 100 Inde
-95	INDX	SPLV	PowerShares S&P 500 Low Volatil
-96	INDX	OMXSPI	Stockholm General Index (Sweden)
-97	INDX	GVZ	CBOE Gold Volatility Inde
-98	INDX	SPY	SPDR S&P 500 (SPY
-99	INDX	IEQR_IR	ISEQ General Total Return Index (Ireland
-100	INDX	OMXC20_CO	OMX Copenhagen 20 Index
-101	INDX	DJUSFN	^DJUSFN: Dow Jones U.S. Financials Inde
-102	INDX	DJASD	^DJASD: Dow Jones Asia Select Dividen
-103	INDX	IMUS	^IMUS: Dow Jones Islamic Market U.S.
-104	INDX	W1SGI	^W1SGI: Dow Jones Sustainability Worl
-105	INDX	DJT	^DJT: Dow Jones Transportation Averag
-106	INDX	DJUSM	^DJUSM: Dow Jones U.S. Mid-Cap Inde
-107	INDX	W1XGA	^W1XGA: Dow Jones Sustainability Worl
-108	INDX	DWC	^DWC: DJUS Market Index (full-cap
-109	INDX	DJC	^DJC: Dow Jones-UBS Commodity Inde
-110	INDX	IMXL	^IMXL: Dow Jones Islamic Market Titan
-111	INDX	XLHK	^XLHK: Dow Jones Hong Kong Titans 30
-112	INDX	DJTMDI	^DJTMDI: Dow Jones Media Titans 30 Inde
-113	INDX	DJU	^DJU: Dow Jones Utility Averag
-114	INDX	DWCOGS	^DWCOGS: Dow Jones U.S. Oil & Gas Tota
-115	INDX	DJUSST	^DJUSST: Dow Jones U.S. Iron & Steel In
-116	INDX	PSE	^PSE: NYSE Arca Tech 100 Index - New York Stock Exchange
-117	INDX	DWCF	^DWCF: Dow Jones U.S. Total Stock Mar
-118	INDX	W1SUS	^W1SUS: Dow Jones Sustainability Worl
-119	INDX	DJASDT	^DJASDT: Dow Jones Asia Select Dividen
-120	INDX	RCI	^RCI: Dow Jones Composite All REIT I
-121	INDX	DJUSL	^DJUSL: Dow Jones U.S. Large-Cap Inde
-122	INDX	P1DOW	^P1DOW: Dow Jones Asia/Pacific Inde
-123	INDX	DJAT	^DJAT: Dow Jones Asian Titans 50 Inde
-124	INDX	DJUS	^DJUS: Dow Jones U.S. Inde
-125	INDX	DWMI	^DWMI: Dow Jones U.S. Micro-Cap Tota
-126	INDX	DJUSS	^DJUSS: Dow Jones U.S. Small-Cap Inde
-127	INDX	OMX	OMXS 30 Index (Sweden
-128	INDX	STOXX50E	EuroStoxx 50 Inde
-129	INDX	FTAS	FTSE All-Share Index (UK)
-130	INDX	WIHUN_L	FTSE HUngary Index
-131	INDX	WITUR_L	FTSE Turkey Index
-132	INDX	WITHA_L	FTSE Thailand Index
-133	INDX	WIPOL_L	FTSE Poland Index
-134	INDX	WICZH_L	FTSE Czech Republic Index
-135	INDX	OMXC20	OMX Copenhagen 20 Inde
-136	INDX	IXE	^IXE: Select Sector Spdr-energy Inde
-137	INDX	IXIC	NASDAQ Composite
-138	INDX	SPEUP	S&P EUROPE 350"""
-    df: Union[pd.TextFileReader, pd.DataFrame] = pd.read_csv(StringIO(data), sep="\t")
-    df: pd.DataFrame = df.set_index("ID")
-    return df
+@_handle_environ_error
+def iter_exchange_symbols_async(exchange_code: str, api_key: str = EOD_HISTORICAL_DATA_API_KEY_DEFAULT,
+                                chunksize: int = 5000, columns: Optional[Sequence[str]] = None,
+                                types: Optional[Collection[str]] = None, engine: str = DEFAULT_ENGINE,
+                                scheduler: Optional[RequestScheduler] = None,
+                                base_url: Optional[str] = None) -> AsyncIterator[pd.DataFrame]:
+    """
+        **iter_exchange_symbols_async**
+            asynchronous iterator version of iter_exchange_symbols, use it with "async for"
+    """
+    chunker: _ExchangeSymbolsChunker = _ExchangeSymbolsChunker(chunksize, columns=columns, types=types,
+                                                               engine=engine)
+    url, params = _create_exchange_symbols_params(exchange_code=exchange_code, api_key=api_key, base_url=base_url)
+    return _iter_exchange_symbols_async(chunker, _cache_key("exchanges", exchange_code), url, params, None,
+                                        scheduler)
+
+
+@_handle_environ_error
+@_handle_request_errors
+def get_intraday_data(symbol: str, exchange: str, start: Start_END_Type = None, end: Start_END_Type = None,
+                      interval: str = "5m", api_key: str = EOD_HISTORICAL_DATA_API_KEY_DEFAULT,
+                      session: Optional[requests.Session] = None, engine: str = DEFAULT_ENGINE,
+                      scheduler: Optional[RequestScheduler] = None,
+                      compact: bool = False, output: str = "pandas", fmt: str = DEFAULT_FMT,
+                      base_url: Optional[str] = None) -> Optional[pd.DataFrame]:
+    """
+        **get_intraday_data**
+
+        PARAMETERS
+            symbol: (str) -> Ticker Symbol
+            exchange: (str) -> Exchange Code
+            start: (str, int, date, datetime) -> start time, naive times are UTC, None with end None
+                for the default range of the API
+            end: (str,int, date, datetime) -> end time
+            interval: (str) -> bar size, "1m", "5m" (default) or "1h"
+            api_key: (str) -> EOD Historical API Key
+            session: (str) -> Request Session Object
+            engine, scheduler, compact, output, fmt, base_url: -> see get_eod_data
+
+        EXCEPTIONS:
+            RemoteDataError -> will be raised if data cannot be returned from EOD for any reason
+            ValueError -> Will be raised if start and end do not contain Valid Data or if an option is unknown
+
+        returns -> DataFrame of Open, High, Low, Close and Volume indexed by the UTC start time of every bar
+    """
+    _check_output(output)
+    parse: Callable[[bytes], Any] = _get_parser("intraday", fmt, engine)
+    url, params = _create_intraday_params(symbol, exchange, start, end, api_key, interval=interval, fmt=fmt,
+                                          base_url=base_url)
+    with _track(_cache_key("intraday", symbol, exchange, start, end)) as event:
+        r: requests.Response = _get_scheduler(scheduler).get(_init_session(session), url, params, event=event)
+        if r.status_code == requests.codes.ok:
+            return _convert(event.parse(parse, r.content), compact, output)
+        elif r.status_code == api_key_not_authorized:
+            return _api_key_not_authorized_message()
+        else:
+            # replacing api token so it does not show in debug messages
+            params["api_token"] = "API TOKEN IS SECRET"
+            raise RemoteDataError(r.status_code, r.reason, _url(url, params))
+
+
+def _get_real_time_batch(symbols: List[str], exchange: str, api_key: str, session: requests.Session,
+                         parse: Callable[[bytes], Any], scheduler: Optional[RequestScheduler], fmt: str,
+                         base_url: Optional[str]) -> Any:
+    """
+        Returns the quotes of one real-time request, the sentinel when the API key is restricted
+    """
+    url, params = _create_real_time_params(symbols, exchange, api_key, fmt=fmt, base_url=base_url)
+    with _track(_cache_key("real-time", ",".join(symbols), exchange)) as event:
+        r: requests.Response = _get_scheduler(scheduler).get(session, url, params, event=event)
+        if r.status_code == requests.codes.ok:
+            return event.parse(parse, r.content)
+        elif r.status_code == api_key_not_authorized:
+            return _api_key_not_authorized_message()
+        else:
+            # replacing api token so it does not show in debug messages
+            params["api_token"] = "API TOKEN IS SECRET"
+            raise RemoteDataError(r.status_code, r.reason, _url(url, params))
+
+
+@_handle_environ_error
+@_handle_request_errors
+def get_real_time_quotes(symbols: Iterable[str], exchange: str, api_key: str = EOD_HISTORICAL_DATA_API_KEY_DEFAULT,
+                         session: Optional[requests.Session] = None, batch_size: int = REAL_TIME_BATCH_SIZE,
+                         max_workers: int = 4, engine: str = DEFAULT_ENGINE,
+                         scheduler: Optional[RequestScheduler] = None,
+                         compact: bool = False, output: str = "pandas", fmt: str = DEFAULT_FMT,
+                         base_url: Optional[str] = None) -> Optional[pd.DataFrame]:
+    """
+        **get_real_time_quotes**
+            delayed real-time quotes of many symbols, batch_size symbols per request
+
+        USAGE
+            quotes = get_real_time_quotes(["AAPL", "MSFT", "IBM"], "US")
+
+        PARAMETERS
+            symbols: (iterable of str) -> Ticker Symbols
+            exchange: (str) -> Exchange Code
+            api_key: (str) -> EOD Historical API Key
+            session: (str) -> Request Session Object, see get_eod_data_bulk
+            batch_size: (int) -> symbols per request, the API documents up to 15 - 20
+            max_workers: (int) -> maximum number of requests in flight at once
+            engine, scheduler, compact, output, fmt, base_url: -> see get_eod_data
+
+        EXCEPTIONS:
+            RemoteDataError -> will be raised if any batch cannot be returned from EOD
+            ValueError -> Will be raised if batch_size or max_workers is lower than 1 or if an option is unknown
+
+        returns -> DataFrame indexed by code ("AAPL.US") of timestamp (UTC), gmtoffset, open, high, low,
+            close, volume, previousClose, change and change_p, fields the API does not know are NaN
+    """
+    if batch_size < 1 or max_workers < 1:
+        raise ValueError("batch_size and max_workers must be at least 1")
+    _check_output(output)
+    parse: Callable[[bytes], Any] = _get_parser("real-time", fmt, engine)
+    symbols: List[str] = list(dict.fromkeys(symbols))
+    batches: List[List[str]] = [symbols[i:i + batch_size] for i in range(0, len(symbols), batch_size)]
+    session = _init_pooled_session(session, pool_size=max_workers)
+
+    def fetch(batch: List[str]) -> Any:
+        return _get_real_time_batch(batch, exchange, api_key, session, parse, scheduler, fmt, base_url)
+
+    if len(batches) <= 1:
+        results: List[Any] = [fetch(batch) for batch in batches]
+    else:
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(batches))) as executor:
+            results = list(executor.map(fetch, batches))
+    for result in results:
+        if not isinstance(result, pd.DataFrame):
+            return result
+    # without symbols, the frame of an empty response
+    quotes: pd.DataFrame = pd.concat(results) if len(results) > 0 else _get_parser("real-time", "json")(b"[]")
+    return _convert(quotes, compact, output)
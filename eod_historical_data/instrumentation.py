@@ -0,0 +1,275 @@
+import threading
+import time
+import warnings
+from collections import deque
+from contextlib import contextmanager
+from typing import Optional, Dict, List, Tuple, Iterator, Callable, Any, Deque, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import aiohttp as io
+    from .cache import Cache_Key_Type
+
+# phases of a request, in order, "total" is the time spent in the endpoint call
+PHASES: Tuple[str, ...] = ("dns", "connect", "wait", "download", "parse")
+
+
+class RequestEvent:
+    """
+        **RequestEvent**
+            what happened during one call of an endpoint, passed to every registered hook when
+            the call starts and again when it ends
+
+        ATTRIBUTES
+            endpoint: (str) -> "eod", "div", "exchanges" or "eod-bulk"
+            symbol: (str) -> Ticker Symbol, Exchange Code for "exchanges", symbols requested for "eod-bulk"
+            exchange: (str) -> Exchange Code, None for "exchanges"
+            start: (str) -> start date, None for "exchanges"
+            end: (str) -> end date, None for "exchanges"
+            url: (str) -> url requested, without parameters so the api token never shows
+            status: (int) -> status code of the last attempt, None when no response was received
+            cache_hit: (bool) -> the value was returned from the ResponseCache
+            coalesced: (bool) -> the value was shared by an identical request in flight, see RequestCoalescer
+            revalidated: (bool) -> the server answered 304 Not Modified, or a body with the hash of the one
+                cached, and the expired value of the ResponseCache was reused without parsing
+            retries: (int) -> number of attempts after the first one
+            bytes: (int) -> body bytes received over every attempt, after decompression
+            wire_bytes: (int) -> body bytes received over every attempt as sent by the server,
+                before decompression
+            rows: (int) -> number of rows parsed, None when nothing was parsed
+            timings: (dict) -> seconds spent in "dns", "connect", "wait" (until the response headers),
+                "download", "parse" and "total", dns and connect are only measured by the asynchronous
+                functions, the synchronous ones count them in wait
+            error: (Exception) -> exception raised by the call, None on success
+    """
+
+    def __init__(self, key: "Cache_Key_Type", url: Optional[str] = None):
+        self.endpoint, self.symbol, self.exchange, self.start, self.end = key
+        self.url: Optional[str] = url
+        self.status: Optional[int] = None
+        self.cache_hit: bool = False
+        self.coalesced: bool = False
+        self.revalidated: bool = False
+        self.retries: int = 0
+        self.bytes: int = 0
+        self.wire_bytes: int = 0
+        self.rows: Optional[int] = None
+        self.timings: Dict[str, float] = dict.fromkeys(PHASES + ("total",), 0.0)
+        self.error: Optional[Exception] = None
+        # wall clock time the call started at
+        self.started: float = time.time()
+
+    def __repr__(self) -> str:
+        return (f"RequestEvent({self.endpoint!r}, {self.symbol!r}, status={self.status}, "
+                f"cache_hit={self.cache_hit}, total={self.timings['total']:.3f}s)")
+
+    def add_time(self, phase: str, seconds: float) -> None:
+        self.timings[phase] += seconds
+
+    @contextmanager
+    def timed(self, phase: str) -> Iterator[None]:
+        """
+            Adds the time spent in the with block to phase
+        """
+        started: float = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(phase, time.perf_counter() - started)
+
+    def parse(self, parser: Callable[..., Any], data: Any, **kwargs) -> Any:
+        """
+            Returns parser(data, **kwargs), timed as the parse phase
+        """
+        with self.timed("parse"):
+            value: Any = parser(data, **kwargs)
+        self.rows = len(value)
+        return value
+
+
+class Instrumentation:
+    """
+        **Instrumentation**
+            base class of the hooks, override request_start and / or request_end and pass an
+            instance to register, hooks are called from the thread (or event loop) making the
+            request so they must be thread safe and quick
+    """
+
+    def request_start(self, event: RequestEvent) -> None:
+        pass
+
+    def request_end(self, event: RequestEvent) -> None:
+        pass
+
+
+_hooks: Tuple[Instrumentation, ...] = ()
+_hooks_lock = threading.Lock()
+
+
+def register(hook: Instrumentation) -> Instrumentation:
+    """
+        Calls hook for every request made by the endpoints, returns hook
+    """
+    global _hooks
+    with _hooks_lock:
+        if hook not in _hooks:
+            _hooks = _hooks + (hook,)
+    return hook
+
+
+def unregister(hook: Instrumentation) -> None:
+    """
+        Stops calling hook, does nothing if it is not registered
+    """
+    global _hooks
+    with _hooks_lock:
+        _hooks = tuple(h for h in _hooks if h is not hook)
+
+
+def _emit(method: str, event: RequestEvent) -> None:
+    for hook in _hooks:
+        try:
+            getattr(hook, method)(event)
+        except Exception as e:
+            # a broken hook must not break the request
+            warnings.warn(f"instrumentation hook {hook!r} failed in {method}: {e!r}", RuntimeWarning)
+
+
+@contextmanager
+def _track(key: "Cache_Key_Type") -> Iterator[RequestEvent]:
+    """
+        Yields the event of an endpoint call, hooks are called when the with block is entered and left
+    """
+    event: RequestEvent = RequestEvent(key)
+    _emit("request_start", event)
+    started: float = time.perf_counter()
+    try:
+        yield event
+    except Exception as e:
+        event.error = e
+        raise
+    finally:
+        event.timings["total"] = time.perf_counter() - started
+        _emit("request_end", event)
+
+
+def _trace_config() -> "io.TraceConfig":
+    """
+        Returns an aiohttp TraceConfig measuring dns, connect and wait of the requests
+        given a RequestEvent as trace_request_ctx
+    """
+    import aiohttp as io
+
+    async def on_request_start(session, context, params) -> None:
+        context.started = time.perf_counter()
+        context.dns = 0.0
+        context.setup = 0.0
+
+    async def on_dns_resolvehost_start(session, context, params) -> None:
+        context.dns_started = time.perf_counter()
+
+    async def on_dns_resolvehost_end(session, context, params) -> None:
+        context.dns += time.perf_counter() - context.dns_started
+
+    async def on_connection_create_start(session, context, params) -> None:
+        context.connection_started = time.perf_counter()
+        context.dns_before = context.dns
+
+    async def on_connection_create_end(session, context, params) -> None:
+        # host resolution happens while the connection is created
+        elapsed: float = time.perf_counter() - context.connection_started
+        context.setup += elapsed
+        event: Optional[RequestEvent] = context.trace_request_ctx
+        if isinstance(event, RequestEvent):
+            dns: float = context.dns - context.dns_before
+            event.add_time("dns", dns)
+            event.add_time("connect", elapsed - dns)
+
+    async def on_request_end(session, context, params) -> None:
+        # sent once the response headers are received
+        event: Optional[RequestEvent] = context.trace_request_ctx
+        if isinstance(event, RequestEvent):
+            event.add_time("wait", max(0.0, time.perf_counter() - context.started - context.setup))
+
+    trace_config: io.TraceConfig = io.TraceConfig()
+    trace_config.on_request_start.append(on_request_start)
+    trace_config.on_dns_resolvehost_start.append(on_dns_resolvehost_start)
+    trace_config.on_dns_resolvehost_end.append(on_dns_resolvehost_end)
+    trace_config.on_connection_create_start.append(on_connection_create_start)
+    trace_config.on_connection_create_end.append(on_connection_create_end)
+    trace_config.on_request_end.append(on_request_end)
+    return trace_config
+
+
+def _percentile(values: List[float], q: float) -> Optional[float]:
+    """
+        Returns the q-th percentile (0 to 100) of sorted values, linearly interpolated
+    """
+    if len(values) == 0:
+        return None
+    position: float = (len(values) - 1) * q / 100.0
+    lower: int = int(position)
+    upper: int = min(lower + 1, len(values) - 1)
+    return values[lower] + (values[upper] - values[lower]) * (position - lower)
+
+
+class MetricsAggregator(Instrumentation):
+    """
+        **MetricsAggregator**
+            hook keeping the events of the requests that ended and summarizing them
+
+        USAGE
+            metrics = register(MetricsAggregator())
+            data, errors = get_eod_data_bulk(symbols, "US", start, end)
+            print(metrics.summary())
+
+        PARAMETERS
+            maxlen: (int) -> number of most recent events kept, None keeps them all
+    """
+
+    def __init__(self, maxlen: Optional[int] = None):
+        self._events: Deque[RequestEvent] = deque(maxlen=maxlen)
+        self._lock = threading.Lock()
+
+    def request_end(self, event: RequestEvent) -> None:
+        with self._lock:
+            self._events.append(event)
+
+    @property
+    def events(self) -> List[RequestEvent]:
+        with self._lock:
+            return list(self._events)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._events.clear()
+
+    def summary(self) -> Dict[str, Any]:
+        """
+            Returns counts, p50 / p95 / p99 / max latency in seconds, seconds spent per phase over
+            every request and rows parsed per second of wall clock time between the first start
+            and the last end
+        """
+        events: List[RequestEvent] = self.events
+        latencies: List[float] = sorted(event.timings["total"] for event in events)
+        rows: int = sum(event.rows or 0 for event in events)
+        span: float = 0.0
+        if len(events) > 0:
+            span = max(event.started + event.timings["total"] for event in events) - \
+                min(event.started for event in events)
+        return {
+            "requests": len(events),
+            "errors": sum(event.error is not None for event in events),
+            "cache_hits": sum(event.cache_hit for event in events),
+            "coalesced": sum(event.coalesced for event in events),
+            "revalidated": sum(event.revalidated for event in events),
+            "retries": sum(event.retries for event in events),
+            "statuses": {status: sum(event.status == status for event in events)
+                         for status in sorted({event.status for event in events if event.status is not None})},
+            "bytes": sum(event.bytes for event in events),
+            "wire_bytes": sum(event.wire_bytes for event in events),
+            "rows": rows,
+            "latency": {"p50": _percentile(latencies, 50), "p95": _percentile(latencies, 95),
+                        "p99": _percentile(latencies, 99), "max": latencies[-1] if latencies else None},
+            "phases": {phase: sum(event.timings[phase] for event in events) for phase in PHASES},
+            "rows_per_sec": rows / span if span > 0 else None,
+        }
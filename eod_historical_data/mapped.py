@@ -0,0 +1,188 @@
+import os
+import shutil
+import threading
+from datetime import datetime
+from typing import Optional, Dict, List, Tuple, Sequence, Any
+
+import numpy as np
+import pandas as pd
+
+from ._parsers import EOD_PRICE_COLUMNS, EOD_VOLUME_COLUMN
+from ._utils import _sanitize_dates
+from . import data
+
+Columns_Type = Dict[str, np.ndarray]
+
+# name of the column holding the dates, sorted, one file per column
+DATE_COLUMN: str = "Date"
+MAPPED_COLUMNS: Tuple[str, ...] = EOD_PRICE_COLUMNS + (EOD_VOLUME_COLUMN,)
+
+# file of a symbol directory holding the number of its current version
+_CURRENT: str = "CURRENT"
+
+
+def _datetime64(dt: data.Start_END_Type) -> np.datetime64:
+    # an integer is a year, as for get_eod_data
+    return np.datetime64(pd.Timestamp(datetime(dt, 1, 1) if isinstance(dt, int) else dt), "ns")
+
+
+def _check_name(name: str) -> str:
+    if name == "" or name.startswith(".") or os.sep in name or (os.altsep is not None and os.altsep in name):
+        raise ValueError(f"symbol and exchange must be plain file names, got {name!r}")
+    return name
+
+
+class MappedHistory:
+    """
+        **MappedHistory**
+            on-disk End oF Day Data, one NumPy .npy file per column and symbol, read through
+            read-only memory maps so every process reading the same files shares their pages
+            and a date range is sliced without copying or parsing
+
+        USAGE
+            history = MappedHistory("eod-history")
+            history.write("AAPL", "US", get_eod_data("AAPL", "US", start, end, api_key=api_key))
+            columns = history.columns("AAPL", "US", start="2020-01-01", end="2020-12-31")  # no copy
+
+        LAYOUT
+            path/exchange/symbol/CURRENT holds the version n read, path/exchange/symbol/v<n>/ holds
+            Date.npy (sorted datetime64[ns], the index of every column) and Open.npy, High.npy, Low.npy,
+            Close.npy, Adjusted_close.npy and Volume.npy, a write creates version n + 1 and replaces
+            CURRENT atomically, the previous version is kept for the readers still mapping it
+
+        PARAMETERS
+            path: (str) -> root directory, created if it does not exist
+
+        NOTE a MappedHistory may be pickled and sent to worker processes, only one process
+            should write a given symbol at a time
+    """
+
+    def __init__(self, path: str):
+        self.path: str = path
+        os.makedirs(path, exist_ok=True)
+        self._lock = threading.Lock()
+        # (symbol, exchange) -> (version, memory mapped columns)
+        self._maps: Dict[Tuple[str, str], Tuple[int, Columns_Type]] = {}
+
+    def __getstate__(self) -> Dict[str, Any]:
+        return {"path": self.path}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__init__(state["path"])
+
+    def _directory(self, symbol: str, exchange: str) -> str:
+        return os.path.join(self.path, _check_name(exchange), _check_name(symbol))
+
+    def _version(self, symbol: str, exchange: str) -> Optional[int]:
+        try:
+            with open(os.path.join(self._directory(symbol, exchange), _CURRENT)) as f:
+                return int(f.read())
+        except FileNotFoundError:
+            return None
+
+    def symbols(self) -> List[Tuple[str, str]]:
+        """
+            Returns the sorted (symbol, exchange) pairs held
+        """
+        pairs: List[Tuple[str, str]] = []
+        for exchange in os.listdir(self.path):
+            if os.path.isdir(os.path.join(self.path, exchange)):
+                pairs.extend((symbol, exchange) for symbol in os.listdir(os.path.join(self.path, exchange))
+                             if os.path.exists(os.path.join(self.path, exchange, symbol, _CURRENT)))
+        return sorted(pairs)
+
+    def _map(self, symbol: str, exchange: str) -> Optional[Columns_Type]:
+        """
+            Returns the memory mapped columns of the current version, None if the symbol is not held
+        """
+        version: Optional[int] = self._version(symbol, exchange)
+        if version is None:
+            return None
+        with self._lock:
+            mapped: Optional[Tuple[int, Columns_Type]] = self._maps.get((symbol, exchange))
+        if mapped is not None and mapped[0] == version:
+            return mapped[1]
+        directory: str = os.path.join(self._directory(symbol, exchange), f"v{version}")
+        files: List[str] = os.listdir(directory)
+        columns: Columns_Type = {name: np.load(os.path.join(directory, f"{name}.npy"), mmap_mode="r")
+                                 for name in (DATE_COLUMN,) + MAPPED_COLUMNS if f"{name}.npy" in files}
+        with self._lock:
+            self._maps[(symbol, exchange)] = (version, columns)
+        return columns
+
+    def columns(self, symbol: str, exchange: str, start: data.Start_END_Type = None,
+                end: data.Start_END_Type = None, fields: Optional[Sequence[str]] = None) -> Optional[Columns_Type]:
+        """
+            Returns {column: read-only array} of the rows between start and end (both inclusive,
+            None for the first / last row held) including Date, every array is a view of the
+            memory mapped file, None if the symbol is not held
+        """
+        columns: Optional[Columns_Type] = self._map(symbol, exchange)
+        if columns is None:
+            return None
+        dates: np.ndarray = columns[DATE_COLUMN]
+        if start is not None and end is not None:
+            start, end = _sanitize_dates(start, end)
+        # Date is sorted, it is the index of the rows of every column
+        first: int = 0 if start is None else int(dates.searchsorted(_datetime64(start), "left"))
+        last: int = len(dates) if end is None else int(dates.searchsorted(_datetime64(end), "right"))
+        names: Sequence[str] = [name for name in columns if name != DATE_COLUMN] if fields is None else fields
+        return {name: columns[name][first:last] for name in (DATE_COLUMN,) + tuple(names)}
+
+    def read(self, symbol: str, exchange: str, start: data.Start_END_Type = None,
+             end: data.Start_END_Type = None) -> Optional[pd.DataFrame]:
+        """
+            Returns the rows between start and end shaped like get_eod_data, only these rows are
+            copied out of the memory maps, None if the symbol is not held
+        """
+        columns: Optional[Columns_Type] = self.columns(symbol, exchange, start, end)
+        if columns is None:
+            return None
+        index: pd.DatetimeIndex = pd.DatetimeIndex(columns.pop(DATE_COLUMN), name=DATE_COLUMN)
+        return pd.DataFrame(columns, index=index)
+
+    def write(self, symbol: str, exchange: str, df: pd.DataFrame, merge: bool = True) -> None:
+        """
+            Stores End oF Day Data of df as a new version, with merge the rows held are kept and
+            the rows of df replace the ones of the same dates
+        """
+        if merge:
+            held: Optional[pd.DataFrame] = self.read(symbol, exchange)
+            if held is not None and len(held) > 0:
+                df = pd.concat([held, df])
+        df = df[[column for column in MAPPED_COLUMNS if column in df.columns]]
+        if not df.index.is_monotonic_increasing:
+            df = df.sort_index(kind="mergesort")
+        if df.index.has_duplicates:
+            df = df[~df.index.duplicated(keep="last")]
+
+        directory: str = self._directory(symbol, exchange)
+        os.makedirs(directory, exist_ok=True)
+        version: int = (self._version(symbol, exchange) or 0) + 1
+        target: str = os.path.join(directory, f"v{version}")
+        # a version left over by a write that failed is never read, it is overwritten
+        shutil.rmtree(target, ignore_errors=True)
+        os.makedirs(target)
+        np.save(os.path.join(target, f"{DATE_COLUMN}.npy"), df.index.values.astype("datetime64[ns]"))
+        for column in df.columns:
+            np.save(os.path.join(target, f"{column}.npy"), df[column].to_numpy())
+        current: str = os.path.join(directory, _CURRENT)
+        with open(current + ".tmp", "w") as f:
+            f.write(str(version))
+        os.replace(current + ".tmp", current)
+        # versions before the previous one are not mapped by readers that saw CURRENT before this write
+        for name in os.listdir(directory):
+            if name.startswith("v") and name[1:].isdigit() and int(name[1:]) < version - 1:
+                shutil.rmtree(os.path.join(directory, name), ignore_errors=True)
+
+    def download(self, symbol: str, exchange: str, start: data.Start_END_Type = None,
+                 end: data.Start_END_Type = None, api_key: str = data.EOD_HISTORICAL_DATA_API_KEY_DEFAULT,
+                 **kwargs) -> Optional[pd.DataFrame]:
+        """
+            Calls data.get_eod_data with kwargs (session, engine, cache, ...) and stores the rows
+            returned, returns what get_eod_data returned
+        """
+        df: Any = data.get_eod_data(symbol, exchange, start=start, end=end, api_key=api_key, **kwargs)
+        if isinstance(df, pd.DataFrame):
+            self.write(symbol, exchange, df)
+        return df
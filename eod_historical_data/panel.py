@@ -0,0 +1,141 @@
+from typing import Optional, Dict, Tuple, Iterable, List, Any, Sequence, Union
+
+import numpy as np
+import pandas as pd
+import requests
+
+from .cache import ResponseCache
+from .scheduler import RequestScheduler
+from ._parsers import EOD_PRICE_COLUMNS, EOD_VOLUME_COLUMN, DEFAULT_ENGINE, DEFAULT_FMT
+from ._utils import _handle_environ_error
+from . import data
+
+Fill_Type = Optional[Union[str, float]]
+Panel_Type = Dict[str, pd.DataFrame]
+
+# fields of a panel when none are given
+PANEL_FIELDS: Tuple[str, ...] = EOD_PRICE_COLUMNS + (EOD_VOLUME_COLUMN,)
+
+# fill policies by name, a number fills the missing cells with that number
+FILLS: Tuple[str, ...] = ("ffill", "bfill")
+
+
+def _check_fill(fill: Fill_Type) -> Fill_Type:
+    if fill is not None and fill not in FILLS and not isinstance(fill, (int, float)):
+        raise ValueError(f"fill must be None, a number or one of {FILLS}, got {fill!r}")
+    return fill
+
+
+def _union_calendar(frames: Sequence[pd.DataFrame]) -> np.ndarray:
+    """
+        Returns the sorted distinct dates of every frame index as datetime64[ns]
+    """
+    if len(frames) == 0:
+        return np.array([], dtype="datetime64[ns]")
+    return np.unique(np.concatenate([frame.index.values.astype("datetime64[ns]") for frame in frames]))
+
+
+def _fill_forward(matrix: np.ndarray) -> None:
+    """
+        Replaces in place the NaN cells of every column with the last valid value above them,
+        leading NaN cells stay NaN
+    """
+    rows: np.ndarray = np.arange(matrix.shape[0])[:, None]
+    # row of the last valid cell at or above every cell
+    last: np.ndarray = np.where(np.isnan(matrix), 0, rows)
+    np.maximum.accumulate(last, axis=0, out=last)
+    matrix[:] = matrix[last, np.arange(matrix.shape[1])]
+
+
+def _apply_fill(matrix: np.ndarray, fill: Fill_Type) -> None:
+    if fill is None or matrix.size == 0:
+        return
+    if fill == "ffill":
+        _fill_forward(matrix)
+    elif fill == "bfill":
+        # a forward fill of the rows in reverse order, the view is filled in place
+        _fill_forward(matrix[::-1])
+    else:
+        matrix[np.isnan(matrix)] = fill
+
+
+def _assemble_panel(frames: Dict[str, pd.DataFrame], fields: Sequence[str], fill: Fill_Type = None,
+                    float_dtype: str = "float64") -> Panel_Type:
+    """
+        Returns a (date x symbol) DataFrame per field from End oF Day Data DataFrames keyed by symbol,
+        every field is one array preallocated on the union of the frame dates and filled in place,
+        a date a symbol has no row for holds NaN before fill is applied
+    """
+    symbols: List[str] = list(frames)
+    calendar: np.ndarray = _union_calendar([frames[symbol] for symbol in symbols])
+    shape: Tuple[int, int] = (len(calendar), len(symbols))
+    # Volume keeps float64, float32 would round large volumes
+    matrices: Dict[str, np.ndarray] = {
+        field: np.full(shape, np.nan, dtype="float64" if field == EOD_VOLUME_COLUMN else float_dtype)
+        for field in fields}
+    for column, symbol in enumerate(symbols):
+        frame: pd.DataFrame = frames[symbol]
+        rows: np.ndarray = calendar.searchsorted(frame.index.values.astype("datetime64[ns]"))
+        for field, matrix in matrices.items():
+            if field in frame.columns:
+                matrix[rows, column] = frame[field].to_numpy(dtype=matrix.dtype, na_value=np.nan)
+    index: pd.DatetimeIndex = pd.DatetimeIndex(calendar, name="Date")
+    columns: pd.Index = pd.Index(symbols, name="Symbol")
+    panel: Panel_Type = {}
+    for field, matrix in matrices.items():
+        _apply_fill(matrix, fill)
+        panel[field] = pd.DataFrame(matrix, index=index, columns=columns, copy=False)
+    return panel
+
+
+@_handle_environ_error
+def get_eod_panel(symbols: Iterable[str], exchange: str, start: data.Start_END_Type = None,
+                  end: data.Start_END_Type = None, fields: Optional[Iterable[str]] = None, fill: Fill_Type = None,
+                  api_key: str = data.EOD_HISTORICAL_DATA_API_KEY_DEFAULT,
+                  session: Optional[requests.Session] = None, max_workers: int = 8,
+                  engine: str = DEFAULT_ENGINE, cache: Optional[ResponseCache] = None,
+                  scheduler: Optional[RequestScheduler] = None, compact: bool = False,
+                  fmt: str = DEFAULT_FMT, base_url: Optional[str] = None) -> Tuple[Panel_Type, Dict[str, Any]]:
+    """
+        **get_eod_panel**
+            End oF Day Data of many symbols aligned on one calendar, one wide (date x symbol)
+            DataFrame per field, replaces concatenating and pivoting the frames of get_eod_data_bulk
+
+        USAGE
+            panel, errors = get_eod_panel(["AAPL", "MSFT"], "US", start="2020-01-01", fill="ffill")
+            returns = panel["Adjusted_close"].pct_change()
+
+        PARAMETERS
+            symbols: (iterable of str) -> Ticker Symbols, the columns of every panel in this order
+            exchange: (str) -> Exchange Code
+            start: (str, int, date, datetime) -> start date or integer representing Year
+            end: (str,int, date, datetime) -> end date or integer representing Year
+            fields: (iterable of str) -> columns to assemble, None for Open, High, Low, Close,
+                Adjusted_close and Volume
+            fill: (str, float) -> cells of the dates a symbol did not trade on, None leaves NaN,
+                "ffill" repeats the last known value, "bfill" the next one, a number replaces NaN
+            api_key: (str) -> EOD Historical API Key
+            session: (str) -> Request Session Object, see get_eod_data_bulk
+            max_workers: (int) -> maximum number of requests in flight at once
+            engine: (str) -> csv parser engine, "c" (default), "pyarrow" or "python"
+            cache: (ResponseCache) -> cache of parsed responses, None disables caching
+            scheduler: (RequestScheduler) -> rate limiting and retry policy shared by all workers,
+                None uses the default scheduler
+            compact: (bool) -> float32 prices, Volume stays float64
+            fmt: (str) -> response format requested, "csv" (default) or "json"
+            base_url: (str) -> root url of the API, None uses the one of the default EODClient
+
+        EXCEPTIONS:
+            ValueError -> Will be raised if either start or end do not contain Valid Data,
+                if max_workers is lower than 1 or if fill is unknown
+
+        returns -> (panel, errors) tuple, panel maps every field to a DataFrame indexed by the union
+            of the dates of all symbols with one column per symbol that succeeded, errors is the same
+            as the one of get_eod_data_bulk
+    """
+    _check_fill(fill)
+    fields: List[str] = list(PANEL_FIELDS if fields is None else dict.fromkeys(fields))
+    frames, errors = data.get_eod_data_bulk(symbols, exchange, start=start, end=end, api_key=api_key,
+                                            session=session, max_workers=max_workers, engine=engine,
+                                            cache=cache, scheduler=scheduler, fmt=fmt, base_url=base_url)
+    return _assemble_panel(frames, fields, fill, float_dtype="float32" if compact else "float64"), errors
@@ -0,0 +1,201 @@
+import os
+import queue
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import AbstractContextManager
+from typing import Optional, Dict, Tuple, Iterable, List, Any, Callable, Union
+
+import pandas as pd
+import requests
+
+from .cache import ResponseCache, Cache_Key_Type, _cache_key
+from .scheduler import RequestScheduler
+from .instrumentation import RequestEvent, _track
+from ._formats import _convert, _check_output
+from ._parsers import _get_parser, _check_fmt, DEFAULT_ENGINE, DEFAULT_FMT
+from ._utils import _init_pooled_session, _sanitize_dates, _url, RemoteDataError, _handle_environ_error, \
+    api_key_not_authorized
+from . import data
+
+# parse stages by name, an Executor instance may be given instead
+PARSE_EXECUTORS: Tuple[str, ...] = ("process", "thread")
+
+# marks the end of the downloads on the queue, one per parse worker
+_DONE = object()
+
+
+def _check_parse_executor(parse_executor: Union[str, Executor]) -> Union[str, Executor]:
+    if not isinstance(parse_executor, Executor) and parse_executor not in PARSE_EXECUTORS:
+        raise ValueError(f"parse_executor must be an Executor or one of {PARSE_EXECUTORS}, got {parse_executor!r}")
+    return parse_executor
+
+
+def _create_executor(parse_executor: Union[str, Executor], parse_workers: int) -> Tuple[Executor, bool]:
+    """
+        Returns (executor, owned), owned executors are created here and shut down by the pipeline
+    """
+    if isinstance(parse_executor, Executor):
+        return parse_executor, False
+    if parse_executor == "process":
+        return ProcessPoolExecutor(max_workers=parse_workers), True
+    return ThreadPoolExecutor(max_workers=parse_workers), True
+
+
+class _Download:
+    """
+        response body of one symbol waiting in the queue, the event of the call stays open
+        until the body is parsed by the parse stage
+    """
+
+    def __init__(self, symbol: str, key: Cache_Key_Type, tracker: AbstractContextManager, event: RequestEvent,
+                 body: bytes):
+        self.symbol: str = symbol
+        self.key: Cache_Key_Type = key
+        self.tracker: AbstractContextManager = tracker
+        self.event: RequestEvent = event
+        self.body: bytes = body
+
+
+@_handle_environ_error
+def get_eod_data_pipeline(symbols: Iterable[str], exchange: str, start: data.Start_END_Type = None,
+                          end: data.Start_END_Type = None, api_key: str = data.EOD_HISTORICAL_DATA_API_KEY_DEFAULT,
+                          session: Optional[requests.Session] = None, max_workers: int = 8,
+                          parse_workers: Optional[int] = None,
+                          parse_executor: Union[str, Executor] = "process", queue_size: int = 16,
+                          endpoint: str = "eod", as_frame: bool = False, engine: str = DEFAULT_ENGINE,
+                          cache: Optional[ResponseCache] = None,
+                          scheduler: Optional[RequestScheduler] = None,
+                          compact: bool = False, output: str = "pandas",
+                          fmt: str = DEFAULT_FMT, base_url: Optional[str] = None) -> data.Bulk_Result_Type:
+    """
+        **get_eod_data_pipeline**
+            get_eod_data_bulk with downloading and parsing run as two stages, max_workers threads
+            download the responses into a queue of at most queue_size bodies and parse_workers
+            workers parse them, a download waits while the queue is full so memory stays bounded
+            and parsing never holds the GIL of the threads waiting on the network
+
+        USAGE
+            data, errors = get_eod_data_pipeline(symbols, "US", start="2000-01-01", end="2020-12-31")
+
+        PARAMETERS
+            symbols: (iterable of str) -> Ticker Symbols
+            exchange: (str) -> Exchange Code
+            start: (str, int, date, datetime) -> start date or integer representing Year
+            end: (str,int, date, datetime) -> end date or integer representing Year
+            api_key: (str) -> EOD Historical API Key
+            session: (str) -> Request Session Object, see get_eod_data_bulk
+            max_workers: (int) -> maximum number of requests in flight at once
+            parse_workers: (int) -> number of responses parsed at once, None for the number of CPUs
+            parse_executor: (str, Executor) -> "process" (default) parses in a process pool, "thread"
+                in a thread pool which is enough for parsers releasing the GIL such as engine="pyarrow",
+                an Executor is used as is and left running
+            queue_size: (int) -> maximum number of downloaded bodies waiting to be parsed
+            endpoint: (str) -> "eod" for prices or "div" for dividends
+            as_frame, engine, cache, scheduler, compact, output, fmt, base_url: -> see get_eod_data_bulk
+
+        EXCEPTIONS:
+            ValueError -> Will be raised if either start or end do not contain Valid Data, if
+                max_workers, parse_workers or queue_size is lower than 1 or if an option is unknown
+
+        returns -> (data, errors) tuple, the same as get_eod_data_bulk
+    """
+    parse_workers = (os.cpu_count() or 1) if parse_workers is None else parse_workers
+    if min(max_workers, parse_workers, queue_size) < 1:
+        raise ValueError("max_workers, parse_workers and queue_size must be at least 1")
+    if endpoint not in ("eod", "div"):
+        raise ValueError(f'endpoint must be "eod" or "div", got {endpoint!r}')
+    _check_output(output)
+    _check_parse_executor(parse_executor)
+    parse: Callable[[bytes], Any] = _get_parser(endpoint, _check_fmt(fmt), engine)
+    # Fail fast on bad dates instead of once per symbol
+    _sanitize_dates(start, end)
+    symbols: List[str] = list(dict.fromkeys(symbols))
+    session: requests.Session = _init_pooled_session(session, pool_size=max_workers)
+
+    results: Dict[str, Any] = {}
+    bodies: "queue.Queue[Any]" = queue.Queue(maxsize=queue_size)
+    failures: List[BaseException] = []
+
+    def download(symbol: str) -> None:
+        key: Cache_Key_Type = _cache_key(endpoint, symbol, exchange, start, end)
+        tracker: AbstractContextManager = _track(key)
+        event: RequestEvent = tracker.__enter__()
+        try:
+            cached: Optional[pd.DataFrame] = data._from_cache(cache, key)
+            if cached is not None:
+                event.cache_hit = True
+                results[symbol] = _convert(cached, compact)
+            else:
+                params, r, url = data._create_request(api_key=api_key, end=end, start=start, exchange=exchange,
+                                                      symbol=symbol, session=session, endpoint=endpoint,
+                                                      scheduler=scheduler, event=event, fmt=fmt,
+                                                      base_url=base_url)
+                if r.status_code == requests.codes.ok:
+                    # the event ends once the body is parsed, put blocks while the parse stage is behind
+                    bodies.put(_Download(symbol, key, tracker, event, r.content))
+                    return
+                elif r.status_code == api_key_not_authorized:
+                    results[symbol] = data._api_key_not_authorized_message()
+                else:
+                    # replacing api token so it does not show in debug messages
+                    params["api_token"] = "API TOKEN IS SECRET"
+                    results[symbol] = RemoteDataError(r.status_code, r.reason, _url(url, params))
+        except RemoteDataError as e:
+            # the scheduler gave up on the symbol, the others are still downloaded
+            event.error = e
+            results[symbol] = e
+        except BaseException as e:
+            tracker.__exit__(type(e), e, e.__traceback__)
+            raise
+        tracker.__exit__(None, None, None)
+
+    def consume(executor: Executor) -> None:
+        while True:
+            item: Any = bodies.get()
+            if item is _DONE:
+                return
+            try:
+                df: pd.DataFrame = item.event.parse(lambda body: executor.submit(parse, body).result(), item.body)
+                results[item.symbol] = _convert(data._to_cache(cache, item.key, df), compact)
+            except BaseException as e:
+                item.tracker.__exit__(type(e), e, e.__traceback__)
+                failures.append(e)
+            else:
+                item.tracker.__exit__(None, None, None)
+
+    executor, owned = _create_executor(parse_executor, parse_workers)
+    consumers: List[threading.Thread] = [threading.Thread(target=consume, args=(executor,), daemon=True)
+                                         for _ in range(parse_workers)]
+    try:
+        for consumer in consumers:
+            consumer.start()
+        try:
+            with ThreadPoolExecutor(max_workers=max_workers) as downloaders:
+                # list() re-raises the first exception of a download
+                list(downloaders.map(download, symbols))
+        finally:
+            for _ in consumers:
+                bodies.put(_DONE)
+            for consumer in consumers:
+                consumer.join()
+    finally:
+        if owned:
+            executor.shutdown()
+    if len(failures) > 0:
+        raise failures[0]
+
+    frames: Dict[str, pd.DataFrame] = {}
+    errors: Dict[str, Any] = {}
+    for symbol in symbols:
+        result: Any = results[symbol]
+        if isinstance(result, (pd.DataFrame, pd.Series)):
+            frames[symbol] = result
+        else:
+            errors[symbol] = result
+
+    if as_frame:
+        frame: pd.DataFrame = pd.concat(frames, names=["Symbol"]) if len(frames) > 0 else pd.DataFrame()
+        return _convert(frame, output=output), errors
+    if output != "pandas":
+        frames = {symbol: _convert(df, output=output) for symbol, df in frames.items()}
+    return frames, errors
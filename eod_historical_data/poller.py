@@ -0,0 +1,123 @@
+import threading
+import time
+from typing import Optional, Iterable, Iterator, List, Any
+
+import numpy as np
+import pandas as pd
+import requests
+
+from .scheduler import RequestScheduler
+from ._parsers import DEFAULT_FMT
+from ._utils import _init_pooled_session, RemoteDataError, api_key_not_authorized
+from . import data
+
+
+def _changed(previous: Optional[pd.DataFrame], quotes: pd.DataFrame) -> pd.DataFrame:
+    """
+        Returns the rows of quotes with a field that differs from the row of the same code in
+        previous, codes missing from previous are changed, NaN equals NaN
+    """
+    if previous is None:
+        return quotes
+    before: pd.DataFrame = previous.reindex(quotes.index)
+    changed: np.ndarray = np.zeros(len(quotes), dtype=bool)
+    for column in quotes.columns:
+        new: np.ndarray = quotes[column].to_numpy()
+        old: np.ndarray = before[column].to_numpy()
+        changed |= ~((new == old) | (pd.isna(new) & pd.isna(old)))
+    return quotes[changed]
+
+
+class QuotePoller:
+    """
+        **QuotePoller**
+            polls the delayed real-time quotes of many symbols on a fixed cadence and emits only the
+            quotes that changed since the previous poll, every tick makes len(symbols) / batch_size
+            requests through one pooled session instead of one request per symbol
+
+        USAGE
+            poller = QuotePoller(symbols, "US", interval=5)
+            for changed in poller:  # a DataFrame of the changed quotes, indexed by code
+                publish(changed)
+            # poller.stop() from another thread ends the iteration
+
+        PARAMETERS
+            symbols: (iterable of str) -> Ticker Symbols
+            exchange: (str) -> Exchange Code
+            interval: (float) -> seconds between two polls, ticks are scheduled at start + n * interval
+                so the time spent polling does not shift the cadence, the ticks a slow poll overran
+                are skipped and counted in missed
+            api_key: (str) -> EOD Historical API Key
+            session: (str) -> Request Session Object, None uses one pooling max_workers connections
+            batch_size: (int) -> symbols per request, see get_real_time_quotes
+            max_workers: (int) -> maximum number of requests in flight during a tick
+            scheduler: (RequestScheduler) -> rate limiting and retry policy, None uses the default scheduler
+            fmt: (str) -> response format requested, "csv" (default) or "json"
+            base_url: (str) -> root url of the API, None uses the one of the default EODClient
+    """
+
+    def __init__(self, symbols: Iterable[str], exchange: str, interval: float = 5.0,
+                 api_key: str = data.EOD_HISTORICAL_DATA_API_KEY_DEFAULT,
+                 session: Optional[requests.Session] = None, batch_size: int = data.REAL_TIME_BATCH_SIZE,
+                 max_workers: int = 4, scheduler: Optional[RequestScheduler] = None, fmt: str = DEFAULT_FMT,
+                 base_url: Optional[str] = None):
+        if interval <= 0:
+            raise ValueError("interval must be positive")
+        self.symbols: List[str] = list(dict.fromkeys(symbols))
+        self.exchange: str = exchange
+        self.interval: float = interval
+        self.api_key: str = api_key
+        self.session: requests.Session = _init_pooled_session(session, pool_size=max_workers)
+        self.batch_size: int = batch_size
+        self.max_workers: int = max_workers
+        self.scheduler: Optional[RequestScheduler] = scheduler
+        self.fmt: str = fmt
+        self.base_url: Optional[str] = base_url
+        # last quote of every code, None before the first poll
+        self.quotes: Optional[pd.DataFrame] = None
+        self.ticks: int = 0
+        self.missed: int = 0
+        self._stopped: threading.Event = threading.Event()
+
+    def poll(self) -> pd.DataFrame:
+        """
+            Returns the quotes that changed since the previous poll, every quote on the first one
+
+            EXCEPTIONS:
+                RemoteDataError -> raised if the quotes cannot be returned from EOD
+        """
+        quotes: Any = data.get_real_time_quotes(self.symbols, self.exchange, api_key=self.api_key,
+                                                session=self.session, batch_size=self.batch_size,
+                                                max_workers=self.max_workers, scheduler=self.scheduler,
+                                                fmt=self.fmt, base_url=self.base_url)
+        if not isinstance(quotes, pd.DataFrame):
+            raise RemoteDataError(api_key_not_authorized, "API Key Restricted, Try upgrading your API Key")
+        changed: pd.DataFrame = _changed(self.quotes, quotes)
+        self.quotes = quotes
+        return changed
+
+    def stop(self) -> None:
+        """
+            Ends the iteration, the wait for the next tick is interrupted
+        """
+        self._stopped.set()
+
+    def __iter__(self) -> Iterator[pd.DataFrame]:
+        """
+            Polls every interval seconds until stop is called, yields the changed quotes of every
+            tick that has some
+        """
+        self._stopped.clear()
+        started: float = time.monotonic()
+        tick: int = 0
+        while not self._stopped.is_set():
+            changed: pd.DataFrame = self.poll()
+            self.ticks += 1
+            if len(changed) > 0:
+                yield changed
+            # the next tick is the first one still ahead, computed from the start so delays never add up
+            next_tick: int = int((time.monotonic() - started) // self.interval) + 1
+            self.missed += max(0, next_tick - tick - 1)
+            tick = next_tick
+            if self._stopped.wait(max(0.0, started + tick * self.interval - time.monotonic())):
+                break
@@ -0,0 +1,324 @@
+import functools
+from io import StringIO
+from typing import Dict, Optional, FrozenSet, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+_EXCHANGES_DATA: str = """ID	Exchange Name	Exchange Code
+1	Munich Exchange	MU
+2	Berlin Exchange	BE
+3	Frankfurt Exchange	F
+4	Stuttgart Exchange	STU
+5	Mexican Exchange	MX
+6	Hanover Exchange	HA
+8	Australian Exchange	AU
+9	Singapore Exchange	SG
+10	Indexes	INDX
+11	USA Stocks	US
+12	Kuala Lumpur Exchange	KLSE
+13	Funds	FUND
+14	Bombay Exchange	BSE
+15	Dusseldorf Exchange	DU
+16	London Exchange	LSE
+17	Euronext Paris	PA
+18	XETRA Exchange	XETRA
+19	NSE (India)	NSE
+20	Hong Kong Exchange	HK
+21	Borsa Italiana	MI
+22	SIX Swiss Exchange	SW
+23	Hamburg Exchange	HM
+24	Toronto Exchange	TO
+25	Stockholm Exchange	ST
+26	Oslo Stock Exchange	OL
+27	Euronext Amsterdam	AS
+28	Coppenhagen Exchange	CO
+29	Euronext Lisbon	LS
+30	Korea Stock Exchange	KO
+31	Shanghai Exchange	SS
+32	Taiwan Exchange	TW
+33	Sao Paolo Exchange	SA
+34	Euronext Brussels	BR
+35	Madrid Exchange	MC
+36	Vienna Exchange	VI
+37	New Zealand Exchange	NZ
+38	FOREX	FX
+39	London IL	IL
+40	Irish Exchange	IR
+41	MICEX Russia	MCX
+42	OTC Market	OTC
+43	ETF-Euronext	NX
+44	Johannesburg Exchange	JSE"""
+
+_CURRENCIES_DATA: str = """ID	Exchange Code	Currency Code
+1	FX	USD
+2	FX	EUR
+3	FX	RUB
+4	FX	GBP
+5	FX	CNY
+6	FX	JPY
+7	FX	SGD
+8	FX	INR
+9	FX	CHF
+10	FX	AUD
+11	FX	CAD
+12	FX	HKD
+13	FX	MYR
+14	FX	NOK
+15	FX	NZD
+16	FX	ZAR
+17	FX	SEK
+18	FX	DKK
+19	FX	BRL
+20	FX	ZAC
+21	FX	MXN
+22	FX	TWD
+23	FX	KRW
+24	FX	CLP
+25	FX	CZK
+26	FX	HUF
+27	FX	IDR
+28	FX	ISK
+29	FX	MXV
+30	FX	PLN
+31	FX	TRY
+32	FX	UYU
+33	FX	BTC"""
+
+_INDEXES_DATA: str = """ID	Exchange Code	Code	Index Name
+1	INDX	GSPC	S&P 500
+2	INDX	GDAXI	DAX Index
+3	INDX	SSEC	Shanghai Composite Index (China)
+4	INDX	MERV	MERVAL Index (Argentina)
+5	INDX	FTSE	FTSE 100 Index (UK)
+6	INDX	AORD	All Ordinaries Index (Australia)
+7	INDX	BSESN	BSE 30 Sensitivity Index (SENSEX)
+8	INDX	VIX	VIX S&P 500 Volatility Index
+9	INDX	HSI	Hang Seng Index (Hong Kong)
+10	INDX	GSPTSE	S&P TSX Composite Index (Canada)
+11	INDX	FCHI	CAC 40 Index
+12	INDX	TA100	Tel Aviv 100 Index (Israel
+13	INDX	CYC	Morgan Stanley Cyclical Index
+14	INDX	IIX	Interactive Week Internet Index
+15	INDX	CMR	Morgan Stanley Consumer Index
+16	INDX	GOX	CBOE Gold Inde
+17	INDX	RTS_RS	RTSI Index
+18	INDX	GD_AT	Athens Composite Inde
+19	INDX	FTSEMIB_MI	Untitled Dataset 2015-07-13 20:00:12
+20	INDX	WILREIT	Wilshire US REIT Inde
+21	INDX	W5KMCG	Wilshire US Mid Cap Growt
+22	INDX	IBEX	IBEX 35 Index
+23	INDX	W5KLCV	Wilshire US Large Cap Valu
+24	INDX	SSMI	Swiss Market Index
+25	INDX	OEX	S&P 100 Inde
+26	INDX	RUI	Russell 1000 Inde
+27	INDX	XAX	NYSE AMEX Composite Inde
+28	INDX	WILRESI	Wilshire US Real Estate Securities Inde
+29	INDX	NZ50	NZSE 50 (New Zealand)
+30	INDX	UTY	PHLX Utility Sector Inde
+31	INDX	CSE	Colombo All Shares Index (Sri Lanka
+32	INDX	XOI	NYSE AMEX Oil Inde
+33	INDX	OSX	PHLX Oil Service Sector Inde
+34	INDX	XAL	NYSE AMEX Airline Inde
+35	INDX	W5KSCG	Wilshire US Small Cap Growt
+36	INDX	TWII	Taiwan Weighted Inde
+37	INDX	ATX	ATX Index (Austria
+38	INDX	NWX	NYSE ARCA Networking Inde
+39	INDX	W5KSCV	Wilshire US Small Cap Valu
+40	INDX	XAU	PHLX Gold/Silver Sector Inde
+41	INDX	W5KMCV	Wilshire US Mid Cap Valu
+42	INDX	WGREIT	Wilshire Global REIT Inde
+43	INDX	SML	S&P Small-Cap 600 Inde
+44	INDX	RUT	Russell 2000 Inde
+45	INDX	JKSE	Jakarta Composite Index (Indonesia
+46	INDX	BFX	Euronext BEL-20 Index (Belgium)
+47	INDX	XBD	NYSE AMEX Securities Broker/Dealer Inde
+48	INDX	RUA	Russell 3000 Inde
+49	INDX	XII	NYSE ARCA Institutional Inde
+50	INDX	IETP	ISEQ 20 Price Index (Ireland
+51	INDX	DRG	NYSE AMEX Pharmaceutical Inde
+52	INDX	W5000	Wilshire 5000 Total Market Inde
+53	INDX	HGX	PHLX Housing Sector Inde
+54	INDX	MXX	IPC Index (Mexico)
+55	INDX	W5KLCG	Wilshire US Large Cap Growt
+56	INDX	STI	Straits Times Index
+57	INDX	KS11	KOSPI Composite Index
+58	INDX	AEX	AEX Amsterdam Index
+59	INDX	NYA	NYSE Composite Index
+60	INDX	XMI	NYSE ARCA Major Market Inde
+61	INDX	BTK	NYSE AMEX Biotechnology Inde
+62	INDX	EPX	NASDAQ SIG Oil Exploration and Production Inde
+63	INDX	MID	S&P Mid-Cap 400 Inde
+64	INDX	HUI	NYSE Arca Gold Bugs Inde
+65	INDX	SOX	PHLX Semiconductor Inde
+66	INDX	HCX	CBOE S&P Healthcare Index
+67	INDX	XCI	NYSE AMEX Computer Technology Inde
+68	INDX	XNG	NYSE AMEX Natural Gas Inde
+69	INDX	RMZ	MSCI US REIT Inde
+70	INDX	WGRESI	Wilshire Global Real Estate Securities Inde
+71	INDX	N225	Nikkei 225 Index (Japan
+72	INDX	VDAX	Deutsche Boerse VDAX Volatility Inde
+73	INDX	MXY	NYSE ARCA Mexico Inde
+74	INDX	OSEAX	Oslo Exchange All Share Index (Norway)
+75	INDX	TYX	Treasury Yield 30 Years Inde
+76	INDX	DJI	Dow Jones Industrial Average
+77	INDX	AXPJ	S&P/ASX 200 Australia REIT Inde
+78	INDX	PSI20	PSI 20 Stock Index (Portugal
+79	INDX	IRX	13-week Treasury Bill Inde
+80	INDX	FVX	Treasury Yield 5 Years Inde
+81	INDX	NYI	NYSE International 100 Index
+82	INDX	AXJO	S&P/ASX 200 Index (Australia
+83	INDX	512NTR	S&P 500 GBP Hdg (Net TR) (^512NTR)
+84	INDX	CTES_VI	Czech Trading Inde
+85	INDX	NSEI	S&P/CNX Nifty Index (India
+86	INDX	NYY	NYSE TMT Inde
+87	INDX	CCSI	EGX 70 Price Index (Egypt
+88	INDX	SPSUPX	S&P Composite 1500 Inde
+89	INDX	BVSP	Bovespa Index (Brazil)
+90	INDX	ISEQ	ISEQ Overall Price Index (Ireland
+91	INDX	JPN	NYSE AMEX Japan Inde
+92	INDX	NYL	NYSE World Leaders Inde
+93	INDX	TNX	CBOE Interest Rate 10-Year T-Note Inde
+94	INDX	NY	NYSE US 100 Inde
+95	INDX	SPLV	PowerShares S&P 500 Low Volatil
+96	INDX	OMXSPI	Stockholm General Index (Sweden)
+97	INDX	GVZ	CBOE Gold Volatility Inde
+98	INDX	SPY	SPDR S&P 500 (SPY
+99	INDX	IEQR_IR	ISEQ General Total Return Index (Ireland
+100	INDX	OMXC20_CO	OMX Copenhagen 20 Index
+101	INDX	DJUSFN	^DJUSFN: Dow Jones U.S. Financials Inde
+102	INDX	DJASD	^DJASD: Dow Jones Asia Select Dividen
+103	INDX	IMUS	^IMUS: Dow Jones Islamic Market U.S.
+104	INDX	W1SGI	^W1SGI: Dow Jones Sustainability Worl
+105	INDX	DJT	^DJT: Dow Jones Transportation Averag
+106	INDX	DJUSM	^DJUSM: Dow Jones U.S. Mid-Cap Inde
+107	INDX	W1XGA	^W1XGA: Dow Jones Sustainability Worl
+108	INDX	DWC	^DWC: DJUS Market Index (full-cap
+109	INDX	DJC	^DJC: Dow Jones-UBS Commodity Inde
+110	INDX	IMXL	^IMXL: Dow Jones Islamic Market Titan
+111	INDX	XLHK	^XLHK: Dow Jones Hong Kong Titans 30
+112	INDX	DJTMDI	^DJTMDI: Dow Jones Media Titans 30 Inde
+113	INDX	DJU	^DJU: Dow Jones Utility Averag
+114	INDX	DWCOGS	^DWCOGS: Dow Jones U.S. Oil & Gas Tota
+115	INDX	DJUSST	^DJUSST: Dow Jones U.S. Iron & Steel In
+116	INDX	PSE	^PSE: NYSE Arca Tech 100 Index - New York Stock Exchange
+117	INDX	DWCF	^DWCF: Dow Jones U.S. Total Stock Mar
+118	INDX	W1SUS	^W1SUS: Dow Jones Sustainability Worl
+119	INDX	DJASDT	^DJASDT: Dow Jones Asia Select Dividen
+120	INDX	RCI	^RCI: Dow Jones Composite All REIT I
+121	INDX	DJUSL	^DJUSL: Dow Jones U.S. Large-Cap Inde
+122	INDX	P1DOW	^P1DOW: Dow Jones Asia/Pacific Inde
+123	INDX	DJAT	^DJAT: Dow Jones Asian Titans 50 Inde
+124	INDX	DJUS	^DJUS: Dow Jones U.S. Inde
+125	INDX	DWMI	^DWMI: Dow Jones U.S. Micro-Cap Tota
+126	INDX	DJUSS	^DJUSS: Dow Jones U.S. Small-Cap Inde
+127	INDX	OMX	OMXS 30 Index (Sweden
+128	INDX	STOXX50E	EuroStoxx 50 Inde
+129	INDX	FTAS	FTSE All-Share Index (UK)
+130	INDX	WIHUN_L	FTSE HUngary Index
+131	INDX	WITUR_L	FTSE Turkey Index
+132	INDX	WITHA_L	FTSE Thailand Index
+133	INDX	WIPOL_L	FTSE Poland Index
+134	INDX	WICZH_L	FTSE Czech Republic Index
+135	INDX	OMXC20	OMX Copenhagen 20 Inde
+136	INDX	IXE	^IXE: Select Sector Spdr-energy Inde
+137	INDX	IXIC	NASDAQ Composite
+138	INDX	SPEUP	S&P EUROPE 350"""
+
+
+def _rows(data: str) -> Dict[str, Dict[str, str]]:
+    """
+        Returns {column: {ID: value}} from an embedded tab separated table, without pandas
+    """
+    lines = data.split("\n")
+    header = lines[0].split("\t")
+    columns: Dict[str, Dict[str, str]] = {column: {} for column in header[1:]}
+    for line in lines[1:]:
+        fields = line.split("\t")
+        for column, value in zip(header[1:], fields[1:]):
+            columns[column][fields[0]] = value
+    return columns
+
+
+@functools.lru_cache(maxsize=None)
+def _table(data: str) -> "pd.DataFrame":
+    """
+        Returns the DataFrame of an embedded table, parsed once then cached
+    """
+    import pandas as pd
+    return pd.read_csv(StringIO(data), sep="\t").set_index("ID")
+
+
+@functools.lru_cache(maxsize=None)
+def _exchange_names() -> Dict[str, str]:
+    rows = _rows(_EXCHANGES_DATA)
+    return {code: rows["Exchange Name"][i] for i, code in rows["Exchange Code"].items()}
+
+
+@functools.lru_cache(maxsize=None)
+def _index_exchanges() -> Dict[str, str]:
+    rows = _rows(_INDEXES_DATA)
+    return {code: rows["Exchange Code"][i] for i, code in rows["Code"].items()}
+
+
+@functools.lru_cache(maxsize=None)
+def _currency_codes() -> FrozenSet[str]:
+    return frozenset(_rows(_CURRENCIES_DATA)["Currency Code"].values())
+
+
+def get_exchanges() -> "pd.DataFrame":
+    """
+    Returns list of exchanges
+    https://eodhistoricaldata.com/knowledgebase/list-supported-exchanges/
+
+    NOTE the table is parsed once, every call returns a copy of it
+    """
+    return _table(_EXCHANGES_DATA).copy()
+
+
+def get_currencies() -> "pd.DataFrame":
+    """
+    Returns list of supported currencies
+    https://eodhistoricaldata.com/knowledgebase/list-supported-currencies/
+
+    NOTE the table is parsed once, every call returns a copy of it
+    """
+    return _table(_CURRENCIES_DATA).copy()
+
+
+def get_indexes() -> "pd.DataFrame":
+    """
+    Returns list of supported indexes
+    https://eodhistoricaldata.com/knowledgebase/list-supported-indexes/
+
+    NOTE the table is parsed once, every call returns a copy of it
+    """
+    return _table(_INDEXES_DATA).copy()
+
+
+def get_exchange_name(exchange_code: str) -> Optional[str]:
+    """
+        Returns the name of a supported exchange, None if exchange_code is not supported
+    """
+    return _exchange_names().get(exchange_code)
+
+
+def is_supported_exchange(exchange_code: str) -> bool:
+    """
+        Returns True if exchange_code is a supported exchange
+    """
+    return exchange_code in _exchange_names()
+
+
+def get_index_exchange(index_code: str) -> Optional[str]:
+    """
+        Returns the exchange code of a supported index, None if index_code is not supported
+    """
+    return _index_exchanges().get(index_code)
+
+
+def is_supported_currency(currency_code: str) -> bool:
+    """
+        Returns True if currency_code is a supported currency
+    """
+    return currency_code in _currency_codes()
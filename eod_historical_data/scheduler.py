@@ -0,0 +1,314 @@
+import random
+import threading
+import time
+from contextlib import asynccontextmanager
+from email.utils import parsedate_to_datetime
+from typing import Optional, Dict, Tuple, Union, Callable, Mapping, AsyncIterator, Any, TYPE_CHECKING
+
+import requests
+
+from ._utils import RemoteDataError, _url, _accept_encoding
+from .instrumentation import RequestEvent
+
+if TYPE_CHECKING:
+    import aiohttp as io
+
+Timeout_Type = Optional[Union[float, Tuple[float, float]]]
+
+# status codes worth retrying, 429 is the API quota being exceeded
+RETRY_STATUSES: Tuple[int, ...] = (429, 500, 502, 503, 504)
+
+
+class TokenBucket:
+    """
+        **TokenBucket**
+            thread safe token bucket, tokens are reserved ahead of time so callers only need
+            to sleep for the delay returned by reserve, either with time.sleep or asyncio.sleep
+
+        PARAMETERS
+            rate: (float) -> tokens added per second
+            capacity: (float) -> maximum number of tokens saved up for a burst
+    """
+
+    def __init__(self, rate: float, capacity: float = 1.0, clock: Callable[[], float] = time.monotonic):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.rate: float = rate
+        self.capacity: float = capacity
+        self._clock: Callable[[], float] = clock
+        self._tokens: float = capacity
+        self._updated: float = clock()
+        self._lock = threading.Lock()
+
+    def __getstate__(self) -> Dict[str, Any]:
+        return {"rate": self.rate, "capacity": self.capacity, "clock": self._clock}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        # clock readings of another process mean nothing here, the bucket starts full
+        self.__init__(state["rate"], state["capacity"], state["clock"])
+
+    def reserve(self) -> float:
+        """
+            Takes one token and returns the number of seconds to wait before using it
+        """
+        with self._lock:
+            now: float = self._clock()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+
+def _wire_bytes(response: "io.ClientResponse", body: bytes) -> int:
+    """
+        Returns the number of body bytes received before decompression
+    """
+    # total_raw_bytes is only available from aiohttp 3.12
+    total: Optional[int] = getattr(response.content, "total_raw_bytes", None)
+    if total is not None:
+        return total
+    return int(response.headers.get("Content-Length", len(body)))
+
+
+def _retry_after(headers: Mapping[str, str]) -> Optional[float]:
+    """
+        Returns the delay in seconds requested by a Retry-After header, if any
+    """
+    value: Optional[str] = headers.get("Retry-After")
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class AsyncResponse:
+    """
+        Status, reason, headers and decompressed body of a response read by RequestScheduler.get_async,
+        the body is kept as bytes, text decodes it on demand
+    """
+
+    def __init__(self, status: int, reason: Optional[str], headers: Mapping[str, str], body: bytes,
+                 encoding: str = "utf-8"):
+        self.status: int = status
+        self.reason: Optional[str] = reason
+        self.headers: Mapping[str, str] = headers
+        self.body: bytes = body
+        self.encoding: str = encoding
+
+    @property
+    def text(self) -> str:
+        return self.body.decode(self.encoding, errors="replace")
+
+
+class RequestScheduler:
+    """
+        **RequestScheduler**
+            sends every request of the endpoints, spacing them to respect the API quota and
+            retrying with exponential backoff and jitter on 429, 5xx, connection errors and timeouts
+
+        USAGE
+            scheduler = RequestScheduler(requests_per_minute=1000)
+            df = get_eod_data("AAPL", "US", start, end, scheduler=scheduler)
+            # or for every call not given a scheduler
+            eod_historical_data.scheduler.default_scheduler = scheduler
+
+        PARAMETERS
+            requests_per_minute: (float) -> quota of the API plan, None disables rate limiting
+            burst: (int) -> number of requests that may be sent back to back, the refill rate is lowered
+                accordingly so no 60 seconds window ever exceeds requests_per_minute
+            max_retries: (int) -> number of retries after the first attempt
+            backoff_factor: (float) -> base delay in seconds, attempt n waits up to backoff_factor * 2 ** n
+            max_backoff: (float) -> maximum delay in seconds between two attempts
+            timeout: (float or (connect, read) tuple) -> timeout in seconds of every attempt, None waits forever
+            retry_statuses: (tuple of int) -> status codes retried
+    """
+
+    def __init__(self, requests_per_minute: Optional[float] = None, burst: int = 1, max_retries: int = 3,
+                 backoff_factor: float = 0.5, max_backoff: float = 30.0, timeout: Timeout_Type = (10.0, 60.0),
+                 retry_statuses: Tuple[int, ...] = RETRY_STATUSES):
+        if requests_per_minute is not None and requests_per_minute <= burst:
+            raise ValueError("requests_per_minute must be greater than burst")
+        if max_retries < 0:
+            raise ValueError("max_retries must be positive or zero")
+        self.requests_per_minute: Optional[float] = requests_per_minute
+        self.bucket: Optional[TokenBucket] = None if requests_per_minute is None else \
+            TokenBucket(rate=(requests_per_minute - burst) / 60.0, capacity=burst)
+        self.max_retries: int = max_retries
+        self.backoff_factor: float = backoff_factor
+        self.max_backoff: float = max_backoff
+        self.timeout: Timeout_Type = timeout
+        self.retry_statuses: Tuple[int, ...] = tuple(retry_statuses)
+
+    def backoff(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """
+            Returns the delay in seconds before retry number attempt (starting at 0), full jitter
+            is used so concurrent workers do not retry in lockstep, Retry-After is a lower bound
+        """
+        delay: float = random.uniform(0, min(self.max_backoff, self.backoff_factor * 2 ** attempt))
+        return delay if retry_after is None else max(delay, min(retry_after, self.max_backoff))
+
+    def _aiohttp_timeout(self, session: "io.ClientSession") -> "io.ClientTimeout":
+        """
+            Returns the timeout of one attempt, the total timeout of the session still applies on top
+            of the connect and read timeouts of the scheduler
+        """
+        import aiohttp as io
+        total: Optional[float] = session.timeout.total
+        if self.timeout is None:
+            return io.ClientTimeout(total=total)
+        if isinstance(self.timeout, tuple):
+            return io.ClientTimeout(total=total, sock_connect=self.timeout[0], sock_read=self.timeout[1])
+        return io.ClientTimeout(total=total, sock_connect=self.timeout, sock_read=self.timeout)
+
+    @staticmethod
+    def _give_up(error: Exception, url: str, params: Dict[str, str]) -> RemoteDataError:
+        # replacing api token so it does not show in error messages
+        params = dict(params, api_token="API TOKEN IS SECRET")
+        return RemoteDataError(None, f"{type(error).__name__}: {error}", _url(url, params))
+
+    def get(self, session: requests.Session, url: str, params: Dict[str, str],
+            event: Optional[RequestEvent] = None, **kwargs) -> requests.Response:
+        """
+            Returns the response of a GET request, the last response is returned when every attempt
+            got a retried status, event records the status, retries, bytes and timings,
+            gzip, deflate (and br when a brotli decoder is installed) are accepted, headers
+            given in kwargs are sent as well
+
+            EXCEPTIONS:
+                RemoteDataError -> raised when every attempt failed to connect or timed out
+        """
+        kwargs["headers"] = {"Accept-Encoding": _accept_encoding(), **(kwargs.get("headers") or {})}
+        attempt: int = 0
+        while True:
+            if self.bucket is not None:
+                time.sleep(self.bucket.reserve())
+            if event is not None:
+                event.url, event.retries = url, attempt
+            started: float = time.perf_counter()
+            try:
+                r: requests.Response = session.get(url, params=params, timeout=self.timeout, **kwargs)
+            except (requests.ConnectionError, requests.Timeout, requests.exceptions.ChunkedEncodingError) as e:
+                if attempt >= self.max_retries:
+                    raise self._give_up(e, url, params) from e
+                time.sleep(self.backoff(attempt))
+            else:
+                if event is not None:
+                    self._record(event, r, time.perf_counter() - started, streamed=kwargs.get("stream", False))
+                if r.status_code not in self.retry_statuses or attempt >= self.max_retries:
+                    return r
+                time.sleep(self.backoff(attempt, _retry_after(r.headers)))
+                r.close()
+            attempt += 1
+
+    @staticmethod
+    def _record(event: RequestEvent, r: requests.Response, elapsed: float, streamed: bool) -> None:
+        # elapsed of requests stops once the response headers are parsed
+        wait: float = min(elapsed, r.elapsed.total_seconds())
+        event.status = r.status_code
+        event.add_time("wait", wait)
+        if not streamed:
+            event.add_time("download", elapsed - wait)
+            event.bytes += len(r.content)
+            # the urllib3 response counts the bytes read from the socket, before decompression
+            event.wire_bytes += r.raw.tell() if hasattr(r.raw, "tell") else len(r.content)
+
+    async def get_async(self, session: "io.ClientSession", url: str, params: Dict[str, str],
+                        event: Optional[RequestEvent] = None,
+                        headers: Optional[Dict[str, str]] = None) -> AsyncResponse:
+        """
+            Asynchronous get, the body is read before the connection is released, event records
+            the status, retries, bytes and download time, the session must be created with
+            instrumentation._trace_config() for dns, connect and wait to be measured, headers are
+            sent with the Accept-Encoding one
+
+            EXCEPTIONS:
+                RemoteDataError -> raised when every attempt failed to connect or timed out
+        """
+        import asyncio
+        import aiohttp as io
+        headers = {"Accept-Encoding": _accept_encoding(), **(headers or {})}
+        attempt: int = 0
+        while True:
+            if self.bucket is not None:
+                await asyncio.sleep(self.bucket.reserve())
+            if event is not None:
+                event.url, event.retries = url, attempt
+            try:
+                async with session.get(url, params=params, timeout=self._aiohttp_timeout(session), headers=headers,
+                                       trace_request_ctx=event) as response:
+                    if response.status not in self.retry_statuses or attempt >= self.max_retries:
+                        started: float = time.perf_counter()
+                        body: bytes = await response.read()
+                        if event is not None:
+                            event.status = response.status
+                            event.bytes += len(body)
+                            event.wire_bytes += _wire_bytes(response, body)
+                            event.add_time("download", time.perf_counter() - started)
+                        return AsyncResponse(response.status, response.reason, response.headers, body,
+                                             response.get_encoding() if len(body) > 0 else "utf-8")
+                    if event is not None:
+                        event.status = response.status
+                    delay: float = self.backoff(attempt, _retry_after(response.headers))
+            except (io.ClientConnectionError, io.ClientPayloadError, asyncio.TimeoutError) as e:
+                if attempt >= self.max_retries:
+                    raise self._give_up(e, url, params) from e
+                delay = self.backoff(attempt)
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    @asynccontextmanager
+    async def stream_async(self, session: "io.ClientSession", url: str, params: Dict[str, str],
+                           event: Optional[RequestEvent] = None) -> AsyncIterator["io.ClientResponse"]:
+        """
+            Asynchronous context manager yielding the response with its body still unread, so it can
+            be consumed line by line, only the attempts before the body is read are retried
+
+            EXCEPTIONS:
+                RemoteDataError -> raised when every attempt failed to connect or timed out
+        """
+        import asyncio
+        import aiohttp as io
+        headers: Dict[str, str] = {"Accept-Encoding": _accept_encoding()}
+        attempt: int = 0
+        while True:
+            if self.bucket is not None:
+                await asyncio.sleep(self.bucket.reserve())
+            if event is not None:
+                event.url, event.retries = url, attempt
+            try:
+                response: io.ClientResponse = await session.get(url, params=params,
+                                                                timeout=self._aiohttp_timeout(session),
+                                                                headers=headers, trace_request_ctx=event)
+            except (io.ClientConnectionError, asyncio.TimeoutError) as e:
+                if attempt >= self.max_retries:
+                    raise self._give_up(e, url, params) from e
+                delay: float = self.backoff(attempt)
+            else:
+                if event is not None:
+                    event.status = response.status
+                if response.status not in self.retry_statuses or attempt >= self.max_retries:
+                    break
+                delay = self.backoff(attempt, _retry_after(response.headers))
+                response.release()
+            await asyncio.sleep(delay)
+            attempt += 1
+        try:
+            yield response
+        finally:
+            response.release()
+
+
+# used by every endpoint called without a scheduler
+default_scheduler: RequestScheduler = RequestScheduler()
+
+
+def _get_scheduler(scheduler: Optional[RequestScheduler]) -> RequestScheduler:
+    return default_scheduler if scheduler is None else scheduler
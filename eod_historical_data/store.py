@@ -0,0 +1,213 @@
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import timedelta
+from typing import Optional, List, Tuple, Iterator, Sequence
+
+import pandas as pd
+import requests
+
+from ._parsers import DEFAULT_ENGINE
+from ._utils import _sanitize_dates
+from . import data
+
+Range_Type = Tuple[pd.Timestamp, pd.Timestamp]
+
+# EOD column name -> sqlite column name
+_COLUMNS: Tuple[Tuple[str, str], ...] = (("Open", "open"), ("High", "high"), ("Low", "low"), ("Close", "close"),
+                                         ("Adjusted_close", "adjusted_close"), ("Volume", "volume"))
+
+_SCHEMA: str = """
+CREATE TABLE IF NOT EXISTS prices (
+    symbol TEXT NOT NULL,
+    exchange TEXT NOT NULL,
+    date TEXT NOT NULL,
+    open REAL,
+    high REAL,
+    low REAL,
+    close REAL,
+    adjusted_close REAL,
+    volume INTEGER,
+    PRIMARY KEY (symbol, exchange, date)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS coverage (
+    symbol TEXT NOT NULL,
+    exchange TEXT NOT NULL,
+    start TEXT NOT NULL,
+    end TEXT NOT NULL,
+    PRIMARY KEY (symbol, exchange, start)
+) WITHOUT ROWID;
+"""
+
+
+def _day(dt) -> pd.Timestamp:
+    return pd.Timestamp(dt).normalize()
+
+
+def _iso(dt: pd.Timestamp) -> str:
+    return dt.strftime("%Y-%m-%d")
+
+
+def _merge_ranges(ranges: List[Range_Type]) -> List[Range_Type]:
+    """
+        Returns sorted ranges with overlapping or adjacent ranges merged
+    """
+    merged: List[Range_Type] = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1] + timedelta(days=1):
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+class HistoryStore:
+    """
+        **HistoryStore**
+            persistent SQLite store of End oF Day Data remembering which date ranges it holds
+            for every symbol, only the missing ranges are downloaded from EOD
+
+        USAGE
+            store = HistoryStore("eod.sqlite")
+            df = store.get_eod_data("AAPL", "US", start="2000-01-01", end=date.today(), api_key=api_key)
+
+        PARAMETERS
+            path: (str) -> sqlite database file, created if it does not exist
+            settle_days: (int) -> ranges ending less than settle_days ago are fetched again on the
+                next call, the EOD row of the current day may not be final yet
+    """
+
+    def __init__(self, path: str, settle_days: int = 1):
+        self.path: str = path
+        self.settle_days: int = settle_days
+        self._lock = threading.Lock()
+        with self._connect() as connection:
+            connection.executescript(_SCHEMA)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """
+            Yields a connection committed on success, rolled back on error and always closed
+        """
+        connection: sqlite3.Connection = sqlite3.connect(self.path)
+        try:
+            with connection:
+                yield connection
+        finally:
+            connection.close()
+
+    @staticmethod
+    def _covered(connection: sqlite3.Connection, symbol: str, exchange: str) -> List[Range_Type]:
+        rows = connection.execute("SELECT start, end FROM coverage WHERE symbol = ? AND exchange = ? "
+                                  "ORDER BY start", (symbol, exchange)).fetchall()
+        return [(pd.Timestamp(start), pd.Timestamp(end)) for start, end in rows]
+
+    def covered(self, symbol: str, exchange: str) -> List[Range_Type]:
+        """
+            Returns the sorted (start, end) date ranges, both inclusive, held for the symbol
+        """
+        with self._connect() as connection:
+            return self._covered(connection, symbol, exchange)
+
+    def missing(self, symbol: str, exchange: str, start, end) -> List[Range_Type]:
+        """
+            Returns the (start, end) date ranges, both inclusive, that must be downloaded
+            to hold every day between start and end
+        """
+        start, end = _sanitize_dates(start, end)
+        start, end = _day(start), _day(end)
+        gaps: List[Range_Type] = []
+        cursor: pd.Timestamp = start
+        for covered_start, covered_end in self.covered(symbol, exchange):
+            if covered_end < cursor:
+                continue
+            if covered_start > end:
+                break
+            if covered_start > cursor:
+                gaps.append((cursor, covered_start - timedelta(days=1)))
+            cursor = covered_end + timedelta(days=1)
+            if cursor > end:
+                break
+        if cursor <= end:
+            gaps.append((cursor, end))
+        return gaps
+
+    def _settled(self) -> pd.Timestamp:
+        return _day(pd.Timestamp.today()) - timedelta(days=self.settle_days)
+
+    @staticmethod
+    def _insert(connection: sqlite3.Connection, symbols: Sequence[str], exchange: str, dates: pd.DatetimeIndex,
+                df: pd.DataFrame) -> None:
+        columns: List[str] = [column for column, _ in _COLUMNS]
+        frame: pd.DataFrame = df.reindex(columns=columns)
+        rows = zip(symbols, [exchange] * len(frame), dates.strftime("%Y-%m-%d"),
+                   *[frame[column].astype(object).where(frame[column].notna(), None) for column in columns])
+        connection.executemany(f"INSERT OR REPLACE INTO prices VALUES ({', '.join(['?'] * 9)})", rows)
+
+    def _cover(self, connection: sqlite3.Connection, symbol: str, exchange: str, start: pd.Timestamp,
+               end: pd.Timestamp) -> None:
+        ranges: List[Range_Type] = _merge_ranges(self._covered(connection, symbol, exchange) + [(start, end)])
+        connection.execute("DELETE FROM coverage WHERE symbol = ? AND exchange = ?", (symbol, exchange))
+        connection.executemany("INSERT INTO coverage VALUES (?, ?, ?, ?)",
+                               [(symbol, exchange, _iso(s), _iso(e)) for s, e in ranges])
+
+    def write(self, symbol: str, exchange: str, df: pd.DataFrame, start, end) -> None:
+        """
+            Stores End oF Day Data rows of df and records [start, end] as held for the symbol,
+            existing rows for the same dates are replaced
+        """
+        start, end = _sanitize_dates(start, end)
+        start, end = _day(start), min(_day(end), self._settled())
+        with self._lock, self._connect() as connection:
+            self._insert(connection, [symbol] * len(df), exchange, pd.DatetimeIndex(df.index), df)
+            if start <= end:
+                self._cover(connection, symbol, exchange, start, end)
+
+    def write_bulk(self, exchange: str, df: pd.DataFrame) -> None:
+        """
+            Stores one row per symbol of a DataFrame indexed by Code with a Date column, as returned by
+            get_eod_bulk_last_day, in a single transaction, the day of each row is recorded as held
+            for its symbol
+        """
+        dates: pd.DatetimeIndex = pd.DatetimeIndex(df["Date"]).normalize()
+        settled: pd.Timestamp = self._settled()
+        with self._lock, self._connect() as connection:
+            self._insert(connection, list(df.index), exchange, dates, df)
+            for symbol, day in zip(df.index, dates):
+                if day <= settled:
+                    self._cover(connection, symbol, exchange, day, day)
+
+    def read(self, symbol: str, exchange: str, start, end) -> pd.DataFrame:
+        """
+            Returns stored End oF Day Data between start and end, shaped like get_eod_data
+        """
+        start, end = _sanitize_dates(start, end)
+        names: str = ", ".join(name for _, name in _COLUMNS)
+        with self._connect() as connection:
+            df: pd.DataFrame = pd.read_sql_query(f"SELECT date, {names} FROM prices WHERE symbol = ? AND "
+                                                 f"exchange = ? AND date BETWEEN ? AND ? ORDER BY date",
+                                                 connection, params=(symbol, exchange, _iso(_day(start)),
+                                                                     _iso(_day(end))))
+        df.columns = ["Date"] + [column for column, _ in _COLUMNS]
+        df["Date"] = pd.to_datetime(df["Date"], format="%Y-%m-%d")
+        return df.set_index("Date")
+
+    def get_eod_data(self, symbol: str, exchange: str, start: data.Start_END_Type = None,
+                     end: data.Start_END_Type = None, api_key: str = data.EOD_HISTORICAL_DATA_API_KEY_DEFAULT,
+                     session: Optional[requests.Session] = None,
+                     engine: str = DEFAULT_ENGINE) -> Optional[pd.DataFrame]:
+        """
+            **get_eod_data**
+                same as data.get_eod_data but only the date ranges missing from the store are
+                downloaded, then merged into the store before the requested range is returned
+
+            returns -> DataFrame containing End oF Day Data for the Symbol, or sentinel / None
+                when a missing range could not be downloaded
+        """
+        for gap_start, gap_end in self.missing(symbol, exchange, start, end):
+            df: Optional[pd.DataFrame] = data.get_eod_data(symbol, exchange, start=gap_start, end=gap_end,
+                                                           api_key=api_key, session=session, engine=engine)
+            if not isinstance(df, pd.DataFrame):
+                return df
+            self.write(symbol, exchange, df, gap_start, gap_end)
+        return self.read(symbol, exchange, start, end)
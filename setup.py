@@ -56,16 +56,18 @@ setup(
         'Intended Audience :: Financial and Insurance Industry',
         'Programming Language :: Cython',
         'Programming Language :: Python',
-        'Programming Language :: Python :: 3.5',
-        'Programming Language :: Python :: 3.6',
+        'Programming Language :: Python :: 3.7',
+        'Programming Language :: Python :: 3.8',
         'Topic :: Scientific/Engineering',
         'Topic :: Office/Business :: Financial',
         'License :: OSI Approved :: MIT License',
     ],
 
     keywords='python trading data stock index',
+    # contextlib.asynccontextmanager, used by the asynchronous scheduler, is new in 3.7
+    python_requires='>=3.7',
     install_requires=install_requires,
-    packages=find_packages(exclude=["contrib", "docs", "tests*"]),
+    packages=find_packages(exclude=["contrib", "docs", "tests*", "benchmarks*"]),
     test_suite="tests",
     tests_require=tests_require,
     zip_safe=False,
@@ -0,0 +1,59 @@
+from io import BytesIO
+from typing import Callable, Dict, Optional, Tuple
+from urllib.parse import urlsplit, parse_qsl
+import threading
+
+import requests
+from requests.adapters import BaseAdapter
+
+Route_Type = Callable[[str, Dict[str, str]], Tuple]
+
+EOD_CSV: bytes = b"""Date,Open,High,Low,Close,Adjusted_close,Volume
+2020-02-03,304.3,313.49,302.22,308.66,76.6,43496401
+2020-02-04,315.31,319.64,313.63,318.85,79.13,34154134
+2020-02-05,323.52,324.76,318.95,321.45,79.77,29706718
+2020-02-06,322.57,325.22,320.26,325.21,80.71,26356385
+2020-02-07,322.37,323.4,318,320.03,79.61,29421012
+"""
+
+
+class FakeAdapter(BaseAdapter):
+    """
+        Transport adapter answering requests from a route function instead of the network,
+        route receives (path, query params) and returns (status code, body) or (status code,
+        body, response headers), the headers of every request are kept in request_headers
+    """
+
+    def __init__(self, route: Route_Type):
+        super().__init__()
+        self.route: Route_Type = route
+        self.calls: list = []
+        self.request_headers: list = []
+        self._lock = threading.Lock()
+
+    def send(self, request, **kwargs) -> requests.Response:
+        parts = urlsplit(request.url)
+        params: Dict[str, str] = dict(parse_qsl(parts.query))
+        with self._lock:
+            self.calls.append((parts.path, params))
+            self.request_headers.append(dict(request.headers))
+        status, body, *headers = self.route(parts.path, params)
+        r: requests.Response = requests.Response()
+        r.status_code = status
+        r.headers.update(*headers)
+        r.reason = requests.status_codes._codes[status][0].upper()
+        r.raw = BytesIO(body)
+        r.url = request.url
+        r.request = request
+        return r
+
+    def close(self):
+        pass
+
+
+def fake_session(route: Route_Type, session: Optional[requests.Session] = None) -> requests.Session:
+    session = requests.Session() if session is None else session
+    adapter: FakeAdapter = FakeAdapter(route)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
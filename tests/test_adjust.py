@@ -0,0 +1,71 @@
+import numpy as np
+import pandas as pd
+from eod_historical_data import adjust_prices, adjust_panel
+from eod_historical_data.adjust import _split_ratios
+from eod_historical_data.panel import _assemble_panel
+
+# no freq, as the index of parsed End oF Day Data
+DATES = pd.DatetimeIndex(pd.bdate_range("2020-08-03", "2020-09-04").to_numpy(), name="Date")
+
+
+def raw_prices(seed=0, scale=1.0):
+    """
+        Returns raw End oF Day Data with a 4 for 1 split on 2020-08-31 and the Adjusted_close EOD
+        would compute for a 0.82 (raw) dividend with ex-date 2020-08-07, by a per row loop
+    """
+    rng = np.random.default_rng(seed)
+    close = scale * 400 * np.cumprod(1 + rng.normal(0, 0.01, len(DATES)))
+    split_row = DATES.get_loc(pd.Timestamp("2020-08-31"))
+    close[split_row:] /= 4
+    volume = rng.integers(10 ** 6, 10 ** 7, len(DATES)).astype("int64")
+    volume[split_row:] *= 4
+    df = pd.DataFrame({"Open": close * 0.99, "High": close * 1.01, "Low": close * 0.98, "Close": close},
+                      index=DATES)
+    adjusted = close.copy()
+    dividend_row = DATES.get_loc(pd.Timestamp("2020-08-07"))
+    for row in range(len(DATES)):
+        if row < split_row:
+            adjusted[row] /= 4
+        if row < dividend_row:
+            adjusted[row] *= 1 - 0.82 / close[dividend_row - 1]
+    df["Adjusted_close"] = adjusted
+    df["Volume"] = volume
+    return df
+
+
+DIVIDENDS = pd.Series([0.205], index=pd.DatetimeIndex(["2020-08-07"], name="Date"), name="Dividends")
+SPLITS = pd.Series(["4.000000/1.000000"], index=pd.DatetimeIndex(["2020-08-31"]))
+
+
+def test_adjust_matches_adjusted_close():
+    prices = raw_prices()
+    df = adjust_prices(prices, DIVIDENDS, SPLITS)
+    np.testing.assert_allclose(df["Close"], prices["Adjusted_close"], rtol=1e-12)
+    assert list(df.columns) == ["Open", "High", "Low", "Close", "Adjusted_close", "Volume", "Total_return"]
+    # split-adjusted volume, the traded value does not jump on the split
+    assert (df["Volume"].iloc[:18] == prices["Volume"].iloc[:18] * 4).all()
+    assert df["Total_return"].iloc[0] == 1.0
+    pd.testing.assert_series_equal(df["Adjusted_close"], prices["Adjusted_close"])
+
+    raw_dividends = DIVIDENDS * 4
+    np.testing.assert_allclose(adjust_prices(prices, raw_dividends, SPLITS, dividends_adjusted=False)["Close"],
+                               prices["Adjusted_close"], rtol=1e-12)
+
+
+def test_adjust_panel_handles_many_symbols():
+    frames = {"A": raw_prices(0), "B": raw_prices(1, scale=0.5).iloc[2:], "C": raw_prices(2)}
+    panel = _assemble_panel(frames, ["Close", "Volume"])
+    adjusted = adjust_panel(panel, dividends={"A": DIVIDENDS, "B": DIVIDENDS},
+                            splits={"A": SPLITS, "B": pd.Series([4.0], index=SPLITS.index), "C": SPLITS})
+    for symbol in ["A", "B"]:
+        np.testing.assert_allclose(adjusted["Close"][symbol].dropna(), frames[symbol]["Adjusted_close"],
+                                   rtol=1e-12)
+    # C only splits
+    np.testing.assert_allclose(adjusted["Close"]["C"].iloc[:18], frames["C"]["Close"].iloc[:18] / 4)
+    assert np.isnan(adjusted["Close"]["B"].iloc[0]) and adjusted["Total_return"]["B"].iloc[2] == 1.0
+    assert adjusted["Price_factor"].iloc[-1].tolist() == [1.0, 1.0, 1.0]
+
+
+def test_split_ratios():
+    assert _split_ratios(pd.Series(["2/1", "1.000000/10.000000", "3"])).tolist() == [2.0, 0.1, 3.0]
+    assert _split_ratios(pd.Series([2, 4])).tolist() == [2.0, 4.0]
@@ -0,0 +1,105 @@
+import asyncio
+from unittest.mock import sentinel
+import pandas as pd
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from eod_historical_data import AsyncEODClient, ResponseCache, RequestScheduler, data, get_eod_data
+from eod_historical_data._utils import RemoteDataError
+from ._helpers import EOD_CSV, fake_session
+
+
+async def eod(request):
+    symbol = request.match_info["symbol"]
+    if symbol == "DENIED.US":
+        return web.Response(status=403)
+    if symbol == "MISSING.US":
+        return web.Response(status=404)
+    if symbol == "SLOW.US":
+        await asyncio.sleep(2)
+    return web.Response(body=EOD_CSV, content_type="text/csv")
+
+
+async def bulk(request):
+    assert request.query["date"] == "2020-02-07"
+    return web.Response(body=b"Code,Ex,Date,Open,High,Low,Close,Adjusted_close,Volume\n"
+                             b"AAPL,US,2020-02-07,322.37,323.4,318,320.03,79.61,29421012\n", content_type="text/csv")
+
+
+async def dividends(request):
+    return web.Response(text="Date,Dividends\n2020-02-07,0.77\n", content_type="text/csv")
+
+
+def run_with_server(coroutine_function):
+    async def main():
+        app = web.Application()
+        app.router.add_get("/api/eod/{symbol}", eod)
+        app.router.add_get("/api/div/{symbol}", dividends)
+        app.router.add_get("/api/eod-bulk-last-day/{exchange}", bulk)
+        server = TestServer(app)
+        await server.start_server()
+        try:
+            return await coroutine_function(str(server.make_url("/api")))
+        finally:
+            await server.close()
+
+    return asyncio.run(main())
+
+
+def test_async_client_shares_one_session(monkeypatch):
+    async def fetch(url):
+        monkeypatch.setattr(data, "EOD_HISTORICAL_DATA_API_URL", url)
+        async with AsyncEODClient(api_key="key", limit=4) as client:
+            session = client._session
+            frames = await asyncio.gather(*[client.get_eod_data(symbol, "US", "2020-02-01", "2020-02-10")
+                                            for symbol in ["AAPL", "MSFT", "IBM", "DENIED"]])
+            assert client._session is session
+            ts = await client.get_dividends("AAPL", "US", "2020-02-01", "2020-02-10")
+            with pytest.raises(RemoteDataError):
+                await client.get_eod_data("MISSING", "US", "2020-02-01", "2020-02-10")
+        assert client.closed
+        return frames, ts
+
+    frames, ts = run_with_server(fetch)
+    assert [len(df) for df in frames[:3]] == [5, 5, 5]
+    assert frames[0].index.name == "Date"
+    assert frames[3] is sentinel
+    assert ts.iloc[0] == 0.77
+
+
+def test_async_client_timeout_applies_to_every_request(monkeypatch):
+    async def fetch(url):
+        monkeypatch.setattr(data, "EOD_HISTORICAL_DATA_API_URL", url)
+        async with AsyncEODClient(api_key="key", timeout=0.3, scheduler=RequestScheduler(max_retries=0)) as client:
+            started = asyncio.get_running_loop().time()
+            with pytest.raises(RemoteDataError):
+                await client.get_eod_data("SLOW", "US", "2020-02-01", "2020-02-10")
+            return asyncio.get_running_loop().time() - started
+
+    # the read timeout of the scheduler does not lift the total timeout of the client
+    assert run_with_server(fetch) < 1.5
+
+
+def test_async_client_shares_cache_with_sync_functions(monkeypatch):
+    cache = ResponseCache()
+    session = fake_session(lambda path, params: (200, EOD_CSV))
+    df = get_eod_data("AAPL", "US", start="2020-02-01", end="2020-02-10", api_key="key", session=session,
+                      cache=cache)
+
+    async def fetch(url):
+        monkeypatch.setattr(data, "EOD_HISTORICAL_DATA_API_URL", url)
+        async with AsyncEODClient(api_key="key", cache=cache) as client:
+            return await client.get_eod_data("AAPL", "US", "2020-02-01", "2020-02-10")
+
+    pd.testing.assert_frame_equal(run_with_server(fetch), df)
+    assert cache.stats()["hits"] == 1
+
+
+def test_async_client_bulk_last_day(monkeypatch):
+    async def fetch(url):
+        monkeypatch.setattr(data, "EOD_HISTORICAL_DATA_API_URL", url)
+        async with AsyncEODClient(api_key="key") as client:
+            return await client.get_eod_bulk_last_day("US", day="2020-02-07")
+
+    df = run_with_server(fetch)
+    assert list(df.index) == ["AAPL"] and df.loc["AAPL", "Volume"] == 29421012
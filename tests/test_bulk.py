@@ -0,0 +1,84 @@
+from unittest.mock import sentinel
+import pandas as pd
+from eod_historical_data import get_eod_data_bulk, get_eod_bulk_last_day, HistoryStore, ResponseCache
+from eod_historical_data._utils import RemoteDataError
+from ._helpers import fake_session, EOD_CSV
+
+
+def route(path, params):
+    if path.endswith("/DENIED.US"):
+        return 403, b""
+    if path.endswith("/MISSING.US"):
+        return 404, b""
+    return 200, EOD_CSV
+
+
+def test_get_eod_data_bulk_reports_errors_per_symbol():
+    session = fake_session(route)
+    data, errors = get_eod_data_bulk(["AAPL", "MSFT", "DENIED", "MISSING"], "US",
+                                     start="2020-02-01", end="2020-02-10",
+                                     api_key="key", session=session, max_workers=2)
+    assert list(data) == ["AAPL", "MSFT"]
+    assert data["AAPL"].index.name == "Date"
+    assert len(data["MSFT"]) == 5
+    assert errors["DENIED"] is sentinel
+    assert isinstance(errors["MISSING"], RemoteDataError)
+
+
+def test_get_eod_data_bulk_as_frame():
+    session = fake_session(route)
+    df, errors = get_eod_data_bulk(["AAPL", "MSFT", "AAPL"], "US", start="2020-02-01", end="2020-02-10",
+                                   api_key="key", session=session, as_frame=True)
+    assert errors == {}
+    assert df.index.names == ["Symbol", "Date"]
+    assert isinstance(df.loc["MSFT"], pd.DataFrame)
+    assert len(df) == 10
+
+
+BULK_CSV: bytes = b"""Code,Ex,Date,Open,High,Low,Close,Adjusted_close,Volume
+AAPL,US,2020-02-07,322.37,323.4,318,320.03,79.61,29421012
+MSFT,US,2020-02-07,182.85,185.63,182.48,183.89,178.64,33529074
+NA,US,2020-02-06,10.5,10.7,10.1,10.2,10.2,1200
+"""
+
+BULK_JSON: bytes = (b'[{"code":"AAPL","exchange_short_name":"US","date":"2020-02-07","open":322.37,"high":323.4,'
+                    b'"low":318,"close":320.03,"adjusted_close":79.61,"volume":29421012},'
+                    b'{"code":"MSFT","exchange_short_name":"US","date":"2020-02-07","open":182.85,"high":185.63,'
+                    b'"low":182.48,"close":183.89,"adjusted_close":178.64,"volume":33529074},'
+                    b'{"code":"NA","exchange_short_name":"US","date":"2020-02-06","open":10.5,"high":10.7,'
+                    b'"low":10.1,"close":10.2,"adjusted_close":10.2,"volume":1200}]')
+
+
+def bulk_route(path, params):
+    assert path == "/api/eod-bulk-last-day/US"
+    return 200, BULK_JSON if params.get("fmt") == "json" else BULK_CSV
+
+
+def test_get_eod_bulk_last_day_is_one_request(tmp_path):
+    session = fake_session(bulk_route)
+    adapter = session.get_adapter("https://")
+    store = HistoryStore(str(tmp_path / "eod.sqlite"))
+    df = get_eod_bulk_last_day("US", day="2020-02-07", api_key="key", session=session, store=store)
+    assert len(adapter.calls) == 1
+    assert adapter.calls[0][1]["date"] == "2020-02-07"
+    assert list(df.index) == ["AAPL", "MSFT", "NA"]
+    assert df.loc["MSFT", "Close"] == 183.89
+    assert df["Volume"].dtype == "int64"
+    assert df.loc["NA", "Date"] == pd.Timestamp("2020-02-06")
+
+    pd.testing.assert_frame_equal(get_eod_bulk_last_day("US", day="2020-02-07", api_key="key", session=session,
+                                                        fmt="json"), df)
+
+    # the day of each row is held by the store, get_eod_data is not called again for it
+    assert store.missing("AAPL", "US", "2020-02-07", "2020-02-07") == []
+    assert store.read("NA", "US", "2020-02-06", "2020-02-06")["Close"].tolist() == [10.2]
+
+
+def test_get_eod_bulk_last_day_symbols_and_cache():
+    session = fake_session(bulk_route)
+    adapter = session.get_adapter("https://")
+    cache = ResponseCache()
+    for symbols in (["MSFT", "AAPL"], ["AAPL", "MSFT"]):
+        get_eod_bulk_last_day("US", symbols=symbols, api_key="key", session=session, cache=cache)
+    assert len(adapter.calls) == 1
+    assert adapter.calls[0][1] == {"api_token": "key", "symbols": "MSFT,AAPL"}
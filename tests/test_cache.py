@@ -0,0 +1,102 @@
+from datetime import date
+import pandas as pd
+import pytest
+from eod_historical_data import ResponseCache, get_eod_data, get_exchange_symbols, data
+from eod_historical_data.cache import _cache_key
+from ._helpers import fake_session, EOD_CSV
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_cache_key_normalizes_dates():
+    assert _cache_key("eod", "AAPL", "US", 2020, 2021) == \
+        _cache_key("eod", "AAPL", "US", "2020-01-01", "2021-01-01") == \
+        _cache_key("eod", "AAPL", "US", date(2020, 1, 1), date(2021, 1, 1))
+
+
+def test_cache_lru_eviction_and_counters():
+    cache = ResponseCache(maxsize=2)
+    keys = [_cache_key("exchanges", code) for code in ("US", "LSE", "PA")]
+    cache.set(keys[0], pd.Series([1]))
+    cache.set(keys[1], pd.Series([2]))
+    assert cache.get(keys[0]).iloc[0] == 1
+    cache.set(keys[2], pd.Series([3]))
+    assert cache.get(keys[1]) is None
+    assert keys[0] in cache and keys[2] in cache
+    assert cache.stats() == {"hits": 1, "misses": 1, "evictions": 1, "size": 2}
+
+
+def test_cache_ttl_per_endpoint():
+    clock = Clock()
+    cache = ResponseCache(ttl={"eod": 100, "eod_live": 10}, clock=clock)
+    old = _cache_key("eod", "AAPL", "US", "2020-01-01", "2020-02-01")
+    live = _cache_key("eod", "AAPL", "US", date(2020, 1, 1), date.today())
+    cache.set(old, pd.Series([1]))
+    cache.set(live, pd.Series([2]))
+    clock.now = 50
+    assert cache.get(old) is not None
+    assert cache.get(live) is None
+    clock.now = 150
+    assert cache.get(old) is None
+
+
+def test_cache_returns_copies():
+    cache = ResponseCache()
+    key = _cache_key("exchanges", "US")
+    cache.set(key, pd.Series([1.0]))
+    cache.get(key).iloc[0] = 2.0
+    assert cache.get(key).iloc[0] == 1.0
+
+
+@pytest.mark.parametrize("fetch", [
+    lambda session, cache: get_eod_data("AAPL", "US", start=2020, end=2021, api_key="key",
+                                        session=session, cache=cache),
+    lambda session, cache: get_exchange_symbols("US", api_key="key", session=session, cache=cache),
+])
+def test_endpoints_use_cache(fetch):
+    session = fake_session(lambda path, params: (200, EOD_CSV))
+    cache = ResponseCache()
+    first = fetch(session, cache)
+    second = fetch(session, cache)
+    assert len(session.get_adapter("https://").calls) == 1
+    pd.testing.assert_frame_equal(first, second)
+    assert cache.hits == 1 and cache.misses == 1
+
+
+def test_expired_response_is_revalidated():
+    clock = Clock()
+    cache = ResponseCache(ttl={"exchanges": 10}, clock=clock)
+    # the server answers 304 to requests with validators, bodies without validators are compared by hash
+    responses = {"etag": [(200, EOD_CSV, {"ETag": '"v1"'}), (304, b"")], "hash": [(200, EOD_CSV), (200, EOD_CSV)]}
+    for validator, answers in responses.items():
+        session = fake_session(lambda path, params: answers.pop(0))
+        adapter = session.get_adapter("https://")
+        first = get_exchange_symbols(validator, api_key="key", session=session, cache=cache)
+        clock.now += 20
+        assert cache.get(_cache_key("exchanges", validator)) is None
+        second = get_exchange_symbols(validator, api_key="key", session=session, cache=cache)
+        pd.testing.assert_frame_equal(first, second)
+        # the revalidated value is a copy, changing it leaves the cache untouched
+        second.iloc[0, 0] = "changed"
+        pd.testing.assert_frame_equal(cache.get(_cache_key("exchanges", validator)), first)
+        assert adapter.request_headers[1].get("If-None-Match") == ('"v1"' if validator == "etag" else None)
+        # fresh again
+        get_exchange_symbols(validator, api_key="key", session=session, cache=cache)
+        assert len(adapter.calls) == 2
+    assert cache.revalidations == 2
+
+
+def test_responses_are_not_hashed_without_cache(monkeypatch):
+    def hash_body(headers, body):
+        raise AssertionError("validators computed without a cache")
+
+    monkeypatch.setattr(data, "_response_validators", hash_body)
+    session = fake_session(lambda path, params: (200, EOD_CSV))
+    df = get_eod_data("AAPL", "US", start="2020-02-01", end="2020-02-10", api_key="key", session=session, cache=None)
+    assert len(df) == 5
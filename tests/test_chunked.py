@@ -0,0 +1,63 @@
+import pandas as pd
+import pytest
+from eod_historical_data import get_eod_data_chunked, ResponseCache
+from eod_historical_data._utils import RemoteDataError
+from ._helpers import fake_session
+
+
+def history_route(fail=()):
+    """
+        Returns a route answering one row per weekday of the requested range, the close is the row number
+        and the day after every requested range is repeated to check duplicated dates are dropped
+    """
+    days = pd.bdate_range("2015-01-01", "2020-12-31")
+
+    def route(path, params):
+        start, end = pd.Timestamp(params["from"]), pd.Timestamp(params["to"])
+        if params["from"] in fail:
+            return 404, b""
+        rows = [f"{day:%Y-%m-%d},1,1,1,{i},{i},100" for i, day in enumerate(days)
+                if start <= day <= end + pd.Timedelta(days=1)]
+        return 200, ("Date,Open,High,Low,Close,Adjusted_close,Volume\n" + "\n".join(rows) + "\n").encode()
+
+    return route
+
+
+def test_get_eod_data_chunked_matches_one_request():
+    session = fake_session(history_route())
+    expected = pd.DataFrame(index=pd.bdate_range("2015-06-15", "2019-02-28", name="Date"))
+    for chunk in ["year", 100]:
+        df = get_eod_data_chunked("GSPC", "INDX", start="2015-06-15", end="2019-02-28", chunk=chunk,
+                                  api_key="key", session=session, max_workers=4)
+        assert df.index.is_monotonic_increasing and not df.index.has_duplicates
+        # the day after end is returned by the route of the last chunk only
+        assert list(df.index[:-1]) == list(expected.index)
+        assert (df["Close"].diff().dropna() == 1).all()
+    calls = session.get_adapter("https://").calls
+    year_calls = [params for _, params in calls[:5]]
+    assert sorted((params["from"], params["to"]) for params in year_calls) == [
+        ("2015-06-15", "2015-12-31"), ("2016-01-01", "2016-12-31"), ("2017-01-01", "2017-12-31"),
+        ("2018-01-01", "2018-12-31"), ("2019-01-01", "2019-02-28")]
+    assert len(calls) == 5 + 10
+
+
+def test_get_eod_data_chunked_retries_only_failed_chunks():
+    cache = ResponseCache()
+    failing = fake_session(history_route(fail=("2017-01-01",)))
+    with pytest.raises(RemoteDataError):
+        get_eod_data_chunked("GSPC", "INDX", start="2015-06-15", end="2019-02-28", api_key="key",
+                             session=failing, cache=cache)
+    assert len(failing.get_adapter("https://").calls) == 5
+
+    session = fake_session(history_route())
+    df = get_eod_data_chunked("GSPC", "INDX", start="2015-06-15", end="2019-02-28", api_key="key",
+                              session=session, cache=cache, compact=True)
+    assert [params["from"] for _, params in session.get_adapter("https://").calls] == ["2017-01-01"]
+    assert df["Close"].dtype == "float32"
+
+
+def test_get_eod_data_chunked_checks_chunk():
+    with pytest.raises(ValueError):
+        get_eod_data_chunked("GSPC", "INDX", start="2015-06-15", end="2019-02-28", chunk="month", api_key="key")
+    with pytest.raises(ValueError):
+        get_eod_data_chunked("GSPC", "INDX", start="2015-06-15", end="2019-02-28", chunk=0, api_key="key")
@@ -0,0 +1,88 @@
+import pickle
+from concurrent.futures import ThreadPoolExecutor
+import pandas as pd
+import pytest
+from eod_historical_data import EODClient, ResponseCache, RequestScheduler, get_eod_data, data, client
+from eod_historical_data._utils import EnvironNotSet
+from ._helpers import EOD_CSV, fake_session
+
+
+def route(path, params):
+    return 200, EOD_CSV
+
+
+def test_client_is_shared_between_threads():
+    client = EODClient(api_key="key", pool_size=4, cache=ResponseCache())
+    session = fake_session(route, client.session)
+    symbols = [f"S{i}" for i in range(16)]
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        frames = list(executor.map(lambda symbol: client.get_eod_data(symbol, "US", "2020-02-01", "2020-02-10"),
+                                   symbols))
+    assert all(len(df) == 5 for df in frames)
+    assert client.session is session
+    calls = session.get_adapter("https://").calls
+    assert sorted(path for path, _ in calls) == sorted(f"/api/eod/{symbol}.US" for symbol in symbols)
+    assert all(params["api_token"] == "key" for _, params in calls)
+    # answered from the cache of the client
+    client.get_eod_data("S0", "US", "2020-02-01", "2020-02-10")
+    assert len(calls) == 16
+
+
+def test_client_pickles_without_its_session():
+    client = EODClient(api_key="key", base_url="https://example.test/v2", timeout=(1, 2), cache=ResponseCache(),
+                       compact=True)
+    session = client.session
+    client.cache.set(("eod", "AAPL", "US", None, None), pd.DataFrame())
+    copy = pickle.loads(pickle.dumps(client))
+    assert copy.api_key == "key" and copy.url == "https://example.test/v2" and copy.compact
+    assert copy.scheduler.timeout == (1, 2)
+    # the pool and the responses of the parent are not shared
+    assert copy._session is None and len(copy.cache) == 0
+    assert copy.session is not session
+    fake_session(route, copy.session)
+    df = copy.get_eod_data("AAPL", "US", "2020-02-01", "2020-02-10")
+    assert df["Close"].dtype == "float32"
+    assert copy.session.get_adapter("https://").calls[0][0] == "/v2/eod/AAPL.US"
+    with pytest.raises(ValueError):
+        EODClient(timeout=1, scheduler=RequestScheduler())
+
+
+def test_free_functions_read_the_api_key_on_use(monkeypatch):
+    session = fake_session(route)
+    monkeypatch.setattr(data, "EOD_HISTORICAL_DATA_API_KEY_DEFAULT", "")
+    monkeypatch.delenv("EOD_HISTORICAL_API_KEY", raising=False)
+    with pytest.raises(EnvironNotSet):
+        get_eod_data("AAPL", "US", "2020-02-01", "2020-02-10", api_key="", session=session)
+    monkeypatch.setenv("EOD_HISTORICAL_API_KEY", "from-env")
+    get_eod_data("AAPL", "US", "2020-02-01", "2020-02-10", api_key="", session=session)
+    # an api_key given positionally is used as is
+    get_eod_data("AAPL", "US", "2020-02-01", "2020-02-10", "positional", session)
+    tokens = [params["api_token"] for _, params in session.get_adapter("https://").calls]
+    assert tokens == ["from-env", "positional"]
+
+
+def test_free_functions_use_the_default_client(monkeypatch):
+    session = fake_session(route)
+    monkeypatch.setattr(client, "default_client", EODClient(api_key="key", cache=ResponseCache(),
+                                                            scheduler=RequestScheduler(max_retries=0)))
+    for _ in range(2):
+        get_eod_data("AAPL", "US", "2020-02-01", "2020-02-10", session=session)
+    calls = session.get_adapter("https://").calls
+    assert len(calls) == 1
+    # an explicit None bypasses the cache of the default client
+    get_eod_data("AAPL", "US", "2020-02-01", "2020-02-10", session=session, cache=None)
+    assert len(calls) == 2
+
+
+def test_large_pools_are_reused_and_closed():
+    client = EODClient(api_key="key", pool_size=4)
+    assert client.pooled_session(2) is client.session
+    session = client.pooled_session(16)
+    assert client.pooled_session(16) is session and session is not client.session
+    assert session.get_adapter("https://")._pool_maxsize == 16
+    client.close()
+    assert client.pooled_session(16) is not session
+    # the bulk calls get a pool as large as their number of workers
+    session = fake_session(route, client.pooled_session(8))
+    frames, errors = client.get_eod_data_bulk(["AAPL", "MSFT"], "US", "2020-02-01", "2020-02-10", max_workers=8)
+    assert len(frames) == 2 and len(session.get_adapter("https://").calls) == 2
@@ -0,0 +1,125 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import pandas as pd
+import pytest
+from eod_historical_data import get_eod_data, AsyncEODClient, RequestCoalescer, ResponseCache, data
+from eod_historical_data._utils import RemoteDataError
+from .test_async_client import run_with_server
+from ._helpers import fake_session, EOD_CSV
+
+
+def gated_route(release, status=200):
+    def route(path, params):
+        # every caller is waiting on the first request before it is answered
+        release.wait(5)
+        return status, EOD_CSV if status == 200 else b""
+    return route
+
+
+def fetch_concurrently(calls, coalescer, release, **kwargs):
+    with ThreadPoolExecutor(max_workers=len(calls)) as executor:
+        futures = [executor.submit(get_eod_data, "AAPL", "US", start, end, api_key="key", coalescer=coalescer,
+                                   **kwargs) for start, end in calls]
+        while coalescer.stats()["joined"] < len(calls) - 1:
+            threading.Event().wait(0.001)
+        release.set()
+        return [future.result() for future in futures]
+
+
+class StoreRecordingCache(ResponseCache):
+    def __init__(self):
+        super().__init__()
+        self.stores = []
+
+    def set(self, key, value, validators=None):
+        self.stores.append(validators)
+        super().set(key, value, validators)
+
+
+def test_get_eod_data_shares_identical_requests():
+    release = threading.Event()
+    session = fake_session(gated_route(release))
+    coalescer = RequestCoalescer()
+    cache = StoreRecordingCache()
+    frames = fetch_concurrently([("2020-02-01", "2020-02-10")] * 4, coalescer, release, session=session,
+                                cache=cache)
+    assert len(session.get_adapter("https://").calls) == 1
+    assert coalescer.stats() == {"requests": 1, "joined": 3}
+    assert len(coalescer) == 0
+    for df in frames[1:]:
+        pd.testing.assert_frame_equal(df, frames[0])
+        assert df is not frames[0]
+    assert ("eod", "AAPL", "US", "2020-02-01", "2020-02-10") in cache
+    # the callers that joined do not overwrite the validators stored with the response
+    assert len(cache.stores) == 1 and cache.stores[0] is not None
+
+
+def test_get_eod_data_shares_errors():
+    release = threading.Event()
+    session = fake_session(gated_route(release, status=404))
+    with pytest.raises(RemoteDataError):
+        fetch_concurrently([("2020-02-01", "2020-02-10")] * 3, RequestCoalescer(), release, session=session)
+    assert len(session.get_adapter("https://").calls) == 1
+
+
+def test_get_eod_data_widens_overlapping_ranges():
+    release = threading.Event()
+    release.set()
+    session = fake_session(gated_route(release))
+    coalescer = RequestCoalescer(widen=True, window=0.2)
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        first = executor.submit(get_eod_data, "AAPL", "US", "2020-02-01", "2020-02-05", api_key="key",
+                                session=session, coalescer=coalescer)
+        while len(coalescer) == 0:
+            threading.Event().wait(0.001)
+        second = executor.submit(get_eod_data, "AAPL", "US", "2020-02-04", "2020-02-10", api_key="key",
+                                 session=session, coalescer=coalescer)
+        first, second = first.result(), second.result()
+    calls = session.get_adapter("https://").calls
+    assert len(calls) == 1
+    assert (calls[0][1]["from"], calls[0][1]["to"]) == ("2020-02-01", "2020-02-10")
+    assert list(first.index.strftime("%Y-%m-%d")) == ["2020-02-03", "2020-02-04", "2020-02-05"]
+    assert list(second.index.strftime("%Y-%m-%d")) == ["2020-02-04", "2020-02-05", "2020-02-06", "2020-02-07"]
+
+
+def test_coalescer_joins_covering_request_in_flight():
+    coalescer = RequestCoalescer(widen=True)
+
+    async def main():
+        started = asyncio.Event()
+        calls = []
+
+        async def fetch(key):
+            calls.append(key)
+            started.set()
+            await asyncio.sleep(0.01)
+            index = pd.to_datetime(["2020-01-02", "2020-01-03", "2020-01-06"])
+            return pd.DataFrame({"Close": [1.0, 2.0, 3.0]}, index=index)
+
+        async def inner():
+            await started.wait()
+            return await coalescer.do_async(("eod", "A", "US", "2020-01-03", "2020-01-03"), fetch)
+
+        outer, inner = await asyncio.gather(coalescer.do_async(("eod", "A", "US", "2020-01-01", "2020-01-31"),
+                                                               fetch), inner())
+        return calls, outer, inner
+
+    calls, (outer, outer_joined), (inner, inner_joined) = asyncio.run(main())
+    assert len(calls) == 1
+    assert not outer_joined and inner_joined
+    assert len(outer) == 3 and inner["Close"].tolist() == [2.0]
+
+
+def test_async_client_shares_identical_requests(monkeypatch):
+    coalescer = RequestCoalescer()
+
+    async def fetch(url):
+        monkeypatch.setattr(data, "EOD_HISTORICAL_DATA_API_URL", url)
+        async with AsyncEODClient(api_key="key", coalescer=coalescer) as client:
+            return await asyncio.gather(*[client.get_eod_data("AAPL", "US", "2020-02-01", "2020-02-10")
+                                          for _ in range(5)])
+
+    frames = run_with_server(fetch)
+    assert coalescer.stats() == {"requests": 1, "joined": 4}
+    assert all(len(df) == 5 for df in frames)
@@ -0,0 +1,74 @@
+import asyncio
+import gzip
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+import pytest
+from eod_historical_data import AsyncEODClient, MetricsAggregator, data, get_eod_data
+from eod_historical_data.instrumentation import register, unregister
+from eod_historical_data._utils import _accept_encoding
+from ._helpers import EOD_CSV
+
+# long enough for gzip to shrink it
+BODY: bytes = EOD_CSV + EOD_CSV.split(b"\n", 1)[1].replace(b"2020-02", b"2020-03")
+COMPRESSED: bytes = gzip.compress(BODY)
+
+
+@pytest.fixture
+def server(monkeypatch):
+    received = []
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            received.append(self.headers.get("Accept-Encoding"))
+            self.send_response(200)
+            self.send_header("Content-Type", "text/csv")
+            self.send_header("Content-Encoding", "gzip")
+            self.send_header("Content-Length", str(len(COMPRESSED)))
+            self.end_headers()
+            self.wfile.write(COMPRESSED)
+
+        def log_message(self, *args):
+            pass
+
+    http_server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=http_server.serve_forever, daemon=True)
+    thread.start()
+    monkeypatch.setattr(data, "EOD_HISTORICAL_DATA_API_URL", "http://127.0.0.1:%d/api" % http_server.server_port)
+    metrics = register(MetricsAggregator())
+    try:
+        yield received, metrics
+    finally:
+        unregister(metrics)
+        http_server.shutdown()
+        http_server.server_close()
+
+
+def test_accept_encoding():
+    assert _accept_encoding().startswith("gzip, deflate")
+
+
+def test_sync_request_is_compressed(server):
+    received, metrics = server
+    df = get_eod_data("AAPL", "US", "2020-02-01", "2020-03-10", api_key="key")
+    assert len(df) == 10
+    assert received == [_accept_encoding()]
+    event, = metrics.events
+    assert event.bytes == len(BODY)
+    assert event.wire_bytes == len(COMPRESSED) < len(BODY)
+
+
+def test_async_request_is_compressed(server):
+    received, metrics = server
+
+    async def fetch():
+        async with AsyncEODClient(api_key="key") as client:
+            return await client.get_eod_data("AAPL", "US", "2020-02-01", "2020-03-10")
+
+    assert len(asyncio.run(fetch())) == 10
+    assert received == [_accept_encoding()]
+    event, = metrics.events
+    assert event.bytes == len(BODY)
+    assert event.wire_bytes == len(COMPRESSED)
+    assert metrics.summary()["wire_bytes"] == len(COMPRESSED)
@@ -0,0 +1,66 @@
+import numpy as np
+import pytest
+from eod_historical_data import get_eod_data, get_eod_data_bulk, get_dividends, get_exchange_symbols
+from ._helpers import EOD_CSV, fake_session
+
+SYMBOLS_CSV: bytes = (b"Code,Name,Country,Exchange,Currency,Type,Isin\n" +
+                      b"".join(b"S%03d,Name %d,USA,NYSE,USD,%s,US%09d\n"
+                               % (i, i, b"ETF" if i % 3 else b"Common Stock", i) for i in range(20)))
+
+
+def route(path, params):
+    if path.startswith("/api/div/"):
+        return 200, b"Date,Dividends\n2020-02-07,0.77\n"
+    if path.startswith("/api/exchanges/"):
+        return 200, SYMBOLS_CSV
+    return 200, EOD_CSV
+
+
+def test_compact_eod_data():
+    session = fake_session(route)
+    df = get_eod_data("AAPL", "US", "2020-02-01", "2020-02-10", api_key="key", session=session)
+    compact = get_eod_data("AAPL", "US", "2020-02-01", "2020-02-10", api_key="key", session=session, compact=True)
+    assert (compact.dtypes.iloc[:5] == np.float32).all()
+    assert compact["Volume"].dtype == np.int32
+    assert compact.index.equals(df.index)
+    assert np.allclose(compact.values, df.values, rtol=1e-6)
+    assert compact.memory_usage(deep=True).sum() < df.memory_usage(deep=True).sum()
+
+
+def test_compact_exchange_symbols_are_categorical():
+    df = get_exchange_symbols("US", api_key="key", session=fake_session(route), compact=True)
+    assert df.index.name == "Code"
+    for column in ("Country", "Exchange", "Currency", "Type"):
+        assert df[column].dtype == "category"
+    assert df["Name"].dtype == object and df["Isin"].dtype == object
+
+
+def test_numpy_output():
+    session = fake_session(route)
+    records = get_eod_data("AAPL", "US", "2020-02-01", "2020-02-10", api_key="key", session=session,
+                           compact=True, output="numpy")
+    assert isinstance(records, np.recarray)
+    assert records.dtype.names == ("Date", "Open", "High", "Low", "Close", "Adjusted_close", "Volume")
+    assert records["Close"].dtype == np.float32
+    assert records["Date"][0] == np.datetime64("2020-02-03")
+    ts = get_dividends("AAPL", "US", "2020-02-01", "2020-02-10", api_key="key", session=session, output="numpy")
+    assert ts.dtype.names == ("Date", "Dividends")
+
+
+def test_arrow_output():
+    pa = pytest.importorskip("pyarrow")
+    session = fake_session(route)
+    table = get_exchange_symbols("US", api_key="key", session=session, compact=True, output="arrow")
+    assert isinstance(table, pa.Table)
+    assert pa.types.is_dictionary(table.schema.field("Type").type)
+    frame, errors = get_eod_data_bulk(["AAPL", "MSFT"], "US", "2020-02-01", "2020-02-10", api_key="key",
+                                      session=session, as_frame=True, compact=True, output="arrow")
+    assert errors == {}
+    assert table.num_rows == 20 and frame.num_rows == 10
+    assert frame.schema.field("Close").type == pa.float32()
+
+
+def test_unknown_output():
+    with pytest.raises(ValueError):
+        get_eod_data("AAPL", "US", "2020-02-01", "2020-02-10", api_key="key", session=fake_session(route),
+                     output="polars")
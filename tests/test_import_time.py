@@ -0,0 +1,44 @@
+import os
+import subprocess
+import sys
+from typing import Dict
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def run(code: str) -> subprocess.CompletedProcess:
+    return subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=ROOT, capture_output=True,
+                          text=True, check=True)
+
+
+def cumulative_import_times(stderr: str) -> Dict[str, int]:
+    """
+        Returns {module: cumulative microseconds} from python -X importtime output
+    """
+    times: Dict[str, int] = {}
+    for line in stderr.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            _, cumulative, name = line[len("import time:"):].split("|")
+            if cumulative.strip().isdigit():
+                times[name.strip()] = int(cumulative)
+    return times
+
+
+@pytest.mark.parametrize("code, absent", [
+    ("import eod_historical_data", ("pandas", "requests", "aiohttp", "asyncio", "sqlite3")),
+    ("import eod_historical_data as e; e.get_exchange_name('US'); e.is_supported_currency('USD')",
+     ("pandas", "requests", "aiohttp")),
+    ("from eod_historical_data import get_eod_data, get_eod_data_bulk, ResponseCache, RequestScheduler",
+     ("aiohttp", "asyncio", "unittest.mock", "sqlite3")),
+])
+def test_heavy_dependencies_are_imported_lazily(code, absent):
+    result = run(f"{code}; import sys; print(','.join(m for m in {absent!r} if m in sys.modules))")
+    assert result.stdout.strip() == ""
+
+
+def test_package_import_time():
+    times = cumulative_import_times(run("import eod_historical_data; import pandas").stderr)
+    # importing the package must stay an order of magnitude cheaper than importing pandas
+    assert times["eod_historical_data"] * 10 < times["pandas"]
@@ -0,0 +1,98 @@
+import asyncio
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from eod_historical_data import (AsyncEODClient, Instrumentation, MetricsAggregator, RequestScheduler, ResponseCache,
+                                 data, get_eod_data)
+from eod_historical_data.instrumentation import register, unregister, _percentile
+from eod_historical_data._utils import RemoteDataError
+from ._helpers import EOD_CSV, fake_session
+
+
+@pytest.fixture
+def metrics():
+    aggregator = register(MetricsAggregator())
+    yield aggregator
+    unregister(aggregator)
+
+
+def test_events_of_sync_requests(metrics):
+    attempts = []
+
+    def route(path, params):
+        attempts.append(path)
+        if path.endswith("/MISSING.US"):
+            return 404, b""
+        return (503, b"") if len(attempts) == 1 else (200, EOD_CSV)
+
+    session = fake_session(route)
+    scheduler = RequestScheduler(backoff_factor=0)
+    cache = ResponseCache()
+    for _ in range(2):
+        get_eod_data("AAPL", "US", "2020-02-01", "2020-02-10", api_key="key", session=session, cache=cache,
+                     scheduler=scheduler)
+    with pytest.raises(RemoteDataError):
+        get_eod_data("MISSING", "US", "2020-02-01", "2020-02-10", api_key="key", session=session, scheduler=scheduler)
+
+    fetched, hit, missing = metrics.events
+    assert (fetched.endpoint, fetched.symbol, fetched.exchange) == ("eod", "AAPL", "US")
+    assert fetched.url.endswith("/eod/AAPL.US") and "api_token" not in fetched.url
+    assert fetched.status == 200 and fetched.retries == 1 and fetched.rows == 5
+    assert fetched.bytes == len(EOD_CSV)
+    assert fetched.timings["parse"] > 0 and fetched.timings["total"] >= fetched.timings["parse"]
+    assert hit.cache_hit and hit.status is None and hit.rows is None
+    assert missing.status == 404 and isinstance(missing.error, RemoteDataError)
+
+    summary = metrics.summary()
+    assert summary["requests"] == 3 and summary["errors"] == 1 and summary["cache_hits"] == 1
+    assert summary["retries"] == 1 and summary["rows"] == 5
+    assert summary["statuses"] == {200: 1, 404: 1}
+    assert summary["latency"]["p50"] <= summary["latency"]["p99"] <= summary["latency"]["max"]
+    assert summary["rows_per_sec"] > 0
+
+
+def test_failing_hook_does_not_break_requests():
+    class Broken(Instrumentation):
+        def request_end(self, event):
+            raise KeyError("boom")
+
+    hook = register(Broken())
+    try:
+        with pytest.warns(RuntimeWarning):
+            df = get_eod_data("AAPL", "US", "2020-02-01", "2020-02-10", api_key="key",
+                              session=fake_session(lambda path, params: (200, EOD_CSV)))
+    finally:
+        unregister(hook)
+    assert len(df) == 5
+
+
+def test_events_of_async_requests(metrics, monkeypatch):
+    async def eod(request):
+        return web.Response(body=EOD_CSV, content_type="text/csv")
+
+    async def main():
+        app = web.Application()
+        app.router.add_get("/api/eod/{symbol}", eod)
+        server = TestServer(app)
+        await server.start_server()
+        monkeypatch.setattr(data, "EOD_HISTORICAL_DATA_API_URL", str(server.make_url("/api")))
+        try:
+            async with AsyncEODClient(api_key="key") as client:
+                await asyncio.gather(*[client.get_eod_data(symbol, "US", "2020-02-01", "2020-02-10")
+                                       for symbol in ("AAPL", "MSFT")])
+        finally:
+            await server.close()
+
+    asyncio.run(main())
+    events = metrics.events
+    assert sorted(event.symbol for event in events) == ["AAPL", "MSFT"]
+    for event in events:
+        assert event.status == 200 and event.rows == 5 and event.bytes == len(EOD_CSV)
+        assert event.timings["connect"] > 0 and event.timings["wait"] > 0
+        assert event.timings["total"] >= event.timings["wait"] + event.timings["parse"]
+
+
+def test_percentile():
+    assert _percentile([], 50) is None
+    assert _percentile([1.0, 2.0, 3.0, 4.0], 50) == 2.5
+    assert _percentile([1.0, 2.0, 3.0, 4.0], 100) == 4.0
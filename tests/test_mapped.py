@@ -0,0 +1,65 @@
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+import pytest
+from eod_historical_data import MappedHistory, get_eod_data
+from ._helpers import fake_session, EOD_CSV
+
+
+def route(path, params):
+    return 200, EOD_CSV
+
+
+def last_close(history, symbol):
+    return float(history.columns(symbol, "US", start="2020-02-07")["Close"][-1])
+
+
+def test_mapped_history_round_trip(tmp_path):
+    session = fake_session(route)
+    history = MappedHistory(str(tmp_path))
+    df = history.download("AAPL", "US", "2020-02-01", "2020-02-10", api_key="key", session=session)
+    pd.testing.assert_frame_equal(history.read("AAPL", "US"), df)
+    assert history.symbols() == [("AAPL", "US")]
+    assert history.read("MSFT", "US") is None
+
+    columns = history.columns("AAPL", "US", start="2020-02-04", end="2020-02-06", fields=["Close"])
+    assert list(columns) == ["Date", "Close"]
+    assert columns["Close"].tolist() == [318.85, 321.45, 325.21]
+    # slices of the read-only memory map, nothing was copied
+    assert isinstance(columns["Close"].base, np.memmap) or isinstance(columns["Close"], np.memmap)
+    assert not columns["Close"].flags.writeable
+    assert history.read("AAPL", "US", start=2021).empty
+
+
+def test_mapped_history_merges_versions(tmp_path):
+    history = MappedHistory(str(tmp_path))
+    df = get_eod_data("AAPL", "US", "2020-02-01", "2020-02-10", api_key="key", session=fake_session(route))
+    history.write("AAPL", "US", df.iloc[3:])
+    old = history.columns("AAPL", "US")
+    update = df.iloc[:4].copy()
+    update["Close"] = 1.0
+    history.write("AAPL", "US", update)
+    history.write("AAPL", "US", update)
+
+    merged = history.read("AAPL", "US")
+    assert len(merged) == 5
+    assert merged["Close"].tolist() == [1.0, 1.0, 1.0, 1.0, 320.03]
+    # arrays mapped before the writes still read the version they were mapped from
+    assert old["Close"].tolist() == [325.21, 320.03]
+    assert sorted(p.name for p in (tmp_path / "US" / "AAPL").iterdir()) == ["CURRENT", "v2", "v3"]
+
+
+def test_mapped_history_is_shared_with_worker_processes(tmp_path):
+    history = MappedHistory(str(tmp_path))
+    history.write("AAPL", "US", get_eod_data("AAPL", "US", "2020-02-01", "2020-02-10", api_key="key",
+                                             session=fake_session(route)))
+    copy = pickle.loads(pickle.dumps(history))
+    assert copy.path == history.path
+    with ProcessPoolExecutor(max_workers=1) as executor:
+        assert executor.submit(last_close, history, "AAPL").result() == 320.03
+
+
+def test_mapped_history_checks_names(tmp_path):
+    with pytest.raises(ValueError):
+        MappedHistory(str(tmp_path)).read("../AAPL", "US")
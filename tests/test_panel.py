@@ -0,0 +1,71 @@
+import numpy as np
+import pandas as pd
+import pytest
+from eod_historical_data import get_eod_panel
+from eod_historical_data.panel import _assemble_panel
+from ._helpers import fake_session, EOD_CSV
+
+# MSFT misses 2020-02-04 and trades on 2020-02-10 which AAPL has no row for
+MSFT_CSV: bytes = b"""Date,Open,High,Low,Close,Adjusted_close,Volume
+2020-02-03,170.43,174.5,169.47,174.38,169.17,30107000
+2020-02-05,184.03,184.2,178.41,179.9,174.52,39186300
+2020-02-06,180.97,183.82,180.06,183.63,178.14,27751400
+2020-02-07,182.85,185.63,182.48,183.89,178.39,33529100
+2020-02-10,183.58,188.84,183.25,188.7,183.06,35844300
+"""
+
+
+def route(path, params):
+    if path.endswith("/MISSING.US"):
+        return 404, b""
+    return 200, MSFT_CSV if path.endswith("/MSFT.US") else EOD_CSV
+
+
+def test_get_eod_panel_aligns_symbols_on_union_calendar():
+    session = fake_session(route)
+    panel, errors = get_eod_panel(["MSFT", "AAPL", "MISSING"], "US", start="2020-02-01", end="2020-02-10",
+                                  fields=["Adjusted_close", "Volume"], api_key="key", session=session)
+    assert list(panel) == ["Adjusted_close", "Volume"]
+    assert list(errors) == ["MISSING"]
+    close = panel["Adjusted_close"]
+    assert list(close.columns) == ["MSFT", "AAPL"]
+    assert close.index.name == "Date"
+    assert list(close.index) == list(pd.date_range("2020-02-03", "2020-02-07")) + [pd.Timestamp("2020-02-10")]
+    assert close.loc["2020-02-06", "AAPL"] == 80.71
+    assert np.isnan(close.loc["2020-02-04", "MSFT"])
+    assert np.isnan(close.loc["2020-02-10", "AAPL"])
+    assert panel["Volume"].loc["2020-02-07", "MSFT"] == 33529100
+
+
+def test_get_eod_panel_fill_policies():
+    session = fake_session(route)
+    ffill, _ = get_eod_panel(["MSFT", "AAPL"], "US", start="2020-02-01", end="2020-02-10", fill="ffill",
+                             api_key="key", session=session, compact=True)
+    assert ffill["Close"].loc["2020-02-04", "MSFT"] == np.float32(174.38)
+    assert ffill["Close"].loc["2020-02-10", "AAPL"] == np.float32(320.03)
+    assert ffill["Close"].dtypes.tolist() == ["float32", "float32"]
+    assert ffill["Volume"].dtypes.tolist() == ["float64", "float64"]
+
+    bfill, _ = get_eod_panel(["MSFT", "AAPL"], "US", start="2020-02-01", end="2020-02-10", fill="bfill",
+                             api_key="key", session=session)
+    assert bfill["Close"].loc["2020-02-04", "MSFT"] == 179.9
+    # nothing comes after the last row of AAPL
+    assert np.isnan(bfill["Close"].loc["2020-02-10", "AAPL"])
+
+    zero, _ = get_eod_panel(["MSFT", "AAPL"], "US", start="2020-02-01", end="2020-02-10", fill=0,
+                            api_key="key", session=session)
+    assert zero["Volume"].loc["2020-02-10", "AAPL"] == 0
+
+    with pytest.raises(ValueError):
+        get_eod_panel(["MSFT"], "US", fill="pad", api_key="key", session=session)
+
+
+def test_assemble_panel_matches_concat_and_pivot():
+    index = pd.to_datetime(["2020-01-02", "2020-01-03", "2020-01-06"])
+    frames = {"A": pd.DataFrame({"Close": [1.0, 2.0, 3.0]}, index=index),
+              "B": pd.DataFrame({"Close": [4.0, np.nan]}, index=index[[0, 2]]),
+              "C": pd.DataFrame({"Close": []}, index=pd.DatetimeIndex([]))}
+    panel = _assemble_panel(frames, ["Close"])
+    expected = pd.concat(frames, names=["Symbol", "Date"])["Close"].unstack("Symbol").reindex(columns=list(frames))
+    pd.testing.assert_frame_equal(panel["Close"], expected, check_names=False)
+    assert _assemble_panel({}, ["Close"])["Close"].shape == (0, 0)
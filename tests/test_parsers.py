@@ -0,0 +1,116 @@
+import importlib.util
+import json
+import pandas as pd
+import pytest
+from eod_historical_data import get_eod_data, get_dividends, get_exchange_symbols
+from eod_historical_data._parsers import (_parse_eod, _parse_dividends, _parse_exchange_symbols, _strip_footer,
+                                          _parse_eod_json, _parse_dividends_json, _parse_exchange_symbols_json,
+                                          _get_parser)
+from ._helpers import EOD_CSV, fake_session
+
+ENGINES = ["c", "python"] + (["pyarrow"] if importlib.util.find_spec("pyarrow") else [])
+
+
+def test_strip_footer():
+    assert _strip_footer(b"Date,Dividends\n2020-02-07,0.77\n40\n\n") == b"Date,Dividends\n2020-02-07,0.77"
+    assert _strip_footer("Date,Dividends\n2020-02-07,0.77\n") == "Date,Dividends\n2020-02-07,0.77"
+    assert _strip_footer("Date,Dividends\n") == "Date,Dividends"
+    assert _strip_footer("") == ""
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_parse_eod(engine):
+    df = _parse_eod(EOD_CSV + b"5\n", engine=engine)
+    assert df.index.name == "Date"
+    assert str(df.index.dtype) == "datetime64[ns]"
+    assert len(df) == 5
+    assert df["Close"].dtype == "float64"
+    assert df["Volume"].dtype == "int64"
+    assert df["Volume"].iloc[0] == 43496401
+
+
+def test_parse_eod_float32_and_missing_volume():
+    df = _parse_eod(EOD_CSV.decode() + "2020-02-10,1,2,0.5,1.5,1.5,\n", float_dtype="float32")
+    assert df["Open"].dtype == "float32"
+    assert df["Volume"].dtype == "float64"
+
+
+def test_parse_unknown_engine():
+    with pytest.raises(ValueError):
+        _parse_eod(EOD_CSV, engine="fortran")
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_parse_dividends(engine):
+    ts = _parse_dividends("Date,Dividends\n2020-02-07,0.77\n2020-05-08,0.82\n", engine=engine)
+    assert ts.name == "Dividends"
+    assert ts.sum() == pytest.approx(1.59)
+
+
+def test_parse_exchange_symbols_keeps_codes_as_strings():
+    df = _parse_exchange_symbols(b'Code,Name,Country,Exchange,Currency,Type,Isin\n'
+                                 b'0001,"CK Hutchison, Holdings",Hong Kong,HK,HKD,Common Stock,\n'
+                                 b'NA,National Bank,Canada,TO,CAD,Common Stock,CA6330671034\n')
+    assert list(df.index) == ["0001", "NA"]
+    assert df.loc["0001", "Name"] == "CK Hutchison, Holdings"
+    assert df["Isin"].isna().sum() == 1
+
+
+def _eod_json() -> bytes:
+    df = _parse_eod(EOD_CSV)
+    return json.dumps([dict(date=f"{day:%Y-%m-%d}", **{column.lower(): value for column, value in row.items()})
+                       for day, row in zip(df.index, df.astype(object).to_dict("records"))]).encode()
+
+
+SYMBOLS_JSON: bytes = json.dumps([
+    {"Code": "0001", "Name": "CK Hutchison, Holdings", "Country": "Hong Kong", "Exchange": "HK", "Currency": "HKD",
+     "Type": "Common Stock", "Isin": ""},
+    {"Code": "NA", "Name": "National Bank", "Country": "Canada", "Exchange": "TO", "Currency": "CAD",
+     "Type": "Common Stock", "Isin": "CA6330671034"},
+]).encode()
+
+DIVIDENDS_JSON: bytes = (b'[{"date":"2020-02-07","declarationDate":"2020-01-28","value":0.77,"unadjustedValue":0.77},'
+                         b'{"date":"2020-05-08","declarationDate":"2020-04-30","value":0.82,"unadjustedValue":0.82}]')
+
+
+def test_parse_json_matches_csv():
+    pd.testing.assert_frame_equal(_parse_eod_json(_eod_json()), _parse_eod(EOD_CSV))
+    pd.testing.assert_series_equal(_parse_dividends_json(DIVIDENDS_JSON),
+                                   _parse_dividends("Date,Dividends\n2020-02-07,0.77\n2020-05-08,0.82\n"))
+    pd.testing.assert_frame_equal(_parse_exchange_symbols_json(SYMBOLS_JSON), _parse_exchange_symbols(
+        b'Code,Name,Country,Exchange,Currency,Type,Isin\n'
+        b'0001,"CK Hutchison, Holdings",Hong Kong,HK,HKD,Common Stock,\n'
+        b'NA,National Bank,Canada,TO,CAD,Common Stock,CA6330671034\n'))
+
+
+def test_parse_eod_json_missing_values():
+    df = _parse_eod_json(b'[{"date":"2020-02-10","open":1,"high":2,"low":null,"close":1.5,"adjusted_close":1.5,'
+                         b'"volume":null}]', float_dtype="float32")
+    assert df["Open"].dtype == "float32" and df["Low"].isna().all()
+    assert df["Volume"].dtype == "float64"
+    assert len(_parse_eod_json(b"[]")) == 0
+    with pytest.raises(ValueError):
+        _parse_eod_json(b'{"error": "not found"}')
+
+
+def test_get_parser():
+    assert _get_parser("div", "json") is _parse_dividends_json
+    with pytest.raises(ValueError):
+        _get_parser("eod", "xml")
+
+
+def test_endpoints_request_json():
+    def route(path, params):
+        assert params.get("fmt") == "json"
+        if path.startswith("/api/div/"):
+            return 200, DIVIDENDS_JSON
+        if path.startswith("/api/exchanges/"):
+            return 200, SYMBOLS_JSON
+        return 200, _eod_json()
+
+    session = fake_session(route)
+    df = get_eod_data("AAPL", "US", "2020-02-01", "2020-02-10", api_key="key", session=session, fmt="json")
+    pd.testing.assert_frame_equal(df, _parse_eod(EOD_CSV))
+    assert len(get_dividends("AAPL", "US", "2020-02-01", "2020-02-10", api_key="key", session=session,
+                             fmt="json")) == 2
+    assert list(get_exchange_symbols("US", api_key="key", session=session, fmt="json").index) == ["0001", "NA"]
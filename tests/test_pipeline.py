@@ -0,0 +1,107 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import sentinel
+import pandas as pd
+import pytest
+import requests
+from eod_historical_data import get_eod_data_pipeline, get_eod_data_bulk, MetricsAggregator, RequestScheduler
+from eod_historical_data.instrumentation import register, unregister
+from eod_historical_data._utils import RemoteDataError
+from ._helpers import fake_session, EOD_CSV
+
+
+def route(path, params):
+    if path.endswith("/DENIED.US"):
+        return 403, b""
+    if path.endswith("/MISSING.US"):
+        return 404, b""
+    return 200, EOD_CSV
+
+
+@pytest.mark.parametrize("parse_executor", ["process", "thread"])
+def test_get_eod_data_pipeline_matches_bulk(parse_executor):
+    symbols = ["AAPL", "MSFT", "DENIED", "MISSING", "IBM"]
+    session = fake_session(route)
+    data, errors = get_eod_data_pipeline(symbols, "US", start="2020-02-01", end="2020-02-10", api_key="key",
+                                         session=session, max_workers=2, parse_workers=2,
+                                         parse_executor=parse_executor, queue_size=1)
+    expected, expected_errors = get_eod_data_bulk(symbols, "US", start="2020-02-01", end="2020-02-10",
+                                                  api_key="key", session=session)
+    assert list(data) == ["AAPL", "MSFT", "IBM"]
+    for symbol, df in expected.items():
+        pd.testing.assert_frame_equal(data[symbol], df)
+    assert errors["DENIED"] is sentinel
+    assert isinstance(errors["MISSING"], RemoteDataError)
+    assert list(errors) == list(expected_errors)
+
+
+def test_get_eod_data_pipeline_bounds_the_queue():
+    # the parse stage is slow, downloads must wait for room in the queue instead of piling up bodies
+    downloaded = []
+    parsed = []
+    lock = threading.Lock()
+
+    def counting_route(path, params):
+        with lock:
+            downloaded.append(path)
+            assert len(downloaded) - len(parsed) <= 4
+        return 200, EOD_CSV
+
+    class SlowExecutor(ThreadPoolExecutor):
+        def submit(self, fn, *args, **kwargs):
+            def slow(*a, **kw):
+                time.sleep(0.01)
+                value = fn(*a, **kw)
+                with lock:
+                    parsed.append(value)
+                return value
+            return super().submit(slow, *args, **kwargs)
+
+    symbols = [f"S{i}" for i in range(20)]
+    with SlowExecutor(max_workers=1) as executor:
+        data, errors = get_eod_data_pipeline(symbols, "US", start="2020-02-01", end="2020-02-10", api_key="key",
+                                             session=fake_session(counting_route), max_workers=2, parse_workers=1,
+                                             parse_executor=executor, queue_size=1, as_frame=True)
+    assert errors == {}
+    assert len(data) == 5 * len(symbols)
+
+
+def test_get_eod_data_pipeline_records_events():
+    metrics = register(MetricsAggregator())
+    try:
+        get_eod_data_pipeline(["AAPL", "MSFT"], "US", start="2020-02-01", end="2020-02-10", api_key="key",
+                              session=fake_session(route), parse_executor="thread")
+    finally:
+        unregister(metrics)
+    summary = metrics.summary()
+    assert summary["requests"] == 2
+    assert summary["rows"] == 10
+    assert summary["phases"]["parse"] > 0
+
+
+def test_get_eod_data_pipeline_checks_options():
+    with pytest.raises(ValueError):
+        get_eod_data_pipeline(["AAPL"], "US", start="2020-02-01", end="2020-02-10", api_key="key",
+                              parse_executor="fork")
+    with pytest.raises(ValueError):
+        get_eod_data_pipeline(["AAPL"], "US", start="2020-02-01", end="2020-02-10", api_key="key", queue_size=0)
+
+
+def test_get_eod_data_pipeline_keeps_going_after_failed_symbols():
+    def failing_route(path, params):
+        if path.endswith("/DOWN.US"):
+            return 503, b""
+        if path.endswith("/DROPPED.US"):
+            raise requests.ConnectionError("connection reset")
+        return 200, EOD_CSV
+
+    symbols = ["AAPL", "DOWN", "DROPPED", "MSFT"]
+    session = fake_session(failing_route)
+    data, errors = get_eod_data_pipeline(symbols, "US", start="2020-02-01", end="2020-02-10", api_key="key",
+                                         session=session, parse_executor="thread",
+                                         scheduler=RequestScheduler(max_retries=1, backoff_factor=0))
+    assert list(data) == ["AAPL", "MSFT"]
+    assert list(errors) == ["DOWN", "DROPPED"]
+    assert all(isinstance(error, RemoteDataError) for error in errors.values())
+    assert errors["DOWN"].args[0] == 503
@@ -0,0 +1,84 @@
+import threading
+import pandas as pd
+import pytest
+from eod_historical_data import get_intraday_data, get_real_time_quotes, QuotePoller
+from ._helpers import fake_session
+
+INTRADAY_CSV: bytes = b"""Timestamp,Gmtoffset,Datetime,Open,High,Low,Close,Volume
+1580740200,0,"2020-02-03 14:30:00",304.3,305.1,303.9,304.8,1200300
+1580740500,0,"2020-02-03 14:35:00",304.8,306.0,304.5,305.7,980100
+"""
+
+
+def quotes_route(closes):
+    """
+        Returns a route answering the real-time quote of every code requested, closes maps a code
+        to its close, read on every request
+    """
+
+    def route(path, params):
+        codes = [path.rsplit("/", 1)[1]] + (params["s"].split(",") if "s" in params else [])
+        rows = [f"{code},1580760000,0,1,2,0.5,{closes.get(code, 1.0)},100,1,0,0" for code in codes]
+        return 200, ("code,timestamp,gmtoffset,open,high,low,close,volume,previousClose,change,change_p\n" +
+                     "\n".join(rows) + "\n").encode()
+
+    return route
+
+
+def test_get_intraday_data():
+    session = fake_session(lambda path, params: (200, INTRADAY_CSV))
+    df = get_intraday_data("AAPL", "US", start="2020-02-03", end="2020-02-04", interval="5m", api_key="key",
+                           session=session)
+    assert list(df.columns) == ["Open", "High", "Low", "Close", "Volume"]
+    assert df.index[1] == pd.Timestamp("2020-02-03 14:35:00") and df["Volume"].dtype == "int64"
+    path, params = session.get_adapter("https://").calls[0]
+    assert path == "/api/intraday/AAPL.US"
+    assert (params["interval"], params["from"], params["to"]) == ("5m", "1580688000", "1580774400")
+    with pytest.raises(ValueError):
+        get_intraday_data("AAPL", "US", interval="2m", api_key="key", session=session)
+
+
+def test_get_real_time_quotes_batches_symbols():
+    session = fake_session(quotes_route({"MSFT.US": 2.0}))
+    symbols = ["AAPL", "MSFT", "IBM", "GE", "F"]
+    quotes = get_real_time_quotes(symbols, "US", api_key="key", session=session, batch_size=2)
+    assert list(quotes.index) == [f"{symbol}.US" for symbol in symbols]
+    assert quotes.loc["MSFT.US", "close"] == 2.0
+    assert quotes["timestamp"].iloc[0] == pd.Timestamp("2020-02-03 20:00:00")
+    calls = session.get_adapter("https://").calls
+    assert sorted((path, params.get("s")) for path, params in calls) == [
+        ("/api/real-time/AAPL.US", "MSFT.US"), ("/api/real-time/F.US", None), ("/api/real-time/IBM.US", "GE.US")]
+
+
+def test_quote_poller_emits_changed_quotes():
+    closes = {}
+    session = fake_session(quotes_route(closes))
+    poller = QuotePoller(["AAPL", "MSFT", "IBM"], "US", interval=0.05, api_key="key", session=session)
+    assert len(poller.poll()) == 3
+    assert len(poller.poll()) == 0
+    closes["IBM.US"] = 3.0
+    assert list(poller.poll().index) == ["IBM.US"]
+
+    emitted = []
+    closes["AAPL.US"] = 2.0
+    for changed in poller:
+        emitted.append(list(changed.index))
+        closes["AAPL.US"] += 1
+        if len(emitted) == 3:
+            poller.stop()
+    # every tick emits the quote changed since the previous one only
+    assert emitted == [["AAPL.US"]] * 3
+    assert poller.ticks == 3
+
+
+def test_quote_poller_keeps_its_cadence():
+    session = fake_session(quotes_route({}))
+    poller = QuotePoller(["AAPL"], "US", interval=0.05, api_key="key", session=session)
+    timer = threading.Timer(0.5, poller.stop)
+    timer.start()
+    for _ in poller:
+        # longer than one interval, the tick it overruns is skipped instead of delaying every later one
+        threading.Event().wait(0.08)
+    timer.join()
+    assert poller.missed >= 1
+    assert 4 <= poller.ticks + poller.missed <= 11
@@ -0,0 +1,34 @@
+from eod_historical_data import (get_exchanges, get_indexes, get_currencies, get_exchange_name,
+                                 get_index_exchange, is_supported_exchange, is_supported_currency)
+from eod_historical_data.reference import _table
+
+
+def test_tables_are_parsed_once():
+    get_exchanges()
+    hits = _table.cache_info().hits
+    df = get_exchanges()
+    assert _table.cache_info().hits == hits + 1
+    df.loc[df.index[0], "Exchange Code"] = "XX"
+    assert get_exchanges().loc[df.index[0], "Exchange Code"] == "MU"
+    assert df.index.name == "ID"
+    assert len(get_indexes()) == 138
+    assert len(get_currencies()) == 33
+
+
+def test_lookups_match_tables():
+    exchanges = get_exchanges()
+    assert all(get_exchange_name(code) == name
+               for code, name in zip(exchanges["Exchange Code"], exchanges["Exchange Name"]))
+    assert get_exchange_name("US") == "USA Stocks"
+    assert get_exchange_name("NOPE") is None
+    assert is_supported_exchange("LSE") and not is_supported_exchange("NOPE")
+    assert get_index_exchange("GSPC") == "INDX"
+    assert get_index_exchange("NOPE") is None
+    assert is_supported_currency("USD") and not is_supported_currency("XYZ")
+
+
+def test_lookups_do_not_parse_tables():
+    _table.cache_clear()
+    get_exchange_name("US")
+    get_index_exchange("GSPC")
+    assert _table.cache_info().currsize == 0
@@ -0,0 +1,58 @@
+import pytest
+import requests
+from eod_historical_data import get_eod_data
+from eod_historical_data._utils import RemoteDataError
+from eod_historical_data.scheduler import TokenBucket, RequestScheduler, _retry_after
+from ._helpers import fake_session, EOD_CSV
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_token_bucket_spaces_requests():
+    clock = Clock()
+    bucket = TokenBucket(rate=2.0, capacity=2, clock=clock)
+    assert [bucket.reserve() for _ in range(4)] == [0.0, 0.0, 0.5, 1.0]
+    clock.now = 10.0
+    assert bucket.reserve() == 0.0
+
+
+def test_scheduler_respects_quota_window():
+    scheduler = RequestScheduler(requests_per_minute=60, burst=5)
+    assert scheduler.bucket.capacity + scheduler.bucket.rate * 60 <= 60
+    with pytest.raises(ValueError):
+        RequestScheduler(requests_per_minute=1, burst=1)
+
+
+def test_backoff_is_bounded_and_honours_retry_after():
+    scheduler = RequestScheduler(backoff_factor=1.0, max_backoff=5.0)
+    assert all(0 <= scheduler.backoff(attempt) <= min(5.0, 2 ** attempt) for attempt in range(10))
+    assert scheduler.backoff(0, retry_after=3.0) >= 3.0
+    assert _retry_after({"Retry-After": "7"}) == 7.0
+    assert _retry_after({}) is None
+
+
+def test_scheduler_retries_transient_statuses():
+    statuses = [503, 429, 200]
+    session = fake_session(lambda path, params: (statuses.pop(0), EOD_CSV))
+    scheduler = RequestScheduler(backoff_factor=0)
+    df = get_eod_data("AAPL", "US", start="2020-02-01", end="2020-02-10", api_key="key", session=session,
+                      scheduler=scheduler)
+    assert len(df) == 5
+    assert len(session.get_adapter("https://").calls) == 3
+
+
+def test_scheduler_raises_after_last_retry():
+    def route(path, params):
+        raise requests.ConnectionError("connection reset")
+
+    session = fake_session(route)
+    with pytest.raises(RemoteDataError):
+        get_eod_data("AAPL", "US", start="2020-02-01", end="2020-02-10", api_key="key", session=session,
+                     scheduler=RequestScheduler(max_retries=2, backoff_factor=0))
+    assert len(session.get_adapter("https://").calls) == 3
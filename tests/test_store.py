@@ -0,0 +1,38 @@
+from datetime import date, timedelta
+import pandas as pd
+from eod_historical_data import HistoryStore
+from ._helpers import fake_session, EOD_CSV
+
+
+def route(path, params):
+    return 200, EOD_CSV
+
+
+def test_store_fetches_only_missing_ranges(tmp_path):
+    session = fake_session(route)
+    adapter = session.get_adapter("https://")
+    store = HistoryStore(str(tmp_path / "eod.sqlite"))
+
+    df = store.get_eod_data("AAPL", "US", start="2020-02-01", end="2020-02-10", api_key="key", session=session)
+    assert len(df) == 5
+    assert df.index.name == "Date"
+    assert df["Volume"].dtype == "int64"
+    assert adapter.calls[-1][1]["from"] == "2020-02-01"
+
+    store.get_eod_data("AAPL", "US", start="2020-02-03", end="2020-02-07", api_key="key", session=session)
+    assert len(adapter.calls) == 1
+
+    store.get_eod_data("AAPL", "US", start="2020-01-20", end="2020-02-20", api_key="key", session=session)
+    assert [(params["from"], params["to"]) for _, params in adapter.calls[1:]] == [
+        ("2020-01-20", "2020-01-31"), ("2020-02-11", "2020-02-20")]
+    assert store.covered("AAPL", "US") == [(pd.Timestamp("2020-01-20"), pd.Timestamp("2020-02-20"))]
+    assert store.missing("MSFT", "US", "2020-01-01", "2020-01-31") == [
+        (pd.Timestamp("2020-01-01"), pd.Timestamp("2020-01-31"))]
+
+
+def test_store_does_not_hold_unsettled_days(tmp_path):
+    store = HistoryStore(str(tmp_path / "eod.sqlite"))
+    today = date.today()
+    store.write("AAPL", "US", pd.DataFrame(), today - timedelta(days=10), today)
+    assert store.missing("AAPL", "US", today - timedelta(days=10), today) == [
+        (pd.Timestamp(today), pd.Timestamp(today))]
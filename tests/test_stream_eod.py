@@ -0,0 +1,79 @@
+import asyncio
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from eod_historical_data import stream_eod, data
+from eod_historical_data._utils import RemoteDataError
+from ._helpers import EOD_CSV
+
+
+def run_with_server(coroutine_function, delays):
+    """
+        Runs coroutine_function(url, in_flight) against a server answering every symbol after
+        delays[symbol] seconds, in_flight["max"] is the largest number of requests served at once
+    """
+    in_flight = {"now": 0, "max": 0}
+
+    async def eod(request):
+        symbol = request.match_info["symbol"].split(".")[0]
+        in_flight["now"] += 1
+        in_flight["max"] = max(in_flight["max"], in_flight["now"])
+        try:
+            await asyncio.sleep(delays.get(symbol, 0.01))
+        finally:
+            in_flight["now"] -= 1
+        if symbol == "MISSING":
+            return web.Response(status=404)
+        return web.Response(body=EOD_CSV, content_type="text/csv")
+
+    async def main():
+        app = web.Application()
+        app.router.add_get("/api/eod/{symbol}", eod)
+        server = TestServer(app)
+        await server.start_server()
+        try:
+            return await coroutine_function(str(server.make_url("/api")), in_flight)
+        finally:
+            await server.close()
+
+    return asyncio.run(main())
+
+
+def test_stream_eod_yields_in_completion_order(monkeypatch):
+    symbols = ["SLOW"] + [f"S{i}" for i in range(11)]
+
+    async def consume(url, in_flight):
+        monkeypatch.setattr(data, "EOD_HISTORICAL_DATA_API_URL", url)
+        # a generator, read as the window frees up
+        results = [(symbol, len(df)) async for symbol, df in
+                   stream_eod((symbol for symbol in symbols), "US", "2020-02-01", "2020-02-10", api_key="key",
+                              window=3)]
+        return results, in_flight["max"]
+
+    results, max_in_flight = run_with_server(consume, {"SLOW": 0.5})
+    assert sorted(results) == sorted((symbol, 5) for symbol in symbols)
+    # the slow symbol does not hold back the others
+    assert results[-1][0] == "SLOW"
+    assert max_in_flight == 3
+
+
+def test_stream_eod_errors_and_early_exit(monkeypatch):
+    async def consume(url, in_flight):
+        monkeypatch.setattr(data, "EOD_HISTORICAL_DATA_API_URL", url)
+        results = {symbol: result async for symbol, result in
+                   stream_eod(["AAPL", "MISSING"], "US", "2020-02-01", "2020-02-10", api_key="key",
+                              return_exceptions=True)}
+        with pytest.raises(RemoteDataError):
+            async for _ in stream_eod(["MISSING", "SLOW"], "US", "2020-02-01", "2020-02-10", api_key="key"):
+                pass
+        # breaking out cancels the requests still in flight instead of waiting for them
+        stream = stream_eod(["AAPL", "SLOW"], "US", "2020-02-01", "2020-02-10", api_key="key")
+        async for symbol, _ in stream:
+            break
+        started = asyncio.get_running_loop().time()
+        await stream.aclose()
+        return results, symbol, asyncio.get_running_loop().time() - started
+
+    results, first, closing = run_with_server(consume, {"SLOW": 2})
+    assert len(results["AAPL"]) == 5 and isinstance(results["MISSING"], RemoteDataError)
+    assert first == "AAPL" and closing < 0.5
@@ -0,0 +1,79 @@
+import asyncio
+import pandas as pd
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from eod_historical_data import AsyncEODClient, data, iter_exchange_symbols, iter_exchange_symbols_async
+from eod_historical_data._utils import RemoteDataError
+from ._helpers import fake_session
+
+SYMBOLS_CSV: bytes = (b"Code,Name,Country,Exchange,Currency,Type,Isin\r\n" +
+                      b"".join(b"S%03d,Name %d,USA,NYSE,USD,%s,\r\n" % (i, i, b"ETF" if i % 3 == 0 else b"Common Stock")
+                               for i in range(25)) +
+                      b"\r\nEND\r\n")
+
+
+def route(path, params):
+    if path.endswith("/DENIED"):
+        return 403, b""
+    if path.endswith("/MISSING"):
+        return 404, b""
+    return 200, SYMBOLS_CSV
+
+
+def test_iter_exchange_symbols_yields_chunks():
+    session = fake_session(route)
+    chunks = list(iter_exchange_symbols("US", api_key="key", session=session, chunksize=10))
+    assert [len(df) for df in chunks] == [10, 10, 5]
+    df = pd.concat(chunks)
+    assert df.index.name == "Code"
+    assert list(df.index) == [f"S{i:03d}" for i in range(25)]
+    assert list(df.columns) == ["Name", "Country", "Exchange", "Currency", "Type", "Isin"]
+    assert df["Isin"].isna().all()
+
+
+def test_iter_exchange_symbols_filters_columns_and_types():
+    session = fake_session(route)
+    chunks = list(iter_exchange_symbols("US", api_key="key", session=session, chunksize=10, columns=["Name"],
+                                        types=["ETF"]))
+    df = pd.concat(chunks)
+    assert list(df.columns) == ["Name"]
+    assert list(df.index) == [f"S{i:03d}" for i in range(0, 25, 3)]
+
+
+def test_iter_exchange_symbols_errors():
+    session = fake_session(route)
+    assert list(iter_exchange_symbols("DENIED", api_key="key", session=session)) == []
+    with pytest.raises(RemoteDataError):
+        list(iter_exchange_symbols("MISSING", api_key="key", session=session))
+    with pytest.raises(ValueError):
+        iter_exchange_symbols("US", api_key="key", session=session, chunksize=0)
+
+
+async def exchange_symbols(request):
+    code = request.match_info["code"]
+    if code == "DENIED":
+        return web.Response(status=403)
+    return web.Response(body=SYMBOLS_CSV, content_type="text/csv")
+
+
+def test_iter_exchange_symbols_async(monkeypatch):
+    async def main():
+        app = web.Application()
+        app.router.add_get("/api/exchanges/{code}", exchange_symbols)
+        server = TestServer(app)
+        await server.start_server()
+        monkeypatch.setattr(data, "EOD_HISTORICAL_DATA_API_URL", str(server.make_url("/api")))
+        try:
+            free = [df async for df in iter_exchange_symbols_async("US", api_key="key", chunksize=10)]
+            async with AsyncEODClient(api_key="key") as client:
+                etfs = [df async for df in client.iter_exchange_symbols("US", chunksize=4, types={"ETF"})]
+                denied = [df async for df in client.iter_exchange_symbols("DENIED")]
+            return free, etfs, denied
+        finally:
+            await server.close()
+
+    free, etfs, denied = asyncio.run(main())
+    assert [len(df) for df in free] == [10, 10, 5]
+    assert len(pd.concat(etfs)) == 9
+    assert denied == []